@@ -0,0 +1,153 @@
+# benchmarks/arraystate.py
+"""
+Run-state throughput: per-node Frontier vs NumPy ArrayFrontier.
+
+Each engine drains the graph with zero-duration tasks: take up to `--batch` ready
+TASKs, complete them all, repeat until EXIT. Only the state bookkeeping is timed.
+
+  fan_out   ENTRY -> FORK -> n TASKs -> JOIN -> EXIT (the JOIN is Frontier's
+            quadratic case: its readiness is re-checked on every completion)
+  fan_tree  the same fan-out joined by a tree of `--arity`-wide JOINs: no wide
+            JOIN, so the ratio is the batched scatter's own gain
+  layered   n TASKs in layers of `--width`, each depending on 3 random TASKs
+            of the previous layer
+  chain     up to 5,000 TASKs in a line: one ready node at a time, nothing to
+            batch, so per-call NumPy overhead makes ArrayFrontier slower here
+
+Usage:
+    python -m benchmarks.arraystate
+    python -m benchmarks.arraystate --tasks 50000 --batch 4096
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any, Optional
+
+from balikrun.engine.arraystate import ArrayFrontier
+from balikrun.engine.scheduler import Frontier, GraphIndex, NodeState
+from balikrun.ir import GraphIR
+from benchmarks.workloads import Payload, graph_chain, graph_fan_out
+
+
+def graph_layered(n: int, width: int = 1000, fan_in: int = 3, seed: int = 0) -> Payload:
+    """
+    ENTRY -> layers of `width` TASKs, each fed by `fan_in` TASKs of the layer above -> EXIT.
+    """
+    rng = random.Random(seed)
+    nodes = [{"node_id": "entry", "kind": "ENTRY"}, {"node_id": "exit", "kind": "EXIT"}]
+    edges = []
+    prev = ["entry"]
+    for start in range(0, n, width):
+        layer = [f"t{i}" for i in range(start, min(n, start + width))]
+        for node_id in layer:
+            nodes.append({"node_id": node_id, "kind": "TASK", "task_id": f"t{len(nodes) % 97}"})
+            for src in rng.sample(prev, min(fan_in, len(prev))):
+                edges.append({"src": src, "dst": node_id})
+        prev = layer
+    edges += [{"src": node_id, "dst": "exit"} for node_id in prev]
+    return {
+        "graph_id": "layered",
+        "nodes": nodes,
+        "edges": edges,
+        "entry_id": "entry",
+        "exit_id": "exit",
+    }
+
+
+def graph_fan_tree(n: int, arity: int = 32) -> Payload:
+    """
+    ENTRY -> FORK -> n TASKs, joined `arity` at a time by JOINs, level by level -> EXIT.
+    """
+    nodes = [{"node_id": node_id, "kind": node_id.upper()} for node_id in ("entry", "fork", "exit")]
+    edges = [{"src": "entry", "dst": "fork"}]
+    level = []
+    for i in range(n):
+        nodes.append({"node_id": f"t{i}", "kind": "TASK", "task_id": f"t{i % 97}"})
+        edges.append({"src": "fork", "dst": f"t{i}"})
+        level.append(f"t{i}")
+    depth = 0
+    while len(level) > 1:
+        joins = []
+        for start in range(0, len(level), arity):
+            join = f"j{depth}_{start // arity}"
+            nodes.append({"node_id": join, "kind": "JOIN"})
+            edges += [{"src": src, "dst": join} for src in level[start:start + arity]]
+            joins.append(join)
+        level, depth = joins, depth + 1
+    edges.append({"src": level[0], "dst": "exit"})
+    return {
+        "graph_id": "fan_tree",
+        "nodes": nodes,
+        "edges": edges,
+        "entry_id": "entry",
+        "exit_id": "exit",
+    }
+
+
+def drain(gi: GraphIndex, engine: str, batch: int) -> tuple[float, dict[str, NodeState]]:
+    """
+    Seconds to run `gi` to EXIT under `engine` ("frontier" or "array"), and the final
+    state of every node that left PENDING (collected after timing stops).
+    """
+    t0 = time.perf_counter()
+    if engine == "array":
+        af = ArrayFrontier(gi)
+        af.start()
+        while not af.done:
+            af.complete(af.take(batch))
+        seconds = time.perf_counter() - t0
+        return seconds, af.node_states()
+    f = Frontier(gi)
+    f.start()
+    while not f.done:
+        for node_id in f.take(batch):
+            f.complete(node_id)
+    seconds = time.perf_counter() - t0
+    return seconds, {k: v for k, v in f.states.items() if v != NodeState.PENDING}
+
+
+def measure(
+    n: int, batch: int = 1024, width: int = 1000, arity: int = 32
+) -> dict[str, dict[str, Any]]:
+    shapes = {
+        "fan_out": graph_fan_out(n),
+        "fan_tree": graph_fan_tree(n, arity),
+        "layered": graph_layered(n, width),
+        "chain": graph_chain(min(n, 5_000)),
+    }
+    out: dict[str, dict[str, Any]] = {}
+    for name, payload in shapes.items():
+        gi = GraphIndex.from_graph(GraphIR.model_validate(payload))
+        tasks = sum(1 for node in gi.graph.nodes if node.kind == "TASK")
+        frontier, expected = drain(gi, "frontier", batch)
+        array, states = drain(gi, "array", batch)
+        out[name] = {
+            "tasks": tasks,
+            "states_match": states == expected,
+            "frontier": frontier,
+            "array": array,
+            "speedup": frontier / array if array else float("inf"),
+        }
+    return out
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Frontier vs ArrayFrontier run-state throughput")
+    p.add_argument("--tasks", type=int, default=20_000)
+    p.add_argument("--batch", type=int, default=1024, help="TASKs taken and completed per step")
+    p.add_argument("--width", type=int, default=1000, help="layer width of the layered graph")
+    p.add_argument("--arity", type=int, default=32, help="JOIN width of the fan_tree graph")
+    args = p.parse_args(argv)
+
+    for name, r in measure(args.tasks, args.batch, args.width, args.arity).items():
+        print(
+            f"{name:<8} {r['tasks']:>9,} tasks  frontier {r['tasks'] / r['frontier']:>11,.0f}/s  "
+            f"array {r['tasks'] / r['array']:>11,.0f}/s  x{r['speedup']:.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
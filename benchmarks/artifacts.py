@@ -0,0 +1,72 @@
+# benchmarks/artifacts.py
+"""
+Hand-off cost of a large array from one producer to several consumers.
+
+  pickle   the producer's return value is pickled once and every consumer unpickles
+           its own copy (what passing outputs through TaskResult costs, minus the
+           socket transfer, so this is a lower bound)
+  store    the producer writes once to an ArtifactStore and every consumer maps it
+           (np.memmap) and reads it in place
+
+Each consumer reduces the whole array (sum), so both paths touch every byte.
+
+Usage:
+    python -m benchmarks.artifacts
+    python -m benchmarks.artifacts --mb 512 --consumers 8 --root /dev/shm/balikrun
+"""
+from __future__ import annotations
+
+import argparse
+import pickle
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from balikrun.engine.artifacts import ArtifactStore
+
+
+def measure(mb: int, consumers: int, root: Path) -> dict[str, float]:
+    """
+    Seconds for one produce + `consumers` reads under each strategy.
+    """
+    import numpy as np
+
+    arr = np.random.default_rng(0).random(mb * (1 << 20) // 8)
+    expected = float(arr.sum())
+
+    t0 = time.perf_counter()
+    blob = pickle.dumps(arr, protocol=pickle.HIGHEST_PROTOCOL)
+    for _ in range(consumers):
+        assert float(pickle.loads(blob).sum()) == expected
+    t_pickle = time.perf_counter() - t0
+    del blob
+
+    store = ArtifactStore(root)
+    t0 = time.perf_counter()
+    store.put("bench", "producer", "x", arr)
+    for _ in range(consumers):
+        assert float(store.get("bench", "producer", "x").sum()) == expected
+    t_store = time.perf_counter() - t0
+    store.drop_run("bench")
+    return {"pickle": t_pickle, "store": t_store}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="artifact hand-off: pickle vs memory-mapped store")
+    p.add_argument("--mb", type=int, default=256)
+    p.add_argument("--consumers", type=int, nargs="+", default=[1, 4, 16])
+    p.add_argument("--root", type=Path, default=None, help="store directory (default: a temp dir)")
+    args = p.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.root or Path(tmp)
+        for k in args.consumers:
+            r = measure(args.mb, k, root)
+            rates = "  ".join(f"{name}={args.mb * k / s:8.0f} MB/s" for name, s in r.items())
+            print(f"{args.mb} MB x {k:<3} consumers  {rates}  ({r['pickle'] / r['store']:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
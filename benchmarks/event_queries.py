@@ -0,0 +1,99 @@
+# benchmarks/event_queries.py
+"""
+Audit queries over the event log: EventIndex lookups vs a full scan of the stream.
+
+`--events` NODE_STATE events are spread over `--runs` runs of `--nodes` nodes each,
+with task_ids cycling through a small set and timestamps spanning a week. Queries:
+
+  node      every event of one node_id across runs (respawns)
+  task_run  every event of one task_id in one run
+  window    one task_id in the last hour
+
+Each runs against the in-memory EventLog and an EventSegments store on disk.
+
+Usage:
+    python -m benchmarks.event_queries
+    python -m benchmarks.event_queries --events 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from balikrun.engine.events import Event, EventLog, EventSegments, EventType
+from balikrun.engine.scheduler import NodeState
+
+TASK_IDS = ("ingest", "train", "eval", "publish", "tune", "bundle", "upload")
+WEEK = 7 * 86400.0
+
+
+def build(n: int, runs: int, nodes: int, root: Path) -> tuple[EventLog, EventSegments]:
+    stamps = iter(time.time() - WEEK + WEEK * i / n for i in range(n))
+    log = EventLog(clock=lambda: next(stamps))
+    store = EventSegments(root)
+    log.subscribe(store.append)
+    for i in range(n):
+        log.append(
+            f"run{i % runs}",
+            EventType.NODE_STATE,
+            node_id=f"n{(i // runs) % nodes}",
+            task_id=TASK_IDS[i % len(TASK_IDS)],
+            state=NodeState.COMPLETED,
+        )
+    return log, store
+
+
+def _time(fn: Callable[[], list[Event]], repeat: int = 3) -> tuple[float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        found = fn()
+        best = min(best, time.perf_counter() - t)
+    return best, len(found)
+
+
+def measure(n: int, runs: int = 100, nodes: int = 500) -> dict[str, dict[str, Any]]:
+    """
+    Best-of-3 seconds and result sizes per query for scan, indexed log and store.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        log, store = build(n, runs, nodes, Path(tmp))
+        events = list(log)
+        since = events[-1].ts - 3600.0
+        queries = {
+            "node": ({"node_id": "n7"}, lambda e: e.node_id == "n7"),
+            "task_run": ({"run_id": "run3", "task_id": "train"}, lambda e: e.run_id == "run3" and e.task_id == "train"),
+            "window": ({"task_id": "eval", "since": since}, lambda e: e.task_id == "eval" and e.ts >= since),
+        }
+        out: dict[str, dict[str, Any]] = {}
+        for name, (kwargs, pred) in queries.items():
+            scan, k = _time(lambda: [e for e in events if pred(e)])
+            indexed, k1 = _time(lambda: log.query(**kwargs))
+            on_disk, k2 = _time(lambda: store.query(**kwargs))
+            assert k == k1 == k2
+            out[name] = {"matches": k, "scan": scan, "indexed": indexed, "segments": on_disk}
+        store.close()
+    return out
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="indexed event-log queries vs full scan")
+    p.add_argument("--events", type=int, default=200_000)
+    p.add_argument("--runs", type=int, default=100)
+    p.add_argument("--nodes", type=int, default=500)
+    args = p.parse_args(argv)
+
+    print(f"{args.events:,} events, {args.runs} runs x {args.nodes} nodes")
+    for name, r in measure(args.events, args.runs, args.nodes).items():
+        print(
+            f"{name:<9} {r['matches']:>7,} matches  scan {r['scan'] * 1e3:8.2f} ms  "
+            f"indexed {r['indexed'] * 1e3:7.3f} ms  segments {r['segments'] * 1e3:7.2f} ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,158 @@
+# benchmarks/fairshare.py
+"""
+Dispatch across many concurrent runs sharing one worker pool.
+
+One project submits a sweep of `--sweep` fan-out runs first; then `--small`
+interactive projects submit one short chain each. A pool of `--workers` slots drains
+all of them, with exponential task durations (mean 1 s) and an event heap to
+advance time.
+
+  fifo   runs are served in submission order: the first run with a ready task goes
+         next (so the sweep holds the pool until it drains)
+  fair   FairShareScheduler (projects, then runs, by weighted virtual time)
+
+Reported: interactive completion times (mean, p95), the sweep's makespan, and the
+scheduler's wall-clock cost per task (take + complete).
+
+Usage:
+    python -m benchmarks.fairshare
+    python -m benchmarks.fairshare --sweep 9000 --small 1000 --workers 512
+"""
+from __future__ import annotations
+
+import argparse
+import heapq
+import random
+import statistics
+import time
+from typing import Any, Optional
+
+from balikrun.engine.fairshare import FairShareScheduler
+from balikrun.engine.scheduler import Frontier, GraphIndex
+from balikrun.ir import GraphIR
+from benchmarks.workloads import graph_chain, graph_fan_out
+
+
+class _Fifo:
+    """
+    Baseline: the first run (in submission order) with a ready task goes next.
+    """
+
+    def __init__(self) -> None:
+        self._runs: dict[str, Frontier] = {}
+
+    def add_run(self, run_id: str, frontier: Frontier, **_: Any) -> None:
+        self._runs[run_id] = frontier
+
+    def remove_run(self, run_id: str) -> None:
+        del self._runs[run_id]
+
+    def take(self, n: int) -> list[tuple[str, str]]:
+        out: list[tuple[str, str]] = []
+        for run_id, frontier in self._runs.items():
+            if len(out) == n:
+                break
+            out += [(run_id, node_id) for node_id in frontier.take(n - len(out))]
+        return out
+
+    def complete(self, run_id: str, node_id: str) -> None:
+        self._runs[run_id].complete(node_id)
+
+
+def simulate(
+    policy: str,
+    *,
+    sweep: int = 900,
+    sweep_tasks: int = 20,
+    small: int = 100,
+    small_tasks: int = 5,
+    workers: int = 64,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """
+    Drain `sweep` + `small` runs under `policy` ("fifo" or "fair").
+    """
+    rng = random.Random(seed)
+    sched = FairShareScheduler() if policy == "fair" else _Fifo()
+    shapes = {
+        "sweep": GraphIndex.from_graph(GraphIR.model_validate(graph_fan_out(sweep_tasks))),
+        "small": GraphIndex.from_graph(GraphIR.model_validate(graph_chain(small_tasks))),
+    }
+    frontiers: dict[str, Frontier] = {}
+    for kind, count in (("sweep", sweep), ("small", small)):
+        for i in range(count):
+            run_id = f"{kind}{i}"
+            frontiers[run_id] = f = Frontier(shapes[kind])
+            f.start()
+            sched.add_run(run_id, f, project="sweep" if kind == "sweep" else None)
+
+    now = 0.0
+    free = workers
+    running: list[tuple[float, int, str, str]] = []
+    finished: dict[str, float] = {}
+    seq = 0
+    tasks = 0
+    cost = 0.0
+    while True:
+        t0 = time.perf_counter()
+        batch = sched.take(free)
+        cost += time.perf_counter() - t0
+        for run_id, node_id in batch:
+            heapq.heappush(running, (now + rng.expovariate(1.0), seq, run_id, node_id))
+            seq += 1
+        free -= len(batch)
+        if not running:
+            break
+        now, _, run_id, node_id = heapq.heappop(running)
+        t0 = time.perf_counter()
+        sched.complete(run_id, node_id)
+        if frontiers[run_id].done:
+            sched.remove_run(run_id)
+            finished[run_id] = now
+        cost += time.perf_counter() - t0
+        free += 1
+        tasks += 1
+
+    assert len(finished) == sweep + small, "every run reaches EXIT"
+    small_done = sorted(t for run_id, t in finished.items() if run_id.startswith("small"))
+    return {
+        "policy": policy,
+        "runs": sweep + small,
+        "tasks": tasks,
+        "small_mean": statistics.fmean(small_done) if small_done else 0.0,
+        "small_p95": small_done[max(0, int(0.95 * len(small_done)) - 1)] if small_done else 0.0,
+        "sweep_makespan": max((t for run_id, t in finished.items() if run_id.startswith("sweep")), default=0.0),
+        "us_per_task": cost / max(tasks, 1) * 1e6,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="fair-share vs FIFO dispatch across concurrent runs")
+    p.add_argument("--sweep", type=int, default=900, help="fan-out runs in the sweep project")
+    p.add_argument("--sweep-tasks", type=int, default=20)
+    p.add_argument("--small", type=int, default=100, help="interactive projects, one chain run each")
+    p.add_argument("--small-tasks", type=int, default=5)
+    p.add_argument("--workers", type=int, default=64)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args(argv)
+
+    print(f"{args.sweep + args.small} runs, {args.workers} workers")
+    for policy in ("fifo", "fair"):
+        r = simulate(
+            policy,
+            sweep=args.sweep,
+            sweep_tasks=args.sweep_tasks,
+            small=args.small,
+            small_tasks=args.small_tasks,
+            workers=args.workers,
+            seed=args.seed,
+        )
+        print(
+            f"{policy:<5} interactive mean {r['small_mean']:8.1f} s  p95 {r['small_p95']:8.1f} s  "
+            f"sweep makespan {r['sweep_makespan']:8.1f} s  {r['us_per_task']:6.1f} us/task"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,108 @@
+# benchmarks/guards.py
+"""
+Per-decision guard latency: how long one DECISION takes to pick its out-edge.
+
+A DECISION with --guards guarded out-edges (only the last one holds, the worst case
+for first-match) is decided repeatedly under four strategies:
+
+  interpret   eval() each guard string every time (parse + compile per call), which
+              is what resolving opaque strings at runtime costs without a registry
+  per_guard   GuardRegistry.predicate() per guard, evaluated in order
+  batched     GuardEvaluator with a new scope version every decision (one fused
+              DecisionProgram call, no memo hits)
+  memoized    GuardEvaluator with an unchanged scope (every decision is a memo hit)
+
+Usage:
+    python -m benchmarks.guards
+    python -m benchmarks.guards --guards 8 --decisions 200000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable, Optional
+
+from balikrun.engine.guards import SAFE_FUNCTIONS, GuardEvaluator, GuardRegistry, GuardScope
+from balikrun.ir import Edge, Node, NodeKind
+
+
+def make_decision(k: int) -> tuple[Node, list[Edge], dict[str, Any]]:
+    """
+    A DECISION with k guarded edges plus a default, and a scope where only the last
+    guard holds.
+    """
+    node = Node(node_id="d", kind=NodeKind.DECISION)
+    edges = [
+        Edge(src="d", dst=f"case{i}", guard=f'metrics["score"] > {0.9 + i} and stage == "s{i}"')
+        for i in range(k - 1)
+    ]
+    edges.append(Edge(src="d", dst=f"case{k - 1}", guard=f'metrics["score"] > 0.5 and stage == "s{k - 1}"'))
+    edges.append(Edge(src="d", dst="default"))
+    scope = {"metrics": {"score": 0.75}, "stage": f"s{k - 1}"}
+    return node, edges, scope
+
+
+def _interpret(node: Node, edges: list[Edge], scope: dict[str, Any]) -> list[str]:
+    builtins = {"__builtins__": SAFE_FUNCTIONS}
+    for e in edges:
+        if e.guard is not None and eval(e.guard, builtins, scope):
+            return [e.dst]
+    return [e.dst for e in edges if e.guard is None]
+
+
+def measure(k: int, decisions: int) -> dict[str, float]:
+    """
+    Mean nanoseconds per decision for each strategy.
+    """
+    node, edges, values = make_decision(k)
+    registry = GuardRegistry()
+    predicates = [(registry.predicate(e.guard), e.dst) for e in edges if e.guard is not None]
+    default = [e.dst for e in edges if e.guard is None]
+
+    def per_guard(scope: GuardScope) -> list[str]:
+        for pred, dst in predicates:
+            if pred(scope):
+                return [dst]
+        return default
+
+    batched = GuardEvaluator(registry, GuardScope(values))
+    memoized = GuardEvaluator(registry, GuardScope(values))
+    scope = GuardScope(values)
+    expected = [f"case{k - 1}"]
+
+    def bump_and_decide() -> list[str]:
+        batched.scope.version += 1
+        return batched.decide(node, edges)
+
+    strategies: dict[str, Callable[[], list[str]]] = {
+        "interpret": lambda: _interpret(node, edges, values),
+        "per_guard": lambda: per_guard(scope),
+        "batched": bump_and_decide,
+        "memoized": lambda: memoized.decide(node, edges),
+    }
+    out: dict[str, float] = {}
+    for name, fn in strategies.items():
+        assert fn() == expected, name
+        n = decisions // 20 if name == "interpret" else decisions
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        out[name] = (time.perf_counter() - t0) / n * 1e9
+    return out
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="per-decision guard latency")
+    p.add_argument("--guards", type=int, nargs="+", default=[1, 4, 16])
+    p.add_argument("--decisions", type=int, default=100_000)
+    args = p.parse_args(argv)
+
+    for k in args.guards:
+        r = measure(k, args.decisions)
+        cols = "  ".join(f"{name}={ns / 1e3:7.2f} us" for name, ns in r.items())
+        print(f"guards={k:<3} {cols}  ({r['interpret'] / r['batched']:.0f}x vs interpret)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+# benchmarks/import_time.py
+"""
+Import-time gate for balikrun's lazy import boundaries.
+
+Each target is imported in a fresh interpreter (so nothing is cached in sys.modules)
+and timed from inside the child, which excludes interpreter startup and site hooks.
+A target fails the run when its best time exceeds the budget or when it pulls in a
+module it must not load (e.g. pydantic in a task worker).
+
+Results use the same document shape as benchmarks/run.py ("import/<module>" keys), so
+--save / --compare work the same way.
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --repeat 10 --save benchmarks/baselines/import.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from benchmarks.run import compare
+
+# module -> (budget in ms, modules that must not be imported as a side effect)
+TARGETS: dict[str, tuple[float, tuple[str, ...]]] = {
+    "balikrun": (5.0, ("pydantic", "balikrun.ir", "balikrun.specification")),
+    "balikrun.engine.worker": (60.0, ("pydantic", "balikrun.ir", "balikrun.engine.scheduler")),
+    "balikrun.engine.artifacts": (60.0, ("pydantic", "numpy", "balikrun.ir", "balikrun.engine.scheduler")),
+    "balikrun.ir": (400.0, ("balikrun.specification", "balikrun.engine.scheduler")),
+    "balikrun.compile": (500.0, ("fastapi", "balikrun.engine.scheduler")),
+    "balikrun.engine.distributed": (600.0, ("fastapi",)),
+    "balikrun.api": (1500.0, ()),
+}
+
+_CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t0
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {forbidden!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module: str, forbidden: Iterable[str] = (), *, repeat: int = 5) -> dict[str, Any]:
+    """
+    Best-of-`repeat` import time of `module` in fresh interpreters, plus any forbidden
+    modules it loaded.
+    """
+    code = _CHILD.format(module=module, forbidden=tuple(forbidden))
+    times: list[float] = []
+    loaded: set[str] = set()
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True, text=True
+        ).stdout
+        doc = json.loads(out.strip().splitlines()[-1])
+        times.append(doc["seconds"])
+        loaded.update(doc["loaded"])
+    return {"seconds": min(times), "repeat": repeat, "loaded": sorted(loaded)}
+
+
+def run(targets: Iterable[str], *, repeat: int = 5, out=sys.stdout) -> tuple[dict[str, Any], list[str]]:
+    """
+    Measure `targets` and return (results document, budget/boundary violations).
+    """
+    results: dict[str, Any] = {}
+    violations: list[str] = []
+    for module in targets:
+        budget_ms, forbidden = TARGETS[module]
+        r = measure(module, forbidden, repeat=repeat)
+        r["budget_ms"] = budget_ms
+        results[f"import/{module}"] = r
+        ms = r["seconds"] * 1e3
+        print(f"{module:<32} {ms:>9.1f} ms  (budget {budget_ms:.0f} ms)", file=out)
+        if ms > budget_ms:
+            violations.append(f"{module}: {ms:.1f} ms exceeds budget {budget_ms:.0f} ms")
+        if r["loaded"]:
+            violations.append(f"{module}: imports {', '.join(r['loaded'])}")
+    doc = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    return doc, violations
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="balikrun import-time gate")
+    p.add_argument("--module", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--save", type=Path, default=None, help="write results JSON here")
+    p.add_argument("--compare", type=Path, default=None, help="baseline JSON to compare against")
+    p.add_argument("--threshold", type=float, default=0.5, help="allowed slowdown (0.5 = 50%%)")
+    args = p.parse_args(argv)
+
+    doc, violations = run(args.module, repeat=args.repeat)
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(doc, indent=2, sort_keys=True))
+    if args.compare:
+        violations += compare(doc, json.loads(args.compare.read_text()), threshold=args.threshold)
+    for line in violations:
+        print(f"FAIL {line}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
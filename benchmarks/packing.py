@@ -0,0 +1,192 @@
+# benchmarks/packing.py
+"""
+Simulation benchmark: resource-aware bin packing vs FIFO lease assignment.
+
+A heterogeneous cluster (cpu boxes, memory boxes, gpu boxes) drains a queue of
+independent tasks with mixed cpu/memory/gpu requirements. Both policies see the same
+tasks and durations; an event heap advances time to the next task completion.
+
+  fifo       head-of-line: place the queue head on the first worker it fits, stop at
+             the first task that does not fit anywhere right now
+  first_fit  scan a window of the queue in order, placing each task on the first
+             worker it fits and skipping those that do not (FIFO with backfill)
+  packed     ResourcePacker over the same window (largest first, best alignment)
+
+Reported: makespan and the time-weighted allocated fraction of each dimension while
+tasks are waiting ("backlogged"), i.e. how much capacity is used when there is work
+that could use it.
+
+Usage:
+    python -m benchmarks.packing
+    python -m benchmarks.packing --tasks 20000 --seed 7
+"""
+from __future__ import annotations
+
+import argparse
+import heapq
+import random
+import time
+from typing import Any, Optional, Sequence
+
+from balikrun.engine.resources import RESOURCE_DIMENSIONS, ResourcePacker, ResourceVector, fits
+
+CLUSTER: dict[str, ResourceVector] = {
+    **{f"cpu{i}": (32.0, 64_000.0, 0.0) for i in range(6)},
+    **{f"mem{i}": (8.0, 256_000.0, 0.0) for i in range(4)},
+    **{f"gpu{i}": (16.0, 96_000.0, 4.0) for i in range(2)},
+}
+
+# (weight, request, mean duration). Cpu and memory are both close to saturation; big
+# memory tasks only fit the memory boxes and gpu tasks only the gpu boxes.
+TASK_MIX: list[tuple[float, ResourceVector, float]] = [
+    (0.40, (1.0, 2_000.0, 0.0), 1.0),      # small
+    (0.30, (8.0, 8_000.0, 0.0), 4.0),      # cpu heavy
+    (0.15, (2.0, 48_000.0, 0.0), 6.0),     # memory heavy
+    (0.10, (2.0, 192_000.0, 0.0), 6.0),    # big memory
+    (0.05, (4.0, 24_000.0, 1.0), 8.0),     # gpu
+]
+
+
+def generate_tasks(n: int, *, seed: int = 0) -> list[tuple[str, ResourceVector, float]]:
+    rng = random.Random(seed)
+    weights = [w for w, _, _ in TASK_MIX]
+    out = []
+    for i in range(n):
+        _, request, mean = rng.choices(TASK_MIX, weights)[0]
+        out.append((f"t{i}", request, rng.expovariate(1.0 / mean)))
+    return out
+
+
+def simulate(
+    tasks: Sequence[tuple[str, ResourceVector, float]],
+    cluster: dict[str, ResourceVector],
+    *,
+    policy: str,
+    window: int = 256,
+) -> dict[str, Any]:
+    """
+    Run all `tasks` to completion under `policy` ("fifo", "first_fit" or "packed").
+    """
+    packer = ResourcePacker(cluster)
+    info = {node_id: (request, duration) for node_id, request, duration in tasks}
+    backlog = iter(tasks)
+    waiting: list[tuple[str, ResourceVector, float]] = []  # queue head, in order
+    running: list[tuple[float, str, str]] = []  # (finish time, node_id, worker_id)
+    now = 0.0
+
+    def refill(size: int) -> None:
+        while len(waiting) < size:
+            task = next(backlog, None)
+            if task is None:
+                return
+            waiting.append(task)
+
+    def first_fit(request: ResourceVector) -> Optional[str]:
+        return next((w for w in cluster if fits(request, packer.free(w))), None)
+
+    def schedule() -> None:
+        if policy == "fifo":
+            refill(1)
+            while waiting:
+                node_id, request, duration = waiting[0]
+                worker = first_fit(request)
+                if worker is None:
+                    return
+                packer.allocate(worker, request)
+                heapq.heappush(running, (now + duration, node_id, worker))
+                waiting.pop(0)
+                refill(1)
+            return
+        refill(window)
+        if policy == "first_fit":
+            kept = []
+            no_fit: set[ResourceVector] = set()
+            for node_id, request, duration in waiting:
+                worker = None if request in no_fit else first_fit(request)
+                if worker is None:
+                    no_fit.add(request)
+                    kept.append((node_id, request, duration))
+                    continue
+                packer.allocate(worker, request)
+                heapq.heappush(running, (now + duration, node_id, worker))
+            waiting[:] = kept
+            refill(window)
+            return
+        placement = packer.place([(node_id, request) for node_id, request, _ in waiting])
+        if not placement.placed:
+            return
+        for worker, node_ids in placement.assignments.items():
+            for node_id in node_ids:
+                heapq.heappush(running, (now + info[node_id][1], node_id, worker))
+        deferred = set(placement.deferred)
+        waiting[:] = [t for t in waiting if t[0] in deferred]
+        refill(window)
+
+    # Time-weighted allocation while tasks are waiting: how well capacity is used when
+    # there is work to place (the tail after the queue drains is the same for all).
+    area = [0.0] * len(RESOURCE_DIMENSIONS)
+    backlogged = 0.0
+
+    schedule()
+    while running:
+        t_next = running[0][0]
+        if waiting:
+            used = packer.utilization()
+            for i, u in enumerate(used):
+                area[i] += u * (t_next - now)
+            backlogged += t_next - now
+        now, node_id, worker = heapq.heappop(running)
+        packer.release(worker, info[node_id][0])
+        # Drain every completion at the same instant before rescheduling.
+        while running and running[0][0] == now:
+            _, nid, w = heapq.heappop(running)
+            packer.release(w, info[nid][0])
+        schedule()
+    if waiting:
+        raise ValueError(f"{len(waiting)} tasks never fit the cluster.")
+
+    makespan = now
+    utilization = {}
+    for i, dim in enumerate(RESOURCE_DIMENSIONS):
+        total = sum(c[i] for c in cluster.values())
+        if total > 0:
+            work = sum(request[i] * duration for _, request, duration in tasks)
+            utilization[dim] = work / (total * makespan)
+    saturated = {
+        dim: area[i] / backlogged
+        for i, dim in enumerate(RESOURCE_DIMENSIONS)
+        if backlogged > 0 and dim in utilization
+    }
+    return {
+        "policy": policy,
+        "makespan": makespan,
+        "utilization": utilization,
+        "backlogged_utilization": saturated,
+        "backlogged_time": backlogged,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="bin packing vs FIFO simulation")
+    p.add_argument("--tasks", type=int, default=5_000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--window", type=int, default=256)
+    args = p.parse_args(argv)
+
+    tasks = generate_tasks(args.tasks, seed=args.seed)
+    results = {}
+    for policy in ("fifo", "first_fit", "packed"):
+        t0 = time.perf_counter()
+        r = simulate(tasks, CLUSTER, policy=policy, window=args.window)
+        wall = time.perf_counter() - t0
+        results[policy] = r
+        util = "  ".join(f"{d}={u:6.1%}" for d, u in r["backlogged_utilization"].items())
+        print(f"{policy:<10} makespan={r['makespan']:9.1f}  backlogged: {util}  (sim {wall:.2f} s)")
+    for baseline in ("fifo", "first_fit"):
+        speedup = results[baseline]["makespan"] / results["packed"]["makespan"]
+        print(f"packed finishes {speedup:.2f}x sooner than {baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,215 @@
+# benchmarks/run.py
+"""
+Benchmark harness for balikrun hot paths.
+
+Benchmarks (each over the workloads in benchmarks/workloads.py):
+  compile          compile_to_graph_ir on compilable specs
+  validate_spec    Block validation (model_validate on the spec payload)
+  validate_graph   GraphIR validation (model_validate on the graph payload)
+  json_spec        spec JSON round trip (model_dump_json + model_validate_json)
+  json_graph       GraphIR JSON round trip
+  schedule         Frontier throughput: drive every TASK through take/complete
+
+Results are machine-readable JSON: {"meta": {...}, "results": {"<bench>/<workload>/<n>": {...}}}.
+A saved baseline can be compared against; entries slower than --threshold fail the run.
+
+Usage:
+    python -m benchmarks.run                          # quick sizes, print table
+    python -m benchmarks.run --sizes 10 1000 1000000  # explicit sizes
+    python -m benchmarks.run --save benchmarks/baselines/local.json
+    python -m benchmarks.run --compare benchmarks/baselines/local.json --threshold 0.25
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from pydantic import TypeAdapter
+
+from balikrun.compile import CompileOptions, compile_to_graph_ir
+from balikrun.engine.scheduler import Frontier, GraphIndex
+from balikrun.ir import GraphIR
+from balikrun.specification import Block
+from benchmarks.workloads import COMPILABLE_SPECS, GRAPHS, SPECS
+
+QUICK_SIZES = (10, 100, 1_000, 10_000)
+FULL_SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+_BLOCK = TypeAdapter(Block)
+
+# A benchmark is (workloads, setup, op): setup(generator, n) builds the input untimed and
+# op(input) is the timed operation. Throughput is reported as workload size n per second.
+Setup = Callable[[Callable[[int], Any], int], Any]
+Op = Callable[[Any], Any]
+
+
+def _time(op: Op, arg: Any, *, repeat: int) -> list[float]:
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            t0 = time.perf_counter()
+            op(arg)
+            times.append(time.perf_counter() - t0)
+        finally:
+            gc.enable()
+    return times
+
+
+def _drive(gi: GraphIndex) -> int:
+    f = Frontier(gi)
+    f.start()
+    done = 0
+    while True:
+        batch = f.take(64)
+        if not batch:
+            break
+        for node_id in batch:
+            f.complete(node_id)
+        done += len(batch)
+    assert f.done, "workload did not reach EXIT"
+    return done
+
+
+BENCHMARKS: dict[str, tuple[dict[str, Callable[[int], Any]], Setup, Op]] = {
+    "compile": (
+        COMPILABLE_SPECS,
+        lambda gen, n: _BLOCK.validate_python(gen(n)),
+        lambda spec: compile_to_graph_ir(spec, options=CompileOptions(graph_id="bench")),
+    ),
+    "validate_spec": (
+        SPECS,
+        lambda gen, n: gen(n),
+        _BLOCK.validate_python,
+    ),
+    "validate_graph": (
+        GRAPHS,
+        lambda gen, n: gen(n),
+        GraphIR.model_validate,
+    ),
+    "json_spec": (
+        SPECS,
+        lambda gen, n: _BLOCK.validate_python(gen(n)),
+        lambda spec: _BLOCK.validate_json(_BLOCK.dump_json(spec)),
+    ),
+    "json_graph": (
+        GRAPHS,
+        lambda gen, n: GraphIR.model_validate(gen(n)),
+        lambda g: GraphIR.model_validate_json(g.model_dump_json()),
+    ),
+    "schedule": (
+        GRAPHS,
+        lambda gen, n: GraphIndex.from_graph(GraphIR.model_validate(gen(n))),
+        _drive,
+    ),
+}
+
+
+def run(
+    benchmarks: Iterable[str],
+    sizes: Iterable[int],
+    *,
+    workloads: Optional[set[str]] = None,
+    repeat: int = 5,
+    budget: float = 30.0,
+    out=sys.stdout,
+) -> dict[str, Any]:
+    """
+    Run the selected benchmarks and return the results document.
+
+    Repeats shrink for large inputs so one entry stays within roughly `budget` seconds;
+    the reported statistic is the minimum (least noisy) with the median alongside.
+    """
+    results: dict[str, Any] = {}
+    for bench in benchmarks:
+        gens, setup, op = BENCHMARKS[bench]
+        for name, gen in gens.items():
+            if workloads and name not in workloads:
+                continue
+            for n in sizes:
+                arg = setup(gen, n)
+                first = _time(op, arg, repeat=1)
+                reps = max(0, min(repeat - 1, int(budget / max(first[0], 1e-9)) - 1))
+                times = first + _time(op, arg, repeat=reps)
+                best = min(times)
+                key = f"{bench}/{name}/{n}"
+                results[key] = {
+                    "seconds": best,
+                    "median": statistics.median(times),
+                    "repeat": len(times),
+                    "n": n,
+                    "per_sec": n / best if best > 0 else 0.0,
+                }
+                print(f"{key:<40} {best * 1e3:>12.3f} ms {results[key]['per_sec']:>14,.0f} /s", file=out)
+                del arg
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], *, threshold: float) -> list[str]:
+    """
+    Entries present in both documents that got slower than baseline * (1 + threshold).
+    """
+    regressions = []
+    base = baseline.get("results", {})
+    for key, cur in current["results"].items():
+        ref = base.get(key)
+        if ref is None:
+            continue
+        ratio = cur["seconds"] / ref["seconds"] if ref["seconds"] > 0 else 1.0
+        if ratio > 1.0 + threshold:
+            regressions.append(f"{key}: {ref['seconds'] * 1e3:.3f} ms -> {cur['seconds'] * 1e3:.3f} ms (x{ratio:.2f})")
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="balikrun benchmark harness")
+    p.add_argument("--bench", nargs="+", choices=sorted(BENCHMARKS), default=sorted(BENCHMARKS))
+    p.add_argument("--workload", nargs="+", default=None, help="restrict to these workload names")
+    p.add_argument("--sizes", nargs="+", type=int, default=None)
+    p.add_argument("--full", action="store_true", help=f"sizes {FULL_SIZES}")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--budget", type=float, default=30.0, help="approx. seconds per entry")
+    p.add_argument("--save", type=Path, default=None, help="write results JSON here")
+    p.add_argument("--compare", type=Path, default=None, help="baseline JSON to compare against")
+    p.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)")
+    args = p.parse_args(argv)
+
+    sizes = args.sizes or (FULL_SIZES if args.full else QUICK_SIZES)
+    doc = run(
+        args.bench,
+        sizes,
+        workloads=set(args.workload) if args.workload else None,
+        repeat=args.repeat,
+        budget=args.budget,
+    )
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(doc, indent=2, sort_keys=True))
+    if args.compare:
+        regressions = compare(doc, json.loads(args.compare.read_text()), threshold=args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
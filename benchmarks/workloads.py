@@ -0,0 +1,235 @@
+# benchmarks/workloads.py
+"""
+Synthetic workload generators for the benchmark suite.
+
+Spec workloads return JSON-like dicts (what a client submits); graph workloads return
+GraphIR payload dicts. Every generator takes a target size `n` (number of TASKs,
+approximately) and is deterministic.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable
+
+Payload = dict[str, Any]
+
+
+def _task(task_id: str, node_id: str | None = None) -> Payload:
+    t: Payload = {"kind": "task_ref", "task_id": task_id}
+    if node_id is not None:
+        t["node_id"] = node_id
+    return t
+
+
+# ---------------------------------------------------------------------------
+# Specification workloads
+# ---------------------------------------------------------------------------
+
+def spec_deep_sequence(n: int) -> Payload:
+    """
+    One long SequenceBlock of n tasks with stable node_ids.
+    """
+    return {"kind": "sequence", "items": [_task(f"t{i % 97}", f"s{i}") for i in range(n)]}
+
+
+def spec_nested_sequence(n: int, fanout: int = 10) -> Payload:
+    """
+    Sequences of sequences, `fanout` items per level, n tasks in total.
+    """
+    items: list[Payload] = [_task(f"t{i % 97}") for i in range(n)]
+    while len(items) > fanout:
+        items = [
+            {"kind": "sequence", "items": items[i:i + fanout]} for i in range(0, len(items), fanout)
+        ]
+    return {"kind": "sequence", "items": items}
+
+
+def spec_wide_parallel(n: int) -> Payload:
+    """
+    One ParallelBlock with n single-task branches.
+    """
+    return {
+        "kind": "parallel",
+        "join": "AND",
+        "branches": [{"label": f"b{i}", "body": _task(f"t{i % 97}")} for i in range(n)],
+    }
+
+
+def spec_nested_choice_loop(n: int, depth: int = 8) -> Payload:
+    """
+    n/depth chains of `depth` nested Choice -> Loop -> Choice ... blocks.
+    """
+    def nest(level: int, k: int) -> Payload:
+        if level == depth:
+            return _task(f"leaf{k % 97}")
+        if level % 2 == 0:
+            return {
+                "kind": "choice",
+                "cases": [{"label": "go", "guard": f"g{level}", "body": nest(level + 1, k)}],
+                "default": _task(f"else{level}"),
+            }
+        return {"kind": "loop", "guard": f"again{level}", "max_iters": 3, "body": nest(level + 1, k)}
+
+    count = max(1, n // (depth // 2 + 1))
+    return {"kind": "sequence", "items": [nest(0, k) for k in range(count)]}
+
+
+def _usage_unit(k: int) -> Payload:
+    # Mirrors tests/specification/test_usage.py: the canonical realistic shape.
+    return {
+        "kind": "sequence",
+        "items": [
+            _task("ingest"),
+            {
+                "kind": "parallel",
+                "branches": [
+                    {"label": "train", "body": _task("train")},
+                    {"label": "eval", "body": _task("eval")},
+                ],
+            },
+            {
+                "kind": "choice",
+                "cases": [{"label": "publish", "guard": "is_good", "body": _task("publish")}],
+                "default": {"kind": "loop", "guard": "not_good", "max_iters": 3, "body": _task("tune")},
+            },
+            {
+                "kind": "composite",
+                "name": f"packaging{k}",
+                "body": {"kind": "sequence", "items": [_task("bundle"), _task("upload")]},
+            },
+        ],
+    }
+
+
+def spec_usage_mix(n: int) -> Payload:
+    """
+    The test_usage.py workflow (7 tasks) repeated to ~n tasks.
+    """
+    return {"kind": "sequence", "items": [_usage_unit(k) for k in range(max(1, n // 7))]}
+
+
+# Compilable by the v0 compiler (TaskReference + SequenceBlock only).
+COMPILABLE_SPECS: dict[str, Callable[[int], Payload]] = {
+    "deep_sequence": spec_deep_sequence,
+    "nested_sequence": spec_nested_sequence,
+}
+
+SPECS: dict[str, Callable[[int], Payload]] = {
+    **COMPILABLE_SPECS,
+    "wide_parallel": spec_wide_parallel,
+    "nested_choice_loop": spec_nested_choice_loop,
+    "usage_mix": spec_usage_mix,
+}
+
+
+# ---------------------------------------------------------------------------
+# GraphIR workloads
+# ---------------------------------------------------------------------------
+
+class _GraphBuilder:
+    def __init__(self) -> None:
+        self.nodes: list[Payload] = []
+        self.edges: list[Payload] = []
+        self._i = 0
+
+    def node(self, kind: str, task_id: str | None = None, **extra: Any) -> str:
+        node_id = f"n{self._i}"
+        self._i += 1
+        node: Payload = {"node_id": node_id, "kind": kind}
+        if task_id is not None:
+            node["task_id"] = task_id
+        node.update(extra)
+        self.nodes.append(node)
+        return node_id
+
+    def edge(self, src: str, dst: str, **extra: Any) -> None:
+        self.edges.append({"src": src, "dst": dst, **extra})
+
+    def build(self, graph_id: str, entry: str, exit: str) -> Payload:
+        return {
+            "graph_id": graph_id,
+            "nodes": self.nodes,
+            "edges": self.edges,
+            "entry_id": entry,
+            "exit_id": exit,
+        }
+
+
+def graph_chain(n: int) -> Payload:
+    """
+    ENTRY -> n TASKs in a line -> EXIT.
+    """
+    b = _GraphBuilder()
+    entry = prev = b.node("ENTRY")
+    for i in range(n):
+        t = b.node("TASK", f"t{i % 97}")
+        b.edge(prev, t)
+        prev = t
+    exit = b.node("EXIT")
+    b.edge(prev, exit)
+    return b.build("chain", entry, exit)
+
+
+def graph_fan_out(n: int) -> Payload:
+    """
+    ENTRY -> FORK -> n parallel TASKs -> JOIN -> EXIT.
+    """
+    b = _GraphBuilder()
+    entry = b.node("ENTRY")
+    fork = b.node("FORK")
+    join = b.node("JOIN")
+    exit = b.node("EXIT")
+    b.edge(entry, fork)
+    for i in range(n):
+        t = b.node("TASK", f"t{i % 97}")
+        b.edge(fork, t)
+        b.edge(t, join)
+    b.edge(join, exit)
+    return b.build("fan_out", entry, exit)
+
+
+def graph_usage_mix(n: int) -> Payload:
+    """
+    The test_usage.py workflow lowered by hand to GraphIR, repeated to ~n tasks:
+    ingest, FORK(train, eval) JOIN, DECISION(publish | loop(tune)) MERGE, bundle, upload.
+    """
+    b = _GraphBuilder()
+    entry = prev = b.node("ENTRY")
+    for _ in range(max(1, n // 7)):
+        ingest = b.node("TASK", "ingest")
+        b.edge(prev, ingest)
+        fork = b.node("FORK")
+        join = b.node("JOIN")
+        b.edge(ingest, fork)
+        for name in ("train", "eval"):
+            t = b.node("TASK", name)
+            b.edge(fork, t)
+            b.edge(t, join)
+        decide = b.node("DECISION")
+        merge = b.node("MERGE")
+        b.edge(join, decide)
+        publish = b.node("TASK", "publish")
+        b.edge(decide, publish, label="publish", guard="is_good")
+        b.edge(publish, merge)
+        loop_head = b.node("MERGE")
+        tune = b.node("TASK", "tune")
+        loop_test = b.node("DECISION")
+        b.edge(decide, loop_head, label="default")
+        b.edge(loop_head, tune)
+        b.edge(tune, loop_test)
+        b.edge(loop_test, loop_head, label="again", guard="not_good")
+        b.edge(loop_test, merge, label="done")
+        bundle = b.node("TASK", "bundle")
+        upload = b.node("TASK", "upload")
+        b.edge(merge, bundle)
+        b.edge(bundle, upload)
+        prev = upload
+    exit = b.node("EXIT")
+    b.edge(prev, exit)
+    return b.build("usage_mix", entry, exit)
+
+
+GRAPHS: dict[str, Callable[[int], Payload]] = {
+    "chain": graph_chain,
+    "fan_out": graph_fan_out,
+    "usage_mix": graph_usage_mix,
+}
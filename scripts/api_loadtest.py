@@ -0,0 +1,155 @@
+# scripts/api_loadtest.py
+"""
+Local load test for the balikrun HTTP API.
+
+Runs the app under uvicorn in-process, opens many concurrent SSE subscribers on one
+run, polls run status, and appends events from a producer thread. Reports connected
+subscribers, event fan-out latency and status throughput.
+
+Usage:
+    python scripts/api_loadtest.py --subscribers 2000 --events 200 --pollers 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import resource
+import statistics
+import threading
+import time
+
+import uvicorn
+
+from balikrun.api import create_app
+from balikrun.engine.events import EventType
+from balikrun.engine.runs import RunRegistry
+from balikrun.engine.scheduler import NodeState
+from balikrun.specification import SequenceBlock, TaskReference
+
+
+def _raise_fd_limit() -> None:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def _subscriber(port: int, run_id: str, latencies: list[float], ready: list[int]) -> int:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"GET /runs/{run_id}/events HTTP/1.1\r\nHost: localhost\r\n"
+        "Accept: text/event-stream\r\n\r\n".encode()
+    )
+    await writer.drain()
+    received = 0
+    ready.append(1)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if line.startswith(b"data: "):
+                event = json.loads(line[6:])
+                received += 1
+                latencies.append(time.time() - event["ts"])
+                if event["type"] == EventType.RUN_FINISHED.value:
+                    break
+    finally:
+        writer.close()
+    return received
+
+
+async def _poller(port: int, run_id: str, stop: asyncio.Event, counter: list[int]) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = f"GET /runs/{run_id} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode()
+    try:
+        while not stop.is_set():
+            writer.write(request)
+            await writer.drain()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+                if line in (b"\r\n", b""):
+                    break
+            await reader.readexactly(length)
+            counter[0] += 1
+    finally:
+        writer.close()
+
+
+def _produce(reg: RunRegistry, run_id: str, n_events: int, interval: float) -> None:
+    for i in range(n_events):
+        state = NodeState.RUNNING if i % 2 == 0 else NodeState.COMPLETED
+        reg.log.append(run_id, EventType.NODE_STATE, node_id="t0", task_id="t", state=state)
+        time.sleep(interval)
+    reg.log.append(run_id, EventType.RUN_FINISHED)
+
+
+async def main(args: argparse.Namespace) -> None:
+    _raise_fd_limit()
+    reg = RunRegistry()
+    run = reg.submit(SequenceBlock(items=[TaskReference(task_id="t", node_id="t0")]))
+
+    config = uvicorn.Config(
+        create_app(reg),
+        host="127.0.0.1",
+        port=args.port,
+        log_level="warning",
+        backlog=args.subscribers * 2,
+    )
+    server = uvicorn.Server(config)
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    latencies: list[float] = []
+    ready: list[int] = []
+    t0 = time.perf_counter()
+    subs = [
+        asyncio.create_task(_subscriber(args.port, run.run_id, latencies, ready))
+        for _ in range(args.subscribers)
+    ]
+    while len(ready) < args.subscribers:
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(0.5)  # let every subscriber reach the wait state
+    connect_s = time.perf_counter() - t0
+
+    stop = asyncio.Event()
+    polls = [0]
+    pollers = [
+        asyncio.create_task(_poller(args.port, run.run_id, stop, polls))
+        for _ in range(args.pollers)
+    ]
+    t1 = time.perf_counter()
+    producer = threading.Thread(
+        target=_produce, args=(reg, run.run_id, args.events, args.interval), daemon=True
+    )
+    producer.start()
+    received = await asyncio.gather(*subs)
+    elapsed = time.perf_counter() - t1
+    stop.set()
+    await asyncio.gather(*pollers)
+
+    server.should_exit = True
+    await server_task
+
+    expected = args.events + 2  # RUN_CREATED + NODE_STATE* + RUN_FINISHED
+    lat_ms = sorted(x * 1000 for x in latencies)
+    print(f"subscribers:        {args.subscribers} (connected in {connect_s:.2f}s)")
+    print(f"complete streams:   {sum(1 for r in received if r == expected)}/{args.subscribers}")
+    print(f"events delivered:   {sum(received)}")
+    print(f"fan-out latency ms: p50={statistics.median(lat_ms):.1f} "
+          f"p99={lat_ms[int(len(lat_ms) * 0.99) - 1]:.1f} max={lat_ms[-1]:.1f}")
+    print(f"status polls/s:     {polls[0] / elapsed:.0f} ({args.pollers} pollers)")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--subscribers", type=int, default=1000)
+    p.add_argument("--events", type=int, default=100)
+    p.add_argument("--interval", type=float, default=0.01)
+    p.add_argument("--pollers", type=int, default=10)
+    p.add_argument("--port", type=int, default=8765)
+    asyncio.run(main(p.parse_args()))
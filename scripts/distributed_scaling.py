@@ -0,0 +1,79 @@
+# scripts/distributed_scaling.py
+"""
+Scaling demo for the distributed executor on one box.
+
+Runs a FORK/JOIN fan-out of N tasks through Coordinator + LocalBroker with 1..W worker
+processes and prints makespan, throughput and work-stealing counts. Tasks either
+sleep (I/O-bound; scales with workers on any machine) or spin (CPU-bound; scales up
+to the number of cores).
+
+Usage:
+    python scripts/distributed_scaling.py --tasks 2000 --workers 1 2 4 8 --work sleep
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+from balikrun.engine.distributed import Coordinator, LocalBroker, TaskContext
+from balikrun.ir import Edge, GraphIR, Node, NodeKind
+
+TASK_MS = 2.0
+
+
+def sleep_task(ctx: TaskContext) -> None:
+    # Skewed durations so work stealing has something to fix.
+    time.sleep(TASK_MS / 1000 * (4 if int(ctx.node_id[1:]) % 10 == 0 else 1))
+
+
+def cpu_task(ctx: TaskContext) -> int:
+    deadline = time.perf_counter() + TASK_MS / 1000
+    n = 0
+    while time.perf_counter() < deadline:
+        n += 1
+    return n
+
+
+def fan_out(n: int) -> GraphIR:
+    nodes = [Node(node_id="entry", kind=NodeKind.ENTRY), Node(node_id="fork", kind=NodeKind.FORK)]
+    edges = [Edge(src="entry", dst="fork")]
+    for i in range(n):
+        nodes.append(Node(node_id=f"t{i}", kind=NodeKind.TASK, task_id="work"))
+        edges.append(Edge(src="fork", dst=f"t{i}"))
+        edges.append(Edge(src=f"t{i}", dst="join"))
+    nodes += [Node(node_id="join", kind=NodeKind.JOIN), Node(node_id="exit", kind=NodeKind.EXIT)]
+    edges.append(Edge(src="join", dst="exit"))
+    return GraphIR(graph_id="fan_out", nodes=nodes, edges=edges, entry_id="entry", exit_id="exit")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--tasks", type=int, default=2000)
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    p.add_argument("--work", choices=["sleep", "cpu"], default="sleep")
+    p.add_argument("--capacity", type=int, default=8)
+    p.add_argument("--max-batch", type=int, default=8)
+    args = p.parse_args()
+
+    task = sleep_task if args.work == "sleep" else cpu_task
+    graph = fan_out(args.tasks)
+    print(f"{args.tasks} x {TASK_MS}ms {args.work} tasks, cpus={os.cpu_count()}")
+    print(f"{'workers':>7} {'makespan_s':>10} {'tasks/s':>9} {'speedup':>8} {'steals':>7}  per-worker")
+    base = None
+    for w in args.workers:
+        coord = Coordinator(graph, run_id=f"scale{w}", max_batch=args.max_batch)
+        with LocalBroker() as broker:
+            broker.spawn_workers(w, {"work": task}, capacity=args.capacity)
+            result = coord.run(broker, timeout=600)
+        assert result.ok, result.errors
+        base = base or result.elapsed
+        counts = sorted(result.tasks_per_worker.values())
+        print(
+            f"{w:>7} {result.elapsed:>10.2f} {args.tasks / result.elapsed:>9.0f} "
+            f"{base / result.elapsed:>8.2f} {result.steals:>7}  {counts}"
+        )
+
+
+if __name__ == "__main__":
+    main()
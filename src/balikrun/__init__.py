@@ -0,0 +1,47 @@
+# src/balikrun/__init__.py
+from __future__ import annotations
+
+# `import balikrun` loads nothing else. The names below are resolved on first attribute
+# access (PEP 562), so a process pays for pydantic, the compiler or the engine only when
+# it uses them; worker processes import `balikrun.engine.worker`, which is stdlib-only.
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from balikrun.compile import CompileOptions, compile_to_graph_ir
+    from balikrun.ir import Edge, GraphIR, Node, NodeKind
+    from balikrun.specification import Block
+
+__all__ = [
+    "Block",
+    "CompileOptions",
+    "Edge",
+    "GraphIR",
+    "Node",
+    "NodeKind",
+    "compile_to_graph_ir",
+]
+
+_LAZY: dict[str, str] = {
+    "Block": "balikrun.specification",
+    "CompileOptions": "balikrun.compile",
+    "compile_to_graph_ir": "balikrun.compile",
+    "Edge": "balikrun.ir",
+    "GraphIR": "balikrun.ir",
+    "Node": "balikrun.ir",
+    "NodeKind": "balikrun.ir",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module 'balikrun' has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY])
@@ -0,0 +1,212 @@
+# src/balikrun/api.py
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from fastapi import FastAPI, Header, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict
+
+from balikrun.compile import CompileOptions
+from balikrun.engine.events import Event, EventLog, EventType
+from balikrun.engine.runs import RunRegistry
+from balikrun.specification import Block
+
+
+class SubmitRequest(BaseModel):
+    """
+    Body of POST /runs: a specification plus compile options.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    spec: Block
+    graph_id: str = "workflow"
+    node_id_prefix: str = "n"
+    preserve_spec_node_ids: bool = True
+
+
+class SubmitResponse(BaseModel):
+    run_id: str
+    graph_id: str
+    spec_digest: str
+    node_count: int
+    edge_count: int
+
+
+class EventFeed:
+    """
+    Wakes async subscribers when events are appended for a run.
+
+    One shared future per run is resolved on append and replaced lazily, so an append
+    costs O(1) regardless of subscriber count and each subscriber reads the new events
+    straight from the log from its own cursor (no per-subscriber queues).
+    EventLog appends may come from any thread; wakeups are marshalled onto the loop.
+    Serialized events are memoized by seq so fan-out encodes each event once.
+    """
+
+    def __init__(self, log: EventLog, loop: asyncio.AbstractEventLoop, *, encode_cache: int = 4096):
+        self._log = log
+        self._encoded: OrderedDict[int, str] = OrderedDict()
+        self._encode_cache = encode_cache
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+        self._waiters: dict[str, asyncio.Future[None]] = {}
+        self._unsubscribe = log.subscribe(self._on_event)
+
+    def close(self) -> None:
+        self._unsubscribe()
+        for fut in self._waiters.values():
+            if not fut.done():
+                fut.cancel()
+        self._waiters.clear()
+
+    def encode(self, event: Event) -> str:
+        """
+        JSON encoding of `event`, shared by all subscribers.
+        """
+        text = self._encoded.get(event.seq)
+        if text is None:
+            text = event.model_dump_json()
+            self._encoded[event.seq] = text
+            if len(self._encoded) > self._encode_cache:
+                self._encoded.popitem(last=False)
+        return text
+
+    def _on_event(self, event: Event) -> None:
+        if threading.get_ident() == self._loop_thread:
+            self._wake(event.run_id)
+        else:
+            self._loop.call_soon_threadsafe(self._wake, event.run_id)
+
+    def _wake(self, run_id: str) -> None:
+        fut = self._waiters.pop(run_id, None)
+        if fut is not None and not fut.done():
+            fut.set_result(None)
+
+    def _waiter(self, run_id: str) -> asyncio.Future[None]:
+        fut = self._waiters.get(run_id)
+        if fut is None:
+            fut = self._loop.create_future()
+            self._waiters[run_id] = fut
+        return fut
+
+    async def follow(self, run_id: str, *, after: int = -1) -> AsyncIterator[list[Event]]:
+        """
+        Yield batches of the run's events with seq > `after` until RUN_FINISHED.
+        """
+        cursor = after
+        while True:
+            # Take the waiter before reading so an append between the two is not missed.
+            fut = self._waiter(run_id)
+            batch = self._log.read(run_id, after=cursor)
+            if not batch:
+                await asyncio.shield(fut)
+                continue
+            cursor = batch[-1].seq
+            yield batch
+            if batch[-1].type == EventType.RUN_FINISHED:
+                return
+
+
+def _sse(event: Event, data: str) -> str:
+    return f"id: {event.seq}\nevent: {event.type.value}\ndata: {data}\n\n"
+
+
+def create_app(registry: Optional[RunRegistry] = None) -> FastAPI:
+    """
+    Build the HTTP API around `registry` (a fresh RunRegistry by default).
+
+    Endpoints:
+      POST /runs                 validate + compile (cached) + create a run
+      GET  /runs/{run_id}        status from the materialized RunStateView
+      GET  /runs/{run_id}/events Server-Sent Events stream of the run's event log
+      WS   /runs/{run_id}/ws     same stream over a WebSocket (JSON per event)
+    """
+    reg = registry if registry is not None else RunRegistry()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        app.state.feed = EventFeed(reg.log, asyncio.get_running_loop())
+        try:
+            yield
+        finally:
+            app.state.feed.close()
+
+    app = FastAPI(title="balikrun", lifespan=lifespan)
+    app.state.registry = reg
+
+    def _require_run(run_id: str) -> None:
+        if run_id not in reg:
+            raise HTTPException(status_code=404, detail=f"Unknown run '{run_id}'.")
+
+    # Sync on purpose: validation and compiling can take a while, so FastAPI runs this
+    # in its threadpool instead of stalling every open event stream on the loop.
+    @app.post("/runs", response_model=SubmitResponse, status_code=201)
+    def submit_run(body: SubmitRequest) -> SubmitResponse:
+        options = CompileOptions(
+            graph_id=body.graph_id,
+            node_id_prefix=body.node_id_prefix,
+            preserve_spec_node_ids=body.preserve_spec_node_ids,
+        )
+        try:
+            run = reg.submit(body.spec, options=options)
+        except (NotImplementedError, ValueError) as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
+        return SubmitResponse(
+            run_id=run.run_id,
+            graph_id=run.graph.graph_id,
+            spec_digest=run.spec_digest,
+            node_count=len(run.graph.nodes),
+            edge_count=len(run.graph.edges),
+        )
+
+    @app.get("/runs/{run_id}")
+    async def run_status(run_id: str) -> dict:
+        status = reg.view.status(run_id)
+        if status is None:
+            raise HTTPException(status_code=404, detail=f"Unknown run '{run_id}'.")
+        return status
+
+    @app.get("/runs/{run_id}/events")
+    async def run_events(
+        run_id: str,
+        after: int = -1,
+        last_event_id: Optional[int] = Header(default=None),
+    ) -> StreamingResponse:
+        _require_run(run_id)
+        start = last_event_id if last_event_id is not None else after
+        feed: EventFeed = app.state.feed
+
+        async def stream() -> AsyncIterator[str]:
+            async for batch in feed.follow(run_id, after=start):
+                yield "".join(_sse(e, feed.encode(e)) for e in batch)
+
+        return StreamingResponse(
+            stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.websocket("/runs/{run_id}/ws")
+    async def run_events_ws(websocket: WebSocket, run_id: str, after: int = -1) -> None:
+        if run_id not in reg:
+            await websocket.close(code=4404)
+            return
+        await websocket.accept()
+        feed: EventFeed = app.state.feed
+        try:
+            async for batch in feed.follow(run_id, after=after):
+                for event in batch:
+                    await websocket.send_text(feed.encode(event))
+        except WebSocketDisconnect:
+            return
+        await websocket.close()
+
+    return app
+
+
+app = create_app()
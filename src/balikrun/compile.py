@@ -1,9 +1,12 @@
 # src/balikrun/compile.py
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Iterable
 
+from balikrun.interning import SpecInterner
 from balikrun.ir import Edge, GraphIR, Node, NodeKind
 from balikrun.specification import (
     Block,
@@ -149,7 +152,12 @@ def _compile_task_ref(
     else:
         node_id = ids.next()
 
-    nodes.append(Node(node_id=node_id, kind=NodeKind.TASK, task_id=t.task_id))
+    meta = {}
+    if t.resources is not None:
+        meta["resources"] = t.resources.model_dump()
+    if t.retry is not None:
+        meta["retry"] = t.retry.model_dump()
+    nodes.append(Node(node_id=node_id, kind=NodeKind.TASK, task_id=t.task_id, meta=meta))
     return _Handle(entry_id=node_id, exit_id=node_id)
 
 
@@ -178,3 +186,58 @@ def _compile_sequence(
     return _Handle(
         entry_id=child_handles[0].entry_id, 
         exit_id=child_handles[-1].exit_id)
+
+
+class CompileCache:
+    """
+    Bounded LRU cache of compiled GraphIR.
+
+    Keyed by the spec's content digest (see SpecInterner.digest) and CompileOptions, so
+    resubmitting an equal spec -- even as a freshly parsed object -- reuses the GraphIR.
+    GraphIR is frozen, so cached graphs are shared safely between callers.
+    """
+    def __init__(self, maxsize: int = 256):
+        if maxsize <= 0:
+            raise ValueError("CompileCache.maxsize must be positive.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._graphs: OrderedDict[tuple[str, CompileOptions], GraphIR] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._graphs)
+
+    def key(self, spec: Block, options: CompileOptions | None = None) -> tuple[str, CompileOptions]:
+        interner = SpecInterner()
+        return (interner.digest(interner.intern(spec)), options or CompileOptions())
+
+    def compile(self, spec: Block, *, options: CompileOptions | None = None) -> GraphIR:
+        """
+        Return the cached GraphIR for (spec, options), compiling on a miss.
+        """
+        return self.compile_keyed(spec, options=options)[1]
+
+    def compile_keyed(
+        self, spec: Block, *, options: CompileOptions | None = None
+    ) -> tuple[str, GraphIR]:
+        """
+        Like compile(), but also return the spec content digest used as cache key.
+        """
+        key = self.key(spec, options)
+        with self._lock:
+            g = self._graphs.get(key)
+            if g is not None:
+                self._graphs.move_to_end(key)
+                self.hits += 1
+                return key[0], g
+
+        g = compile_to_graph_ir(spec, options=key[1])
+
+        with self._lock:
+            self.misses += 1
+            self._graphs[key] = g
+            self._graphs.move_to_end(key)
+            while len(self._graphs) > self.maxsize:
+                self._graphs.popitem(last=False)
+        return key[0], g
@@ -0,0 +1,183 @@
+# src/balikrun/diff.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from balikrun.ir import Edge, GraphIR, Node
+
+EdgeKey = tuple[str, str, Optional[str]]
+
+
+@dataclass(frozen=True)
+class GraphDiff:
+    """
+    Structural difference between two GraphIR versions.
+
+    Nodes are aligned by node_id; edges by their GraphIR identity (src, dst, label),
+    the same triplet GraphIR enforces as unique.
+
+    added_* / removed_*:
+      Ids present only in the new / old graph.
+
+    changed_nodes:
+      node_ids present in both graphs whose content (kind, task_id, guard, meta) differs.
+
+    changed_edges:
+      Edge keys present in both graphs whose content (guard, meta) differs.
+
+    entry_changed / exit_changed:
+      True if the graph-level SESE interface moved.
+    """
+    added_nodes: frozenset[str]
+    removed_nodes: frozenset[str]
+    changed_nodes: frozenset[str]
+    added_edges: frozenset[EdgeKey]
+    removed_edges: frozenset[EdgeKey]
+    changed_edges: frozenset[EdgeKey]
+    entry_changed: bool = False
+    exit_changed: bool = False
+
+    @property
+    def is_empty(self) -> bool:
+        return not (
+            self.added_nodes
+            or self.removed_nodes
+            or self.changed_nodes
+            or self.added_edges
+            or self.removed_edges
+            or self.changed_edges
+            or self.entry_changed
+            or self.exit_changed
+        )
+
+    def touched_nodes(self) -> frozenset[str]:
+        """
+        node_ids whose own content or incident edges changed (in either graph).
+        """
+        touched = set(self.added_nodes) | self.changed_nodes
+        for src, dst, _ in self.added_edges | self.removed_edges | self.changed_edges:
+            touched.add(src)
+            touched.add(dst)
+        return frozenset(touched)
+
+
+@dataclass(frozen=True)
+class GraphFingerprint:
+    """
+    Per-version frozen content of a GraphIR.
+
+    nodes:
+      node_id -> frozen (kind, task_id, guard, meta).
+
+    edges:
+      (src, dst, label) -> frozen (guard, meta).
+
+    Values are compared for equality, never by hash, and scalars carry their type
+    so that 1, True and 1.0 differ. They exist to make repeated diffs cheap, not to
+    be persisted. A fingerprint is a snapshot: Node.meta and Edge.meta are mutable
+    dicts, so re-fingerprint a graph whose meta was edited in place.
+    """
+    nodes: dict[str, tuple]
+    edges: dict[EdgeKey, tuple]
+    entry_id: str
+    exit_id: str
+
+
+def edge_key(e: Edge) -> EdgeKey:
+    return (e.src, e.dst, e.label)
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Immutable, type-tagged copy of `value` whose equality is content equality.
+
+    Notes:
+    - Scalars become (type name, value) so 1 / True / 1.0 compare unequal; floats
+      use repr so NaN equals itself and -0.0 differs from 0.0.
+    - dict keys are sorted by repr (keys of mixed types do not order otherwise).
+    """
+    if isinstance(value, dict):
+        items = [(_freeze(k), _freeze(v)) for k, v in value.items()]
+        return ("dict", tuple(sorted(items, key=repr)))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_freeze(v) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return ("set", frozenset(_freeze(v) for v in value))
+    if isinstance(value, float):
+        return ("float", repr(value))
+    try:
+        hash(value)
+    except TypeError:
+        return (type(value).__name__, repr(value))
+    return (type(value).__name__, value)
+
+
+def _node_content(n: Node) -> tuple:
+    meta = n.meta
+    return (n.kind, n.task_id, n.guard, _freeze(meta) if meta else ())
+
+
+def _edge_content(e: Edge) -> tuple:
+    meta = e.meta
+    return (e.guard, _freeze(meta) if meta else ())
+
+
+def graph_fingerprint(g: GraphIR) -> GraphFingerprint:
+    """
+    Fingerprint the current content of `g` in O(N + E).
+
+    Not cached per instance: GraphIR is frozen but its nodes' and edges' meta dicts
+    are not, so a cached fingerprint could go stale. To diff one version against
+    several others, keep its fingerprint and call diff_fingerprints().
+    """
+    return GraphFingerprint(
+        nodes={n.node_id: _node_content(n) for n in g.nodes},
+        edges={(e.src, e.dst, e.label): _edge_content(e) for e in g.edges},
+        entry_id=g.entry_id,
+        exit_id=g.exit_id,
+    )
+
+
+_MISSING = object()
+_EMPTY: frozenset = frozenset()
+
+
+def _split(old: dict, new: dict) -> tuple[frozenset, frozenset, frozenset]:
+    # Dict equality and key-view difference run in C; the single Python-level pass
+    # compares frozen contents and keeps keys that vanished or changed.
+    if old == new:
+        return _EMPTY, _EMPTY, _EMPTY
+    gone_or_changed = [k for k, h in old.items() if new.get(k, _MISSING) != h]
+    changed = frozenset([k for k in gone_or_changed if k in new])
+    removed = frozenset(gone_or_changed) - changed
+    added = frozenset(new.keys() - old.keys())
+    return added, removed, changed
+
+
+def diff_fingerprints(old: GraphFingerprint, new: GraphFingerprint) -> GraphDiff:
+    """
+    Diff two fingerprints in O(N + E) content comparisons.
+    """
+    added_nodes, removed_nodes, changed_nodes = _split(old.nodes, new.nodes)
+    added_edges, removed_edges, changed_edges = _split(old.edges, new.edges)
+    return GraphDiff(
+        added_nodes=added_nodes,
+        removed_nodes=removed_nodes,
+        changed_nodes=changed_nodes,
+        added_edges=added_edges,
+        removed_edges=removed_edges,
+        changed_edges=changed_edges,
+        entry_changed=old.entry_id != new.entry_id,
+        exit_changed=old.exit_id != new.exit_id,
+    )
+
+
+def diff_graph_ir(old: GraphIR, new: GraphIR) -> GraphDiff:
+    """
+    Compute the structural diff from `old` to `new`.
+
+    Both graphs are fingerprinted (O(N + E)); the diff itself is set algebra over the
+    fingerprints.
+    """
+    return diff_fingerprints(graph_fingerprint(old), graph_fingerprint(new))
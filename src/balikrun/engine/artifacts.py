@@ -0,0 +1,370 @@
+# src/balikrun/engine/artifacts.py
+from __future__ import annotations
+
+import filecmp
+import mmap
+import os
+import pickle
+import shutil
+import sys
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Optional, Union
+from urllib.parse import quote, unquote
+
+if TYPE_CHECKING:
+    from balikrun.engine.scheduler import GraphIndex, NodeState
+
+# Local artifact store for passing bulk data between TASKs along graph edges.
+#
+# Layout: <root>/<run_id>/<node_id>/<name><suffix>, one file per output, each path
+# segment percent-encoded. The suffix records the format:
+#
+#   .npy   numpy arrays (numpy.lib.format); read back as read-only np.memmap
+#   .bin   bytes-like values and files; read back as a read-only memoryview over mmap
+#   .pkl   anything else, pickled (not zero-copy; meant for small values)
+#
+# Outputs are written to a temporary file and hard-linked into place, so readers never
+# see partial files and a second write of the same key fails, also across processes --
+# unless it writes identical content (e.g., a speculative duplicate of a deterministic
+# task), which returns the existing file.
+# Readers map the file instead of copying it: a consumer of a 1 GB array pays for the
+# pages it touches. Deleting a file that is still mapped is safe on POSIX (the mapping
+# keeps the inode alive).
+#
+# Only the standard library is imported here, so task workers can open the store
+# without pulling in pydantic; numpy is an optional dependency, imported when an array
+# is read (writing an array means numpy is already loaded).
+
+_SUFFIXES = (".npy", ".bin", ".pkl")
+
+
+def _segment(value: str) -> str:
+    if not value:
+        raise ValueError("Artifact key parts must be non-empty.")
+    seg = quote(value, safe="")
+    # "." / ".." would escape the directory; a leading dot is reserved for temp files.
+    return "%2E" + seg[1:] if seg.startswith(".") else seg
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - numpy is optional
+        raise RuntimeError("Reading array artifacts requires numpy (pip install balikrun[numpy]).") from None
+    return numpy
+
+
+def _map(path: Path) -> memoryview:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b"")
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+class ArtifactStore:
+    """
+    Write-once outputs keyed by (run_id, node_id, name) under a local directory.
+
+    Notes:
+    - put() picks the format from the value (see the module comment); put_file()
+      copies or moves an existing file in. get() returns memory-mapped, read-only
+      views for arrays and bytes.
+    - The coordinator and its local workers open the same root; a task reads its
+      predecessors' outputs with `store.get(ctx.run_id, node_id, name)` for
+      node_id in `ctx.inputs`.
+    - ArtifactRefs deletes a node's outputs once no remaining node can consume them.
+    """
+
+    def __init__(self, root: Union[str, os.PathLike[str]]):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def put(self, run_id: str, node_id: str, name: str, value: Any) -> Path:
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return self._write(run_id, node_id, name, ".bin", lambda f: f.write(value))
+        np = sys.modules.get("numpy")
+        if np is not None and isinstance(value, np.ndarray):
+            return self._write(
+                run_id,
+                node_id,
+                name,
+                ".npy",
+                lambda f: np.lib.format.write_array(f, value, allow_pickle=False),
+            )
+        return self._write(
+            run_id, node_id, name, ".pkl", lambda f: pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        )
+
+    def put_file(
+        self,
+        run_id: str,
+        node_id: str,
+        name: str,
+        src: Union[str, os.PathLike[str]],
+        *,
+        move: bool = False,
+    ) -> Path:
+        """
+        Store an existing file as a bytes artifact; `move=True` renames it in (no copy
+        on the same filesystem) instead of copying.
+        """
+        def write(f: BinaryIO) -> None:
+            with open(src, "rb") as s:
+                shutil.copyfileobj(s, f, 1 << 20)
+
+        if move:
+            directory = self._dir(run_id, node_id)
+            directory.mkdir(parents=True, exist_ok=True)
+            tmp = directory / f".{uuid.uuid4().hex}.tmp"
+            shutil.move(os.fspath(src), tmp)
+            return self._publish(run_id, node_id, name, ".bin", tmp)
+        return self._write(run_id, node_id, name, ".bin", write)
+
+    def get(self, run_id: str, node_id: str, name: str) -> Any:
+        """
+        Read an output: np.memmap (mode "r") for arrays, memoryview for bytes,
+        the unpickled value otherwise. Raises KeyError if it does not exist.
+        """
+        path = self.path(run_id, node_id, name)
+        if path.suffix == ".npy":
+            return _numpy().load(path, mmap_mode="r", allow_pickle=False)
+        if path.suffix == ".bin":
+            return _map(path)
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def path(self, run_id: str, node_id: str, name: str) -> Path:
+        """
+        File backing an output (e.g., to hand to a tool that takes a path).
+        """
+        base = os.path.join(self._dir(run_id, node_id), _segment(name))
+        for suffix in _SUFFIXES:
+            if os.path.exists(base + suffix):
+                return Path(base + suffix)
+        raise KeyError((run_id, node_id, name))
+
+    def exists(self, run_id: str, node_id: str, name: str) -> bool:
+        try:
+            self.path(run_id, node_id, name)
+        except KeyError:
+            return False
+        return True
+
+    def names(self, run_id: str, node_id: str) -> list[str]:
+        try:
+            files = os.listdir(self._dir(run_id, node_id))
+        except FileNotFoundError:
+            return []
+        return sorted(unquote(os.path.splitext(f)[0]) for f in files if not f.startswith("."))
+
+    def delete(self, run_id: str, node_id: str) -> int:
+        """
+        Remove every output of a node; returns how many were removed.
+        """
+        directory = self._dir(run_id, node_id)
+        try:
+            count = sum(1 for f in os.listdir(directory) if not f.startswith("."))
+        except FileNotFoundError:
+            return 0
+        shutil.rmtree(directory, ignore_errors=True)
+        return count
+
+    def drop_run(self, run_id: str) -> None:
+        shutil.rmtree(self.root / _segment(run_id), ignore_errors=True)
+
+    def nbytes(self, run_id: Optional[str] = None) -> int:
+        """
+        Bytes stored for one run (default: all runs).
+        """
+        top = self.root if run_id is None else self.root / _segment(run_id)
+        return sum(
+            os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(top) for f in files
+        )
+
+    def _dir(self, run_id: str, node_id: str) -> Path:
+        return self.root / _segment(run_id) / _segment(node_id)
+
+    def _write(self, run_id: str, node_id: str, name: str, suffix: str, writer: Callable[[BinaryIO], Any]) -> Path:
+        directory = self._dir(run_id, node_id)
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = directory / f".{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                writer(f)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return self._publish(run_id, node_id, name, suffix, tmp)
+
+    def _publish(self, run_id: str, node_id: str, name: str, suffix: str, tmp: Path) -> Path:
+        try:
+            if self.exists(run_id, node_id, name):
+                raise FileExistsError
+            final = tmp.with_name(_segment(name) + suffix)
+            os.link(tmp, final)  # fails if the key exists: write-once across processes
+        except FileExistsError:
+            existing = self.path(run_id, node_id, name)
+            if existing.suffix == suffix and filecmp.cmp(tmp, existing, shallow=False):
+                return existing
+            raise ValueError(f"Artifact {(run_id, node_id, name)} is already written.") from None
+        finally:
+            tmp.unlink(missing_ok=True)
+        return final
+
+
+class ArtifactRefs:
+    """
+    Reference counts tying a run's artifacts to graph reachability.
+
+    Install as a state listener (`Frontier(on_state=refs.on_state)`; Coordinator does
+    this when given an ArtifactStore). Data flows along edges: the consumers of a
+    TASK's outputs are the TASKs (or EXIT) reached through control nodes only.
+
+    Notes:
+    - When a TASK completes, it holds one reference per consumer. A consumer releases
+      it when it reaches COMPLETED, SKIPPED or CANCELLED (an unchosen branch needs no
+      data), and the outputs are deleted when the last reference goes.
+    - Loops: a consumer inside a loop the producer is not in may run again, so its
+      reference is held until that loop exits (an exit target of the loop leaves
+      PENDING). A consumer reached over a back-edge (the next iteration reads the
+      previous one's output) also releases when that loop exits.
+    - Outputs consumed by EXIT are the run's results and are never collected.
+    - A node leased again (retry or next loop iteration) loses its previous outputs
+      first, so the new attempt can write the same keys.
+    """
+
+    def __init__(self, gi: GraphIndex, store: ArtifactStore, run_id: str):
+        from balikrun.engine.scheduler import NodeState
+        from balikrun.ir import NodeKind
+
+        self.gi = gi
+        self.store = store
+        self.run_id = run_id
+        self.collected = 0
+        self._pending_state = NodeState.PENDING
+        self._leased_state = NodeState.LEASED
+        self._completed_state = NodeState.COMPLETED
+        self._release_states = frozenset({NodeState.COMPLETED, NodeState.SKIPPED, NodeState.CANCELLED})
+        self._is_task = [n.kind == NodeKind.TASK for n in gi.graph.nodes]
+        self._leased: set[int] = set()
+        # producer -> (generation, outstanding consumer items); generation guards
+        # against watch entries left over from an earlier completion.
+        self._live: dict[int, tuple[int, set[int]]] = {}
+        self._generation = 0
+        self._watch: dict[tuple[str, int], list[tuple[int, int, int]]] = {}
+        self._build()
+
+    def inputs(self, node_id: str) -> tuple[str, ...]:
+        """
+        TASK node_ids whose outputs flow into `node_id`.
+        """
+        ids = self.gi.node_ids
+        return tuple(ids[p] for p in self._producers.get(self.gi.index[node_id], ()))
+
+    @property
+    def live(self) -> list[str]:
+        """
+        node_ids whose outputs are currently retained (pinned results included).
+        """
+        return sorted(self.gi.node_ids[p] for p in self._live)
+
+    def on_state(self, node_id: str, state: NodeState) -> None:
+        i = self.gi.index[node_id]
+        if state == self._leased_state:
+            if i in self._leased:
+                self._collect(i)  # superseded by a new attempt / iteration
+            else:
+                self._leased.add(i)
+        elif state == self._completed_state and self._is_task[i]:
+            self._register(i)
+        if state in self._release_states:
+            self._fire(("node", i))
+        if state != self._pending_state:
+            for head in self._exit_of.get(i, ()):
+                self._fire(("loop", head))
+
+    def finish(self) -> int:
+        """
+        Collect every unpinned output (the run is over); returns the number of nodes.
+        """
+        count = 0
+        for p in [p for p in self._live if p not in self._pinned]:
+            self._collect(p)
+            count += 1
+        return count
+
+    def _build(self) -> None:
+        gi = self.gi
+        succ = gi.succ
+        is_task = self._is_task
+        exit_i = gi.index[gi.graph.exit_id]
+        back = gi.back_edges()
+
+        bodies: dict[int, set[int]] = {}
+        for src, head in back:
+            bodies.setdefault(head, set()).update(gi.loop_body(src, head))
+        loops_of: dict[int, list[int]] = {}
+        self._exit_of: dict[int, list[int]] = {}
+        for head, body in bodies.items():
+            for b in body:
+                loops_of.setdefault(b, []).append(head)
+            for j in {j for b in body for j in succ[b] if j not in body}:
+                self._exit_of.setdefault(j, []).append(head)
+
+        # consumer items per producer: tokens, any one of which releases the item
+        self._items: dict[int, list[tuple[tuple[str, int], ...]]] = {}
+        self._producers: dict[int, list[int]] = {}
+        self._pinned: set[int] = set()
+        for p in range(len(gi)):
+            if not is_task[p]:
+                continue
+            own = set(loops_of.get(p, ()))
+            items = []
+            seen: set[tuple[int, int]] = set()
+            stack = [(j, j if (p, j) in back else -1) for j in succ[p]]
+            while stack:
+                j, crossed = stack.pop()
+                if (j, crossed) in seen:
+                    continue
+                seen.add((j, crossed))
+                if j == exit_i:
+                    self._pinned.add(p)
+                    continue
+                if not is_task[j]:
+                    for k in succ[j]:
+                        stack.append((k, k if (j, k) in back else crossed))
+                    continue
+                self._producers.setdefault(j, []).append(p)
+                outer = [h for h in loops_of.get(j, ()) if h not in own]
+                tokens = [("loop", max(outer, key=lambda h: len(bodies[h])))] if outer else [("node", j)]
+                if crossed >= 0:
+                    tokens.append(("loop", crossed))
+                items.append(tuple(tokens))
+            self._items[p] = items
+
+    def _register(self, p: int) -> None:
+        self._generation += 1
+        gen = self._generation
+        items = self._items.get(p, [])
+        self._live[p] = (gen, set(range(len(items))))
+        for k, tokens in enumerate(items):
+            for token in tokens:
+                self._watch.setdefault(token, []).append((p, gen, k))
+        if not items and p not in self._pinned:
+            self._collect(p)
+
+    def _fire(self, token: tuple[str, int]) -> None:
+        for p, gen, k in self._watch.pop(token, ()):
+            live = self._live.get(p)
+            if live is None or live[0] != gen:
+                continue
+            outstanding = live[1]
+            outstanding.discard(k)
+            if not outstanding and p not in self._pinned:
+                self._collect(p)
+
+    def _collect(self, p: int) -> None:
+        self._live.pop(p, None)
+        if self.store.delete(self.run_id, self.gi.node_ids[p]):
+            self.collected += 1
@@ -0,0 +1,707 @@
+# src/balikrun/engine/distributed.py
+from __future__ import annotations
+
+import heapq
+import math
+import multiprocessing
+import queue
+import random
+import secrets
+import threading
+import time
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection, Listener, wait
+from typing import Any, Mapping, Optional, cast
+
+from balikrun.engine.artifacts import ArtifactRefs, ArtifactStore
+from balikrun.engine.events import EventLog, EventType
+from balikrun.engine.guards import GuardEvaluator
+from balikrun.engine.leases import Lease, LeaseError, LeaseManager
+from balikrun.engine.partition import node_partition
+from balikrun.engine.resources import ResourcePacker, ResourceVector, fits, node_resources
+from balikrun.engine.retries import RetryPolicy, RuntimeStats, SpeculationPolicy, node_retry_policy
+from balikrun.engine.scheduler import Decide, Frontier, GraphIndex, NodeState
+from balikrun.engine.tracing import NULL_TRACER, Phase, Tracer
+from balikrun.engine.worker import (  # noqa: F401  (worker types re-exported for callers)
+    LeaseGrant,
+    TaskContext,
+    TaskFn,
+    TaskResult,
+    run_worker,
+)
+from balikrun.ir import GraphIR
+
+# The wire protocol and the worker loop live in balikrun.engine.worker, which imports
+# only the standard library so worker processes start fast.
+
+
+class LocalBroker:
+    """
+    Bundled localhost broker: a socket endpoint that workers connect to.
+
+    Connections are accepted (and authenticated with `authkey`) on a background thread;
+    the coordinator collects them with `take_connections()`. `spawn_workers()` starts
+    local worker processes, which is how the distributed path is exercised on one box.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, authkey: Optional[bytes] = None):
+        self.authkey = authkey or secrets.token_bytes(16)
+        self._listener = Listener((host, port), authkey=self.authkey)
+        self.address = self._listener.address
+        self._accepted: queue.SimpleQueue[Connection] = queue.SimpleQueue()
+        self._closed = False
+        self._processes: list[multiprocessing.Process] = []
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread.start()
+
+    def _accept_loop(self) -> None:
+        while not self._closed:
+            try:
+                self._accepted.put(self._listener.accept())
+            except (OSError, EOFError):
+                if self._closed:
+                    return
+            except multiprocessing.AuthenticationError:
+                continue
+
+    def take_connections(self) -> list[Connection]:
+        out: list[Connection] = []
+        while True:
+            try:
+                out.append(self._accepted.get_nowait())
+            except queue.Empty:
+                return out
+
+    def spawn_workers(
+        self,
+        n: int,
+        tasks: Mapping[str, TaskFn],
+        *,
+        capacity: int = 4,
+        prefix: str = "w",
+        resources: Optional[Mapping[str, float]] = None,
+    ) -> list[multiprocessing.Process]:
+        procs = []
+        for i in range(n):
+            p = multiprocessing.Process(
+                target=run_worker,
+                args=(self.address, self.authkey, f"{prefix}{len(self._processes) + i}", tasks),
+                kwargs={"capacity": capacity, "resources": resources},
+                daemon=True,
+            )
+            p.start()
+            procs.append(p)
+        self._processes.extend(procs)
+        return procs
+
+    def close(self, *, join_timeout: float = 5.0) -> None:
+        self._closed = True
+        self._listener.close()
+        for p in self._processes:
+            p.join(join_timeout)
+            if p.is_alive():
+                p.terminate()
+
+    def __enter__(self) -> "LocalBroker":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+@dataclass
+class RunResult:
+    """
+    Outcome of Coordinator.run().
+
+    states:
+      Final NodeState per node_id (nodes never reached are absent).
+
+    outputs:
+      Return value of each completed TASK node.
+
+    tasks_per_worker / steals:
+      Load-balance diagnostics.
+
+    retries / speculated:
+      Failed executions that were retried, and speculative duplicates launched.
+    """
+    run_id: str
+    ok: bool
+    states: dict[str, NodeState]
+    outputs: dict[str, Any]
+    errors: dict[str, str]
+    elapsed: float
+    tasks_per_worker: dict[str, int] = field(default_factory=dict)
+    steals: int = 0
+    retries: int = 0
+    speculated: int = 0
+
+
+def _wait(slots: Mapping[Connection, Any], timeout: float) -> list[Connection]:
+    # wait() returns a subset of the objects passed in; here those are Connections.
+    return cast("list[Connection]", wait(list(slots), timeout=timeout))
+
+
+@dataclass
+class _WorkerSlot:
+    conn: Connection
+    worker_id: str = ""
+    capacity: int = 0
+    queued: list[str] = field(default_factory=list)
+    # Lease executing on the worker (from its heartbeats) and when it started.
+    running: Optional[str] = None
+    running_since: float = 0.0
+    revoke: list[str] = field(default_factory=list)
+    parked_credit: Optional[int] = None
+
+
+class Coordinator:
+    """
+    Holds a run's GraphIR frontier and leases TASK nodes to remote workers.
+
+    Notes:
+    - Batching: each pull is answered with up to min(credit, max_batch) leases, and
+      results come back piggybacked on the next pull.
+    - Backpressure: grants never exceed the worker's advertised credit, so a worker's
+      backlog is bounded by its capacity.
+    - Work stealing: when an idle worker finds the frontier empty, half of the unstarted
+      backlog of the most loaded worker is revoked; once the victim acknowledges, the
+      nodes return to the frontier and the idle worker receives them.
+    - Leases (LeaseManager) make results idempotent: a result for a revoked, expired or
+      reassigned lease is ignored rather than committed twice. Pulls renew a worker's
+      leases, and so do the heartbeats it sends every ttl/3 between pulls, so only a
+      worker that stops responding loses them.
+    - With a `tracer`, every TASK node records QUEUE_WAIT, COMPUTE, REPORT and COMMIT
+      spans keyed by node_id/task_id (COMPUTE on the worker's lane), plus a SCHEDULE
+      span per granted batch.
+    - Workers that advertise resources get leases bin-packed by a ResourcePacker:
+      a lease holds its TASK's `meta["resources"]` on that worker until it is
+      committed, released or expired. Other workers are leased FIFO, or, if the
+      graph's TASKs carry `meta["partition"]` (see assign_partitions), by partition
+      affinity: each worker is offered its own partitions' ready nodes first
+      (LeaseManager.prefer). Packing and affinity look `affinity_window` nodes into
+      the queue. A TASK that fits no live worker's total capacity for
+      `placement_timeout` seconds (while every worker advertises resources) fails.
+    - With `guards`, DECISION nodes are decided by that GuardEvaluator and every
+      committed TASK output is published to its scope under the node's task_id, so
+      guard expressions can test results (e.g. `tune["loss"] < 0.1`).
+    - With `artifacts`, grants carry the run_id and each node's producer node_ids
+      (TaskContext.inputs), and an ArtifactRefs deletes outputs as soon as no
+      remaining node consumes them; the rest (except EXIT's inputs) go when the run
+      succeeds.
+    - Retries: a failed TASK with attempts left under its RetryPolicy (`meta["retry"]`,
+      else `retry`) is logged FAILED, parked PENDING for its backoff, then requeued.
+    - Speculation: with a SpeculationPolicy, a worker that would otherwise idle (and
+      has nothing to steal) gets a duplicate lease of a straggler: a lease its worker
+      reports (by heartbeat) executing for longer than its task_id's runtime
+      percentile. Queued leases and finished ones awaiting the next pull are never
+      duplicated. Runtimes are measured on the worker (finished_at - started_at).
+      The first result commits; the other copies' leases are released and revoked,
+      so a late result cannot commit twice. Launches and cancellations are logged as
+      ATTEMPT events.
+    """
+
+    def __init__(
+        self,
+        graph: GraphIR,
+        *,
+        run_id: str = "run",
+        log: Optional[EventLog] = None,
+        leases: Optional[LeaseManager] = None,
+        decide: Optional[Decide] = None,
+        guards: Optional[GuardEvaluator] = None,
+        artifacts: Optional[ArtifactStore] = None,
+        retry: Optional[RetryPolicy] = None,
+        speculation: Optional[SpeculationPolicy] = None,
+        max_batch: int = 16,
+        affinity_window: int = 1024,
+        placement_timeout: float = 30.0,
+        tracer: Tracer = NULL_TRACER,
+    ):
+        self.graph = graph
+        self.run_id = run_id
+        self.log = log
+        self.leases = leases if leases is not None else LeaseManager(ttl=300.0)
+        self.max_batch = max_batch
+        self.gi = GraphIndex.from_graph(graph)
+        self.guards = guards
+        self.artifacts = ArtifactRefs(self.gi, artifacts, run_id) if artifacts is not None else None
+        if decide is None and guards is not None:
+            decide = guards.decide
+        self.frontier = Frontier(self.gi, decide=decide, on_state=self._on_state)
+        self.outputs: dict[str, Any] = {}
+        self.errors: dict[str, str] = {}
+        self.steals = 0
+        self.tasks_per_worker: dict[str, int] = {}
+        self.tracer = tracer
+        self._granted_ns: dict[str, int] = {}
+        self.packer = ResourcePacker()
+        self.affinity_window = affinity_window
+        self.placement_timeout = placement_timeout
+        self._unplaceable_since: dict[str, float] = {}
+        self._partition: dict[str, int] = {
+            n.node_id: p for n in graph.nodes if (p := node_partition(n)) is not None
+        }
+        self._demand: dict[str, ResourceVector] = {}
+        self._held: dict[str, tuple[str, ResourceVector]] = {}
+        self._slots: dict[Connection, _WorkerSlot] = {}
+        self._event_data: dict[str, dict[str, Any]] = {}
+        self._event_attempt: dict[str, int] = {}
+        self.retry = retry
+        self.speculation = speculation
+        self.runtimes = RuntimeStats()
+        self.retries = 0
+        self.speculated = 0
+        self._failures: dict[str, int] = {}
+        self._backoff: list[tuple[float, str]] = []  # (due, node_id) heap
+        self._speculative: set[str] = set()  # lease_ids of duplicates
+        self._rng = random.Random()
+
+    def _on_state(self, node_id: str, state: NodeState) -> None:
+        if self.artifacts is not None:
+            self.artifacts.on_state(node_id, state)
+        if self.log is None:
+            return
+        node = self.gi.node(node_id)
+        self.log.append(
+            self.run_id,
+            EventType.NODE_STATE,
+            node_id=node_id,
+            task_id=node.task_id,
+            state=state,
+            attempt=self._event_attempt.pop(node_id, 0) or self.leases.attempts(node_id),
+            data=self._event_data.pop(node_id, None),
+        )
+
+    def _log_attempt(self, lease: Lease, action: str, data: dict[str, Any]) -> None:
+        if self.log is None:
+            return
+        self.log.append(
+            self.run_id,
+            EventType.ATTEMPT,
+            node_id=lease.node_id,
+            task_id=lease.task_id,
+            attempt=lease.attempt,
+            data={"action": action, "lease_id": lease.lease_id, "worker_id": lease.worker_id, **data},
+        )
+
+    def run(self, broker: LocalBroker, *, timeout: Optional[float] = None, tick: float = 0.05) -> RunResult:
+        """
+        Execute the graph with whatever workers connect to `broker`; blocks until the
+        run reaches EXIT, fails, stalls, or `timeout` elapses.
+        """
+        t0 = time.perf_counter()
+        self.frontier.start()
+        while not self._finished():
+            if timeout is not None and time.perf_counter() - t0 > timeout:
+                break
+            for conn in broker.take_connections():
+                self._slots[conn] = _WorkerSlot(conn=conn)
+            for conn in _wait(self._slots, tick):
+                self._handle(self._slots[conn])
+            for lease in self.leases.expire():
+                self._lost(lease)
+            self._requeue_due()
+            self._serve_parked()
+
+        self._shutdown(broker)
+        if self.artifacts is not None and self.frontier.done:
+            self.artifacts.finish()
+        if self.log is not None:
+            self.log.append(self.run_id, EventType.RUN_FINISHED, data={"ok": self.frontier.done})
+        return RunResult(
+            run_id=self.run_id,
+            ok=self.frontier.done,
+            states=dict(self.frontier.states),
+            outputs=self.outputs,
+            errors=self.errors,
+            elapsed=time.perf_counter() - t0,
+            tasks_per_worker=dict(self.tasks_per_worker),
+            steals=self.steals,
+            retries=self.retries,
+            speculated=self.speculated,
+        )
+
+    def _finished(self) -> bool:
+        f = self.frontier
+        if f.done:
+            return True
+        if f.failed and not f.in_flight:
+            return True
+        return f.stalled
+
+    def _handle(self, slot: _WorkerSlot) -> None:
+        try:
+            msg = slot.conn.recv()
+        except (EOFError, ConnectionError, OSError):
+            self._drop(slot)
+            return
+        if msg[0] == "hello":
+            _, slot.worker_id, slot.capacity, *rest = msg
+            if rest and rest[0]:
+                self.packer.add_worker(slot.worker_id, rest[0])
+            return
+        if msg[0] == "heartbeat":
+            _, _, slot.running, running_for = msg
+            slot.running_since = self.leases.now() - running_for
+            self.leases.renew_worker(slot.worker_id)
+            return
+        _, _, credit, results, queued, revoked = msg
+        received_ns = self.tracer.clock() if self.tracer.enabled else 0
+        self.leases.renew_worker(slot.worker_id)
+        for lease_id in revoked:
+            try:
+                lease = self.leases.release(lease_id)
+            except LeaseError:
+                continue
+            self._lost(lease)
+        for result in results:
+            self._commit(slot, result, received_ns)
+        slot.queued = [lease_id for lease_id in queued if lease_id in self.leases]
+        slot.running = None
+
+        if self._finished():
+            self._park(slot, credit)
+            return
+        grants = self._grant(slot, min(credit, self.max_batch))
+        if not grants and not queued:
+            # Unstarted backlog elsewhere is stolen rather than duplicated.
+            if not self._steal_for(slot):
+                grants = self._speculate(slot, min(credit, self.max_batch))
+            if not grants:
+                self._park(slot, credit)
+                return
+        self._reply(slot, grants)
+
+    def _commit(self, slot: _WorkerSlot, result: TaskResult, received_ns: int = 0) -> None:
+        tr = self.tracer
+        t_commit = tr.clock() if tr.enabled else 0
+        granted_ns = self._granted_ns.pop(result.lease_id, None)
+        self._release_resources(result.lease_id)
+        try:
+            lease = self.leases.commit(result.lease_id)
+        except LeaseError:
+            # Stale: re-leased elsewhere or lost a speculative race; never double-commit.
+            return
+        node_id = lease.node_id
+        speculative = lease.lease_id in self._speculative
+        self._speculative.discard(lease.lease_id)
+        data = {
+            "worker_id": slot.worker_id,
+            "lease_id": lease.lease_id,
+            "started_at": result.started_at,
+            "finished_at": result.finished_at,
+        }
+        if speculative:
+            data["speculative"] = True
+        self.tasks_per_worker[slot.worker_id] = self.tasks_per_worker.get(slot.worker_id, 0) + 1
+        siblings = self.leases.for_node(node_id)
+        if not result.ok and siblings:
+            # Another copy is still out; it decides the node.
+            self._log_attempt(lease, "failed", {"error": result.error})
+        elif result.ok:
+            if self.speculation is not None:
+                self.runtimes.record(lease.task_id, result.finished_at - result.started_at)
+            for other in siblings:
+                self._cancel(other, winner=lease)
+            self.outputs[node_id] = result.value
+            if self.guards is not None:
+                self.guards.scope.set(lease.task_id, result.value)
+            self._event_data[node_id] = data
+            self._event_attempt[node_id] = lease.attempt
+            self.frontier.complete(node_id)
+        else:
+            failures = self._failures[node_id] = self._failures.get(node_id, 0) + 1
+            policy = node_retry_policy(self.gi.node(node_id), self.retry)
+            self._event_attempt[node_id] = lease.attempt
+            if policy is not None and failures < policy.max_attempts:
+                delay = policy.delay(failures, self._rng)
+                heapq.heappush(self._backoff, (self.leases.now() + delay, node_id))
+                self.retries += 1
+                self._event_data[node_id] = data | {
+                    "error": result.error,
+                    "failures": failures,
+                    "retry_in": delay,
+                }
+                self.frontier.defer(node_id)
+            else:
+                self.errors[node_id] = result.error or ""
+                self._event_data[node_id] = data | {"error": result.error, "failures": failures}
+                self.frontier.fail(node_id)
+        if tr.enabled:
+            node_id, task_id = lease.node_id, lease.task_id
+            started = int(result.started_at * 1e9)
+            finished = int(result.finished_at * 1e9)
+            if granted_ns is not None:
+                tr.record(Phase.QUEUE_WAIT, granted_ns, started, node_id, task_id, slot.worker_id)
+            tr.record(Phase.COMPUTE, started, finished, node_id, task_id, slot.worker_id)
+            if received_ns:
+                tr.record(Phase.REPORT, finished, received_ns, node_id, task_id, slot.worker_id)
+            tr.record(Phase.COMMIT, t_commit, tr.clock(), node_id, task_id, "coordinator")
+
+    def _grant(self, slot: _WorkerSlot, n: int) -> list[LeaseGrant]:
+        if n <= 0 or self.frontier.failed:
+            return []
+        # Spread the frontier over the workers that are waiting for it.
+        waiting = 1 + sum(1 for s in self._slots.values() if s.parked_credit is not None)
+        n = min(n, max(1, math.ceil(self.frontier.ready_count / waiting)))
+        tr = self.tracer
+        t0 = tr.clock() if tr.enabled else 0
+        packed = slot.worker_id in self.packer
+        if packed:
+            node_ids = self._pack(slot.worker_id, n)
+        elif self._partition:
+            node_ids = self._affine(slot.worker_id, n)
+        else:
+            node_ids = self.frontier.take(n)
+        grants = []
+        for node_id in node_ids:
+            lease = self.leases.grant(
+                node_id,
+                self.gi.node(node_id).task_id or "",
+                slot.worker_id,
+                partition=self._partition.get(node_id),
+            )
+            if packed:
+                self._held[lease.lease_id] = (slot.worker_id, self._demand[node_id])
+            grants.append(self._to_grant(lease))
+        if tr.enabled and grants:
+            t1 = tr.clock()
+            tr.record(Phase.SCHEDULE, t0, t1, None, None, "coordinator")
+            for g in grants:
+                self._granted_ns[g.lease_id] = t1
+        return grants
+
+    def _to_grant(self, lease: Lease) -> LeaseGrant:
+        return LeaseGrant(
+            lease_id=lease.lease_id,
+            node_id=lease.node_id,
+            task_id=lease.task_id,
+            attempt=lease.attempt,
+            run_id=self.run_id,
+            inputs=self.artifacts.inputs(lease.node_id) if self.artifacts is not None else (),
+        )
+
+    def _pack(self, worker_id: str, n: int) -> list[str]:
+        """
+        Take up to `n` ready nodes that fit `worker_id`'s free resources (allocated).
+        """
+        demand = self._demand
+        tasks = []
+        for node_id in self.frontier.peek(self.affinity_window):
+            if node_id not in demand:
+                demand[node_id] = node_resources(self.gi.node(node_id))
+            tasks.append((node_id, demand[node_id]))
+        placement = self.packer.place(tasks, workers=[worker_id], limits={worker_id: n})
+        taken = self.frontier.take_ids(placement.assignments.get(worker_id, ()))
+        if self._unplaceable_since or placement.unplaceable:
+            for node_id in taken:
+                self._unplaceable_since.pop(node_id, None)
+            self._fail_unplaceable(placement.unplaceable)
+        return taken
+
+    def _fail_unplaceable(self, node_ids: list[str]) -> None:
+        """
+        Fail nodes that have exceeded every live worker's total capacity for
+        `placement_timeout` seconds (the grace lets a bigger worker finish joining).
+        A worker that advertises no resources takes any node FIFO, so while one is
+        connected nothing counts as unplaceable.
+        """
+        since = self._unplaceable_since
+        if any(s.worker_id and s.worker_id not in self.packer for s in self._slots.values()):
+            since.clear()
+            return
+        now = self.leases.now()
+        for node_id in node_ids:
+            if now - since.setdefault(node_id, now) < self.placement_timeout:
+                continue
+            del since[node_id]
+            error = (
+                f"resources {self.gi.node(node_id).meta.get('resources')} exceed the "
+                f"capacity of every worker"
+            )
+            self.frontier.take_ids([node_id])
+            self.errors[node_id] = error
+            self._event_data[node_id] = {"error": error}
+            self.frontier.fail(node_id)
+
+    def _affine(self, worker_id: str, n: int) -> list[str]:
+        """
+        Take up to `n` ready nodes, `worker_id`'s partitions first.
+        """
+        ready = self.frontier.peek(self.affinity_window)
+        chosen = self.leases.prefer(worker_id, ((node_id, self._partition.get(node_id)) for node_id in ready), n)
+        return self.frontier.take_ids(chosen)
+
+    def _lost(self, lease: Lease) -> None:
+        """
+        A lease ended without a result (revoked, expired, worker dropped): requeue its
+        node unless another copy of it is still out.
+        """
+        self._granted_ns.pop(lease.lease_id, None)
+        self._release_resources(lease.lease_id)
+        self._speculative.discard(lease.lease_id)
+        if not self.leases.for_node(lease.node_id):
+            self.frontier.requeue([lease.node_id])
+
+    def _cancel(self, lease: Lease, *, winner: Lease) -> None:
+        """
+        Drop a copy that lost the race: release its lease and revoke it on its worker
+        (dropped if not started; a late result fails to commit).
+        """
+        self.leases.release(lease.lease_id)
+        self._granted_ns.pop(lease.lease_id, None)
+        self._release_resources(lease.lease_id)
+        self._speculative.discard(lease.lease_id)
+        for slot in self._slots.values():
+            if slot.worker_id == lease.worker_id:
+                slot.revoke.append(lease.lease_id)
+                break
+        self._log_attempt(lease, "cancelled", {"winner": winner.lease_id})
+
+    def _requeue_due(self) -> None:
+        now = self.leases.now()
+        due = []
+        while self._backoff and self._backoff[0][0] <= now:
+            due.append(heapq.heappop(self._backoff)[1])
+        if due:
+            self.frontier.requeue(due)
+
+    def _speculate(self, slot: _WorkerSlot, n: int) -> list[LeaseGrant]:
+        """
+        Duplicate up to `n` stragglers onto `slot`, most overdue first; only when the
+        frontier has nothing else for it.
+        """
+        policy = self.speculation
+        if policy is None or n <= 0 or self.frontier.ready_count or self.frontier.failed:
+            return []
+        now = self.leases.now()
+        overdue = []
+        for other in self._slots.values():
+            lease_id = other.running
+            if other is slot or lease_id is None or lease_id not in self.leases:
+                continue
+            if lease_id in self._speculative:
+                continue
+            lease = self.leases.get(lease_id)
+            threshold = self.runtimes.threshold(lease.task_id, policy)
+            elapsed = now - other.running_since
+            if threshold is None or elapsed <= threshold:
+                continue
+            copies = self.leases.for_node(lease.node_id)
+            if len(copies) > policy.max_copies or any(c.worker_id == slot.worker_id for c in copies):
+                continue
+            overdue.append((elapsed / max(threshold, 1e-9), lease, threshold, elapsed))
+        overdue.sort(key=lambda t: -t[0])
+
+        packed = slot.worker_id in self.packer
+        grants: list[LeaseGrant] = []
+        for ratio, original, threshold, elapsed in overdue:
+            if len(grants) == n:
+                break
+            node_id = original.node_id
+            if packed:
+                if node_id not in self._demand:
+                    self._demand[node_id] = node_resources(self.gi.node(node_id))
+                if not fits(self._demand[node_id], self.packer.free(slot.worker_id)):
+                    continue
+                self.packer.allocate(slot.worker_id, self._demand[node_id])
+            lease = self.leases.grant(node_id, original.task_id, slot.worker_id)
+            if packed:
+                self._held[lease.lease_id] = (slot.worker_id, self._demand[node_id])
+            self._speculative.add(lease.lease_id)
+            self.speculated += 1
+            self._log_attempt(
+                lease,
+                "speculate",
+                {"straggler": original.lease_id, "elapsed": elapsed, "threshold": threshold},
+            )
+            grants.append(self._to_grant(lease))
+        return grants
+
+    def _release_resources(self, lease_id: str) -> None:
+        held = self._held.pop(lease_id, None)
+        if held is not None:
+            self.packer.release(*held)
+
+    def _reply(self, slot: _WorkerSlot, grants: list[LeaseGrant]) -> None:
+        revoke, slot.revoke = slot.revoke, []
+        try:
+            slot.conn.send(("work", grants, revoke, self.leases.ttl / 3))
+        except (ConnectionError, OSError):
+            self._drop(slot)
+
+    def _park(self, slot: _WorkerSlot, credit: int) -> None:
+        slot.parked_credit = credit
+
+    def _serve_parked(self) -> None:
+        for slot in list(self._slots.values()):
+            if slot.parked_credit is None or self._finished():
+                continue
+            if slot.revoke or self.frontier.ready_count:
+                grants = self._grant(slot, min(slot.parked_credit, self.max_batch))
+                if not grants and not slot.revoke:
+                    continue  # nothing fits this worker yet; stay parked
+            else:
+                if self._steal_for(slot):
+                    continue
+                grants = self._speculate(slot, min(slot.parked_credit, self.max_batch))
+                if not grants:
+                    continue
+            slot.parked_credit = None
+            self._reply(slot, grants)
+
+    def _steal_for(self, thief: _WorkerSlot) -> bool:
+        """
+        Revoke half of the largest unstarted backlog for `thief`; True if a steal began.
+        """
+        if self.frontier.ready_count:
+            return False
+        victims = [
+            s for s in self._slots.values()
+            if s is not thief and not s.revoke and len(s.queued) >= 2
+        ]
+        if not victims:
+            return False
+        victim = max(victims, key=lambda s: len(s.queued))
+        take = len(victim.queued) // 2
+        victim.revoke = victim.queued[-take:]
+        victim.queued = victim.queued[:-take]
+        self.steals += take
+        return True
+
+    def _drop(self, slot: _WorkerSlot) -> None:
+        self._slots.pop(slot.conn, None)
+        for lease in self.leases.release_worker(slot.worker_id):
+            self._lost(lease)
+        self.packer.remove_worker(slot.worker_id)
+        try:
+            slot.conn.close()
+        except OSError:
+            pass
+
+    def _shutdown(self, broker: LocalBroker) -> None:
+        # Parked workers are waiting for a reply; busy ones get theirs on the next pull.
+        deadline = time.perf_counter() + 5.0
+        for conn in broker.take_connections():
+            self._slots[conn] = _WorkerSlot(conn=conn)
+        while self._slots and time.perf_counter() < deadline:
+            for slot in list(self._slots.values()):
+                if slot.parked_credit is not None:
+                    try:
+                        slot.conn.send(("shutdown",))
+                    except (ConnectionError, OSError):
+                        pass
+                    self._slots.pop(slot.conn, None)
+            for conn in _wait(self._slots, 0.05):
+                slot = self._slots[conn]
+                try:
+                    msg = conn.recv()
+                except (EOFError, ConnectionError, OSError):
+                    self._slots.pop(conn, None)
+                    continue
+                if msg[0] == "pull":
+                    for result in msg[3]:
+                        self._commit(slot, result)
+                    slot.parked_credit = 0
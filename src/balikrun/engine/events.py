@@ -0,0 +1,624 @@
+# src/balikrun/engine/events.py
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from enum import Enum
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Iterator, Optional, Sequence, Union
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from balikrun.engine.scheduler import NodeState
+
+
+class EventType(str, Enum):
+    RUN_CREATED = "RUN_CREATED"
+    NODE_STATE = "NODE_STATE"
+    ATTEMPT = "ATTEMPT"
+    RUN_FINISHED = "RUN_FINISHED"
+
+
+class Event(BaseModel):
+    """
+    One entry of the append-only audit log.
+
+    seq:
+      Global, strictly increasing sequence number assigned by the log.
+
+    ts:
+      Wall-clock time (seconds since the epoch) at append.
+
+    NODE_STATE events record a node transition to `state`; `attempt` distinguishes
+    re-executions of the same node_id. ATTEMPT events record what happens to one
+    execution without changing the node's state (`data["action"]`: a speculative
+    duplicate was launched, a losing or failed duplicate was dropped).
+    """
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    seq: int
+    run_id: str
+    type: EventType
+    ts: float
+    node_id: Optional[str] = None
+    task_id: Optional[str] = None
+    state: Optional[NodeState] = None
+    attempt: int = 0
+    data: dict[str, Any] = Field(default_factory=dict)
+
+
+EventListener = Callable[[Event], None]
+
+# Secondary keys of an EventIndex: Event field -> postings.
+INDEXED_FIELDS: tuple[str, ...] = ("run_id", "node_id", "task_id")
+
+
+class EventIndex:
+    """
+    Secondary indexes over a seq-ordered event stream.
+
+    Postings are sorted seq lists per run_id, node_id and task_id; time is indexed by
+    `bucket_seconds`-wide buckets of `ts`, each holding the lowest and highest seq
+    appended in it.
+
+    Notes:
+    - `candidates()` intersects the postings of the given keys (the shortest list,
+      probed into the others by bisection) in O(m log n) for m candidates.
+    - A time range narrows candidates to the seq span of its buckets, so the result
+      is a superset on time: callers check `ts` exactly. The span stays correct if
+      the wall clock steps back; it is merely wider.
+    - Indexes are derived data: `add()` every event in seq order rebuilds them.
+    """
+
+    def __init__(self, *, bucket_seconds: float = 3600.0):
+        if bucket_seconds <= 0:
+            raise ValueError("EventIndex.bucket_seconds must be positive.")
+        self.bucket_seconds = bucket_seconds
+        self._postings: dict[str, dict[str, list[int]]] = {f: {} for f in INDEXED_FIELDS}
+        self._buckets: dict[int, list[int]] = {}  # bucket -> [min seq, max seq]
+        self._bucket_keys: list[int] = []
+        self.first: Optional[int] = None
+        self.last = -1
+
+    def __len__(self) -> int:
+        return 0 if self.first is None else self.last - self.first + 1
+
+    def add(self, event: Event) -> None:
+        seq = event.seq
+        if seq <= self.last:
+            raise ValueError(f"EventIndex.add: seq {seq} is not after {self.last}.")
+        if self.first is None:
+            self.first = seq
+        self.last = seq
+        for f in INDEXED_FIELDS:
+            key = getattr(event, f)
+            if key is not None:
+                self._postings[f].setdefault(key, []).append(seq)
+        bucket = math.floor(event.ts / self.bucket_seconds)
+        span = self._buckets.get(bucket)
+        if span is None:
+            self._buckets[bucket] = [seq, seq]
+            if self._bucket_keys and bucket < self._bucket_keys[-1]:
+                insort(self._bucket_keys, bucket)
+            else:
+                self._bucket_keys.append(bucket)
+        else:
+            span[1] = seq
+
+    def keys(self, field: str) -> list[str]:
+        return list(self._postings[field])
+
+    def postings(self, field: str, key: str) -> Sequence[int]:
+        return self._postings[field].get(key, ())
+
+    def candidates(
+        self,
+        *,
+        run_id: Optional[str] = None,
+        node_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        after: int = -1,
+    ) -> Sequence[int]:
+        """
+        Sorted seqs > `after` matching every given key, and possibly (see Notes)
+        outside [since, until].
+        """
+        if self.first is None:
+            return ()
+        lo, hi = max(after + 1, self.first), self.last
+        if since is not None or until is not None:
+            keys = self._bucket_keys
+            i = 0 if since is None else bisect_left(keys, math.floor(since / self.bucket_seconds))
+            j = len(keys) if until is None else bisect_right(keys, math.floor(until / self.bucket_seconds))
+            if i >= j:
+                return ()
+            spans = [self._buckets[k] for k in keys[i:j]]
+            lo = max(lo, min(s[0] for s in spans))
+            hi = min(hi, max(s[1] for s in spans))
+        if lo > hi:
+            return ()
+        lists = []
+        for f, key in zip(INDEXED_FIELDS, (run_id, node_id, task_id)):
+            if key is not None:
+                seqs = self._postings[f].get(key)
+                if not seqs:
+                    return ()
+                lists.append(seqs)
+        if not lists:
+            return range(lo, hi + 1)
+        lists.sort(key=len)
+        head = lists[0]
+        out = head[bisect_left(head, lo):bisect_right(head, hi)]
+        for other in lists[1:]:
+            out = [s for s in out if _contains(other, s)]
+        return out
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "bucket_seconds": self.bucket_seconds,
+            "first": self.first,
+            "last": self.last,
+            "postings": self._postings,
+            "buckets": {str(k): span for k, span in self._buckets.items()},
+        }
+
+    def merge(self, state: dict[str, Any]) -> None:
+        """
+        Append the contents of a later index (`to_dict()` of one whose seqs all
+        follow ours), e.g. a sealed segment's.
+        """
+        if state["first"] is None:
+            return
+        if state["bucket_seconds"] != self.bucket_seconds:
+            raise ValueError("EventIndex.merge: bucket_seconds differ.")
+        if state["first"] <= self.last:
+            raise ValueError(f"EventIndex.merge: seq {state['first']} is not after {self.last}.")
+        for f in INDEXED_FIELDS:
+            postings = self._postings[f]
+            for key, seqs in state["postings"][f].items():
+                postings.setdefault(key, []).extend(seqs)
+        for k, (lo, hi) in state["buckets"].items():
+            bucket = int(k)
+            span = self._buckets.get(bucket)
+            if span is None:
+                self._buckets[bucket] = [lo, hi]
+                insort(self._bucket_keys, bucket)
+            else:
+                span[0], span[1] = min(span[0], lo), max(span[1], hi)
+        if self.first is None:
+            self.first = state["first"]
+        self.last = state["last"]
+
+
+def _contains(seqs: Sequence[int], seq: int) -> bool:
+    i = bisect_left(seqs, seq)
+    return i < len(seqs) and seqs[i] == seq
+
+
+def _matches(
+    event: Event,
+    type: Optional[EventType],
+    since: Optional[float],
+    until: Optional[float],
+) -> bool:
+    if type is not None and event.type != type:
+        return False
+    if since is not None and event.ts < since:
+        return False
+    return until is None or event.ts <= until
+
+
+def _select(
+    events: Iterable[Event],
+    type: Optional[EventType],
+    since: Optional[float],
+    until: Optional[float],
+    limit: Optional[int],
+) -> list[Event]:
+    out: list[Event] = []
+    for event in events:
+        if limit is not None and len(out) >= limit:
+            break
+        if _matches(event, type, since, until):
+            out.append(event)
+    return out
+
+
+class EventLog:
+    """
+    In-memory append-only event log.
+
+    Notes:
+    - Appends are serialized by a lock and assign `seq`. Listeners run after that lock
+      is released, one event at a time in seq order (registration order per event),
+      and append() returns once its event was delivered, so derived views never lag
+      the log. A listener may append: its event is delivered after the current one.
+    - Per-run reads are O(log n + k) via the run_id postings of an EventIndex, which
+      also serves `query()` by node_id, task_id and time range.
+    - For a durable copy, subscribe an EventSegments store.
+    """
+
+    def __init__(self, *, bucket_seconds: float = 3600.0, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._events: list[Event] = []
+        self._index = EventIndex(bucket_seconds=bucket_seconds)
+        self._listeners: list[EventListener] = []
+        self._next_seq = 0
+        self._undelivered: deque[Event] = deque()
+        self._deliver_lock = threading.Lock()
+        self._delivering: Optional[int] = None  # thread id running listeners
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __iter__(self) -> Iterator[Event]:
+        return iter(list(self._events))
+
+    def subscribe(self, listener: EventListener) -> Callable[[], None]:
+        """
+        Register `listener` for every future append. Returns an unsubscribe callable.
+        """
+        self._listeners.append(listener)
+
+        def _unsubscribe() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return _unsubscribe
+
+    def append(
+        self,
+        run_id: str,
+        type: EventType,
+        *,
+        node_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        state: Optional[NodeState] = None,
+        attempt: int = 0,
+        data: Optional[dict[str, Any]] = None,
+    ) -> Event:
+        with self._lock:
+            event = Event(
+                seq=self._next_seq,
+                run_id=run_id,
+                type=type,
+                ts=self._clock(),
+                node_id=node_id,
+                task_id=task_id,
+                state=state,
+                attempt=attempt,
+                data=data or {},
+            )
+            self._next_seq += 1
+            self._events.append(event)
+            self._index.add(event)
+            self._undelivered.append(event)
+        if self._delivering != threading.get_ident():
+            self._deliver()
+        return event
+
+    def _deliver(self) -> None:
+        # One thread at a time drains the queue, so listeners see seq order; an append
+        # from inside a listener only queues (see append) and is delivered by this loop.
+        with self._deliver_lock:
+            self._delivering = threading.get_ident()
+            try:
+                while True:
+                    with self._lock:
+                        if not self._undelivered:
+                            return
+                        event = self._undelivered.popleft()
+                        listeners = list(self._listeners)
+                    for listener in listeners:
+                        listener(event)
+            finally:
+                self._delivering = None
+
+    def read(
+        self,
+        run_id: Optional[str] = None,
+        *,
+        after: int = -1,
+        limit: Optional[int] = None,
+    ) -> list[Event]:
+        """
+        Events with seq > `after`, optionally restricted to one run, in seq order.
+        """
+        if run_id is None:
+            start = after + 1 if after >= 0 else 0
+            end = len(self._events) if limit is None else min(len(self._events), start + limit)
+            return self._events[start:end]
+        seqs = self._index.postings("run_id", run_id)
+        start = bisect_right(seqs, after)
+        end = len(seqs) if limit is None else min(len(seqs), start + limit)
+        return [self._events[seq] for seq in seqs[start:end]]
+
+    def query(
+        self,
+        *,
+        run_id: Optional[str] = None,
+        node_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        type: Optional[EventType] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        after: int = -1,
+        limit: Optional[int] = None,
+    ) -> list[Event]:
+        """
+        Events matching every given filter, in seq order; `since`/`until` bound `ts`
+        (inclusive). E.g., all executions of one task in a run over the last week:
+
+            log.query(run_id=r, task_id="train", since=time.time() - 7 * 86400)
+        """
+        seqs = self._index.candidates(
+            run_id=run_id, node_id=node_id, task_id=task_id, since=since, until=until, after=after
+        )
+        return _select((self._events[seq] for seq in seqs), type, since, until, limit)
+
+    def run_ids(self) -> list[str]:
+        return self._index.keys("run_id")
+
+
+class _Segment:
+    __slots__ = ("first", "path", "count", "sparse")
+
+    def __init__(self, first: int, path: Path):
+        self.first = first
+        self.path = path
+        self.count = 0
+        self.sparse: list[int] = []  # byte offset of every sparse_every-th line
+
+
+class EventSegments:
+    """
+    Durable, queryable copy of an event stream as JSON-lines segment files.
+
+    Layout under `root`:
+      <first seq>.jsonl      one Event per line, consecutive seqs
+      <first seq>.idx.json   written when the segment is sealed (holds
+                             `segment_events` events): the byte offset of every
+                             `sparse_every`-th line, and the segment's EventIndex
+
+    Feed it from an EventLog with `log.subscribe(store.append)`.
+
+    Notes:
+    - Opening merges the sealed segments' indexes and scans only the open segment;
+      a torn last line (crash mid-write) is truncated.
+    - An event is read by seeking to the sparse offset at or before it and skipping
+      fewer than `sparse_every` lines, so a point lookup is O(log S + sparse_every)
+      and a query reads only its candidates' neighbourhoods.
+    - Indexes are derived data: a missing or unreadable .idx.json is rebuilt from its
+      segment at open, and `rebuild()` rewrites them all from the raw segments.
+    - Appends are buffered; `flush()`, `close()` and queries write them out.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        *,
+        segment_events: int = 65536,
+        sparse_every: int = 64,
+        bucket_seconds: float = 3600.0,
+    ):
+        if segment_events < 1 or sparse_every < 1:
+            raise ValueError("EventSegments.segment_events and sparse_every must be positive.")
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.segment_events = segment_events
+        self.sparse_every = sparse_every
+        self.bucket_seconds = bucket_seconds
+        self._lock = threading.Lock()
+        self._writer: Optional[IO[bytes]] = None  # the open segment, if any
+        self._load(rebuild=False)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __enter__(self) -> "EventSegments":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def append(self, event: Event) -> None:
+        with self._lock:
+            if self._index.first is not None and event.seq != self._index.last + 1:
+                raise ValueError(f"EventSegments.append: expected seq {self._index.last + 1}, got {event.seq}.")
+            writer = self._writer
+            if writer is None:
+                writer = self._open_segment(event.seq)
+            seg = self._segments[-1]
+            if seg.count % self.sparse_every == 0:
+                seg.sparse.append(self._offset)
+            line = event.model_dump_json().encode() + b"\n"
+            writer.write(line)
+            self._offset += len(line)
+            seg.count += 1
+            self._open_index.add(event)
+            self._index.add(event)
+            if seg.count >= self.segment_events:
+                self._seal()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                self._writer.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def rebuild(self) -> None:
+        """
+        Drop every index file and rebuild from the segments.
+        """
+        self.close()
+        with self._lock:
+            for path in self.root.glob("*.idx.json"):
+                path.unlink()
+            self._load(rebuild=True)
+
+    def get(self, seq: int) -> Optional[Event]:
+        return next(self._read([seq]), None)
+
+    def read(self, run_id: str, *, after: int = -1, limit: Optional[int] = None) -> list[Event]:
+        return self.query(run_id=run_id, after=after, limit=limit)
+
+    def query(
+        self,
+        *,
+        run_id: Optional[str] = None,
+        node_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        type: Optional[EventType] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        after: int = -1,
+        limit: Optional[int] = None,
+    ) -> list[Event]:
+        """
+        Same filters as EventLog.query().
+        """
+        seqs = self._index.candidates(
+            run_id=run_id, node_id=node_id, task_id=task_id, since=since, until=until, after=after
+        )
+        if type is None and since is None and until is None and limit is not None:
+            seqs = seqs[:limit]
+        return _select(self._read(seqs), type, since, until, limit)
+
+    def run_ids(self) -> list[str]:
+        return self._index.keys("run_id")
+
+    def _read(self, seqs: Iterable[int]) -> Iterator[Event]:
+        """
+        Events for sorted `seqs`, reading each segment forward from sparse offsets.
+        """
+        self.flush()
+        firsts = [seg.first for seg in self._segments]
+        handle: Optional[IO[bytes]] = None
+        current = -1
+        cursor = -1  # seq of the line at the handle's position (-1: not positioned)
+        try:
+            for seq in seqs:
+                i = bisect_right(firsts, seq) - 1
+                if i < 0 or seq - self._segments[i].first >= self._segments[i].count:
+                    continue
+                seg = self._segments[i]
+                if handle is None or i != current:
+                    if handle is not None:
+                        handle.close()
+                    handle = open(seg.path, "rb")
+                    current, cursor = i, -1
+                if cursor < 0 or not cursor <= seq < cursor + self.sparse_every:
+                    k = (seq - seg.first) // self.sparse_every
+                    handle.seek(seg.sparse[k])
+                    cursor = seg.first + k * self.sparse_every
+                while cursor < seq:
+                    handle.readline()
+                    cursor += 1
+                yield Event.model_validate_json(handle.readline())
+                cursor += 1
+        finally:
+            if handle is not None:
+                handle.close()
+
+    def _load(self, *, rebuild: bool) -> None:
+        self._index = EventIndex(bucket_seconds=self.bucket_seconds)
+        self._segments: list[_Segment] = []
+        self._writer = None
+        self._open_index = self._index
+        self._offset = 0
+        paths = sorted(self.root.glob("*.jsonl"), key=lambda p: int(p.stem))
+        for i, path in enumerate(paths):
+            last = i == len(paths) - 1
+            seg = _Segment(int(path.stem), path)
+            state = None if rebuild else self._read_index(seg)
+            if state is None:
+                state = self._scan(seg, truncate=last)
+                if seg.count and (seg.count >= self.segment_events or not last):
+                    self._write_index(seg, state)
+            if not seg.count:
+                path.unlink()
+                seg.path.with_suffix(".idx.json").unlink(missing_ok=True)
+                continue
+            self._segments.append(seg)
+            self._index.merge(state.to_dict())
+            if last and seg.count < self.segment_events:
+                # Still open: keep appending to it.
+                self._writer = open(path, "ab")
+                self._offset = path.stat().st_size
+                self._open_index = state
+
+    def _read_index(self, seg: _Segment) -> Optional[EventIndex]:
+        try:
+            with open(seg.path.with_suffix(".idx.json"), "rb") as f:
+                state = json.load(f)
+            index = EventIndex(bucket_seconds=self.bucket_seconds)
+            index.merge(state["index"])
+            seg.count, seg.sparse = state["count"], state["sparse"]
+            if state["sparse_every"] != self.sparse_every:
+                return None
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return index
+
+    def _write_index(self, seg: _Segment, index: EventIndex) -> None:
+        state = {
+            "count": seg.count,
+            "sparse_every": self.sparse_every,
+            "sparse": seg.sparse,
+            "index": index.to_dict(),
+        }
+        path = seg.path.with_suffix(".idx.json")
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, separators=(",", ":")))
+        os.replace(tmp, path)
+
+    def _scan(self, seg: _Segment, *, truncate: bool) -> EventIndex:
+        index = EventIndex(bucket_seconds=self.bucket_seconds)
+        seg.count, seg.sparse = 0, []
+        offset = 0
+        with open(seg.path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("torn line")
+                    event = Event.model_validate_json(line)
+                    if event.seq != seg.first + seg.count:
+                        raise ValueError(f"seq {event.seq} out of order")
+                except ValueError:
+                    if not truncate:
+                        raise ValueError(f"Corrupt event segment {seg.path} at byte {offset}.") from None
+                    break
+                if seg.count % self.sparse_every == 0:
+                    seg.sparse.append(offset)
+                index.add(event)
+                seg.count += 1
+                offset += len(line)
+        if truncate and offset < seg.path.stat().st_size:
+            os.truncate(seg.path, offset)
+        return index
+
+    def _open_segment(self, first: int) -> IO[bytes]:
+        seg = _Segment(first, self.root / f"{first:012d}.jsonl")
+        self._segments.append(seg)
+        writer = self._writer = open(seg.path, "ab")
+        self._offset = 0
+        self._open_index = EventIndex(bucket_seconds=self.bucket_seconds)
+        return writer
+
+    def _seal(self) -> None:
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+        self._write_index(self._segments[-1], self._open_index)
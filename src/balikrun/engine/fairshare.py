@@ -0,0 +1,229 @@
+# src/balikrun/engine/fairshare.py
+from __future__ import annotations
+
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from balikrun.engine.scheduler import Frontier
+
+
+@dataclass(eq=False)
+class _Share:
+    name: str
+    weight: float = 1.0
+    limit: Optional[int] = None  # max tasks in flight
+    active: int = 0
+    vtime: float = 0.0  # dispatches / weight
+    armed: bool = False  # has an entry in its parent's heap
+
+    @property
+    def saturated(self) -> bool:
+        return self.limit is not None and self.active >= self.limit
+
+
+@dataclass(eq=False)
+class _RunShare(_Share):
+    frontier: Frontier = field(kw_only=True)  # required; set by add_run()
+    project: str = ""
+    removed: bool = False
+
+
+@dataclass(eq=False)
+class _ProjectShare(_Share):
+    runs: list[tuple[float, int, _RunShare]] = field(default_factory=list)  # heap
+    clock: float = 0.0  # vtime of the run dispatched last
+    members: int = 0
+    explicit: bool = False  # configured by set_project(); kept when empty
+
+
+def _check_share(weight: float, max_in_flight: Optional[int]) -> None:
+    if not weight > 0:
+        raise ValueError("weight must be positive.")
+    if max_in_flight is not None and max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1 (or None for no limit).")
+
+
+class FairShareScheduler:
+    """
+    Hands out ready TASKs of many runs, each driven by its own Frontier, to one
+    shared worker pool.
+
+    Selection is two-level weighted fair queuing. Among projects with work to hand
+    out, the one with the least weighted service (tasks dispatched / weight) goes
+    next; within it, the run with the least weighted service. A project therefore
+    gets its weight's share of dispatches while it has ready work, however many
+    runs it submits, and a sweep of hundreds of runs cannot starve other projects.
+    Runs without a project are their own project.
+
+    Notes:
+    - Virtual time rather than deficit round robin: a DRR sweep revisits every
+      blocked run (empty queue, at its limit) each round, while heaps holding only
+      eligible entries give the same weighted shares in O(log P + log R) per
+      dispatch for P projects and R runs in the chosen project.
+    - A run or project that becomes eligible again starts at its parent's current
+      virtual time, so idling does not bank credit for a later burst.
+    - `max_in_flight` caps a run's or project's concurrently dispatched tasks; a
+      saturated one leaves the heap until a slot is freed.
+    - Report outcomes through `complete`/`fail`/`requeue` here rather than on the
+      Frontier, so nodes made ready re-arm their run; call `refresh(run_id)` after
+      changing a run's Frontier directly.
+    - Not thread-safe: owned by one scheduler loop.
+    """
+
+    def __init__(self) -> None:
+        self._runs: dict[str, _RunShare] = {}
+        self._projects: dict[str, _ProjectShare] = {}
+        self._heap: list[tuple[float, int, _ProjectShare]] = []
+        self._clock = 0.0  # vtime of the project dispatched last
+        self._seq = itertools.count()
+
+    def __contains__(self, run_id: str) -> bool:
+        return run_id in self._runs
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def set_project(self, project: str, *, weight: float = 1.0, max_in_flight: Optional[int] = None) -> None:
+        _check_share(weight, max_in_flight)
+        proj = self._project(project)
+        proj.weight = weight
+        proj.limit = max_in_flight
+        proj.explicit = True
+        self._arm_project(proj)
+
+    def add_run(
+        self,
+        run_id: str,
+        frontier: Frontier,
+        *,
+        project: Optional[str] = None,
+        weight: float = 1.0,
+        max_in_flight: Optional[int] = None,
+    ) -> None:
+        """
+        Register a started Frontier; its ready nodes become eligible immediately.
+        """
+        _check_share(weight, max_in_flight)
+        if run_id in self._runs:
+            raise ValueError(f"Run '{run_id}' already exists.")
+        proj = self._project(project or run_id)
+        proj.members += 1
+        run = _RunShare(run_id, weight, max_in_flight, frontier=frontier, project=proj.name)
+        self._runs[run_id] = run
+        self._arm_run(run)
+
+    def remove_run(self, run_id: str) -> None:
+        """
+        Forget a run (finished or cancelled); its in-flight count stops counting
+        against its project.
+        """
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        run.removed = True
+        proj = self._projects[run.project]
+        proj.active -= run.active
+        proj.members -= 1
+        if proj.members == 0 and not proj.explicit:
+            del self._projects[proj.name]
+        else:
+            self._arm_project(proj)
+
+    def in_flight(self, run_id: str) -> int:
+        return self._runs[run_id].active
+
+    def project_in_flight(self, project: str) -> int:
+        proj = self._projects.get(project)
+        return 0 if proj is None else proj.active
+
+    def take(self, n: int) -> list[tuple[str, str]]:
+        """
+        Dispatch up to `n` ready TASKs as (run_id, node_id) pairs, marking them
+        LEASED in their Frontiers.
+        """
+        out: list[tuple[str, str]] = []
+        while len(out) < n and self._heap:
+            _, _, proj = heapq.heappop(self._heap)
+            proj.armed = False
+            if self._projects.get(proj.name) is not proj or proj.saturated:
+                continue
+            run = self._pop_run(proj)
+            if run is None:
+                continue
+            node_id = run.frontier.take(1)[0]
+            run.active += 1
+            proj.active += 1
+            self._clock = proj.vtime
+            proj.clock = run.vtime
+            proj.vtime += 1.0 / proj.weight
+            run.vtime += 1.0 / run.weight
+            self._arm_run(run)
+            self._arm_project(proj)
+            out.append((run.name, node_id))
+        return out
+
+    def complete(self, run_id: str, node_id: str) -> None:
+        run = self._runs[run_id]
+        run.frontier.complete(node_id)
+        self._release(run, 1)
+
+    def fail(self, run_id: str, node_id: str) -> None:
+        run = self._runs[run_id]
+        run.frontier.fail(node_id)
+        self._release(run, 1)
+
+    def requeue(self, run_id: str, node_ids: Iterable[str]) -> None:
+        """
+        Return dispatched nodes (lost leases) to their run's queue.
+        """
+        run = self._runs[run_id]
+        node_ids = list(node_ids)
+        in_flight = run.frontier.in_flight
+        returned = sum(1 for node_id in node_ids if node_id in in_flight)
+        run.frontier.requeue(node_ids)
+        self._release(run, returned)
+
+    def refresh(self, run_id: str) -> None:
+        self._arm_run(self._runs[run_id])
+
+    def _project(self, name: str) -> _ProjectShare:
+        proj = self._projects.get(name)
+        if proj is None:
+            proj = self._projects[name] = _ProjectShare(name)
+        return proj
+
+    def _release(self, run: _RunShare, k: int) -> None:
+        run.active -= k
+        proj = self._projects[run.project]
+        proj.active -= k
+        self._arm_run(run)
+        self._arm_project(proj)
+
+    def _eligible(self, run: _RunShare) -> bool:
+        return not run.removed and not run.saturated and run.frontier.ready_count > 0
+
+    def _pop_run(self, proj: _ProjectShare) -> Optional[_RunShare]:
+        while proj.runs:
+            _, _, run = heapq.heappop(proj.runs)
+            run.armed = False
+            if self._eligible(run):
+                return run
+        return None
+
+    def _arm_run(self, run: _RunShare) -> None:
+        if run.armed or not self._eligible(run):
+            return
+        proj = self._projects[run.project]
+        run.vtime = max(run.vtime, proj.clock)
+        run.armed = True
+        heapq.heappush(proj.runs, (run.vtime, next(self._seq), run))
+        self._arm_project(proj)
+
+    def _arm_project(self, proj: _ProjectShare) -> None:
+        if proj.armed or proj.saturated or not proj.runs:
+            return
+        proj.vtime = max(proj.vtime, self._clock)
+        proj.armed = True
+        heapq.heappush(self._heap, (proj.vtime, next(self._seq), proj))
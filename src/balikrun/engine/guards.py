@@ -0,0 +1,362 @@
+# src/balikrun/engine/guards.py
+from __future__ import annotations
+
+import ast
+import copy
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional, Sequence
+
+from balikrun.ir import Edge, GraphIR, Node
+
+# Guards (ChoiceCase.guard, LoopBlock.guard, Edge.guard) are opaque strings in the spec
+# and the IR. The engine resolves each one to a predicate over the run's guard scope:
+#
+#   registry key   a name registered with GuardRegistry.register(); the callable
+#                  receives the scope (a read-only mapping) and returns a truth value.
+#                  It must be a pure function of the scope unless registered with
+#                  pure=False: results are memoized per scope version.
+#   expression     anything else, parsed once as a small expression language:
+#                    names         scope variables (e.g. task outputs published under
+#                                  their task_id); names may not start with "_"
+#                    literals      numbers, strings, True/False/None, tuples, lists
+#                    operators     and or not, == != < <= > >= in, not in, is, is not,
+#                                  + - * / // %, x if c else y, subscripts (a["k"], a[0])
+#                    calls         only the functions in SAFE_FUNCTIONS
+#                  Attribute access, comprehensions, lambdas and every other construct
+#                  are rejected at compile time, so an expression cannot reach
+#                  anything but the scope. `*` is checked at run time: repeating a
+#                  str/bytes/list/tuple beyond MAX_REPEAT_LENGTH items raises GuardError
+#                  instead of allocating it.
+
+SAFE_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "abs": abs,
+    "all": all,
+    "any": any,
+    "bool": bool,
+    "float": float,
+    "int": int,
+    "len": len,
+    "max": max,
+    "min": min,
+    "round": round,
+    "str": str,
+}
+
+MAX_EXPRESSION_LENGTH = 1_000
+
+MAX_REPEAT_LENGTH = 100_000
+
+GuardFn = Callable[[Mapping[str, Any]], Any]
+
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BoolOp,
+    ast.And,
+    ast.Or,
+    ast.UnaryOp,
+    ast.Not,
+    ast.USub,
+    ast.UAdd,
+    ast.BinOp,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Compare,
+    ast.Eq,
+    ast.NotEq,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+    ast.In,
+    ast.NotIn,
+    ast.Is,
+    ast.IsNot,
+    ast.IfExp,
+    ast.Subscript,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.Tuple,
+    ast.List,
+    ast.Call,
+)
+
+
+class GuardError(ValueError):
+    """
+    A guard failed to compile or to evaluate.
+    """
+
+
+class GuardScope(Mapping[str, Any]):
+    """
+    Variables visible to guard expressions within one run, with a version counter.
+
+    Every write bumps `version`; guard results are memoized per version, so writers
+    must go through set()/update() rather than mutating stored values in place.
+    """
+
+    def __init__(self, values: Optional[Mapping[str, Any]] = None):
+        self._values: dict[str, Any] = dict(values or {})
+        self.version = 0
+
+    def __getitem__(self, name: str) -> Any:
+        return self._values[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def set(self, name: str, value: Any) -> None:
+        self._values[name] = value
+        self.version += 1
+
+    def update(self, values: Mapping[str, Any]) -> None:
+        if values:
+            self._values.update(values)
+            self.version += 1
+
+
+_SEQUENCES = (str, bytes, list, tuple)
+
+
+def _multiply(a: Any, b: Any) -> Any:
+    # Every `a * b` in a guard expression is compiled to `_mul(a, b)`.
+    seq, times = (a, b) if isinstance(a, _SEQUENCES) else (b, a)
+    if (
+        isinstance(seq, _SEQUENCES)
+        and isinstance(times, int)
+        and len(seq) * times > MAX_REPEAT_LENGTH
+    ):
+        raise GuardError(f"Guard repeats a sequence beyond {MAX_REPEAT_LENGTH} items.")
+    return a * b
+
+
+class _BoundMultiply(ast.NodeTransformer):
+    def visit_BinOp(self, node: ast.BinOp) -> ast.expr:
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Mult):
+            return ast.Call(ast.Name("_mul", ast.Load()), [node.left, node.right], [])
+        return node
+
+
+class DecisionProgram:
+    """
+    The guards of one DECISION node's out-edges, compiled into a single code object.
+
+    `evaluate(scope)` returns the position of the first guard that holds, or -1. The
+    guards are chained as `0 if g0 else 1 if g1 else ... -1`, so one eval() call
+    replaces one call per guard and later guards are not evaluated once one holds.
+    `pure` is False if any guard is a function registered with pure=False.
+    """
+    __slots__ = ("guards", "pure", "_code", "_globals")
+
+    def __init__(
+        self, guards: Sequence[str], code: Any, functions: Mapping[str, GuardFn], *, pure: bool = True
+    ):
+        self.guards = tuple(guards)
+        self.pure = pure
+        self._code = code
+        self._globals: dict[str, Any] = {
+            "__builtins__": SAFE_FUNCTIONS,
+            "_scope": None,
+            "_mul": _multiply,
+            **functions,
+        }
+
+    def evaluate(self, scope: Mapping[str, Any]) -> int:
+        values = scope._values if isinstance(scope, GuardScope) else scope
+        g = self._globals
+        g["_scope"] = scope
+        try:
+            return eval(self._code, g, values)
+        finally:
+            g["_scope"] = None
+
+
+class GuardRegistry:
+    """
+    Resolves guard strings to predicates, compiling each distinct string once.
+
+    Notes:
+    - Registered keys take precedence over expressions with the same text.
+    - Compiled expressions and DecisionPrograms are cached by guard text, so every run
+      (and every DECISION with the same guards) shares them.
+    - register() after a guard was compiled invalidates the caches.
+    - Registered functions are assumed to be pure functions of the scope, so their
+      results are memoized per scope version (GuardEvaluator). Register one that
+      reads anything else (time, counters, external state) with `pure=False`.
+    """
+
+    def __init__(self, functions: Optional[Mapping[str, GuardFn]] = None):
+        self._functions: dict[str, GuardFn] = {}
+        self._impure: set[str] = set()
+        self._expressions: dict[str, ast.expr] = {}
+        self._programs: dict[tuple[str, ...], DecisionProgram] = {}
+        for key, fn in (functions or {}).items():
+            self.register(key, fn)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._functions
+
+    def register(self, key: str, fn: GuardFn, *, pure: bool = True) -> None:
+        if not key:
+            raise ValueError("Guard keys must be non-empty.")
+        self._functions[key] = fn
+        if pure:
+            self._impure.discard(key)
+        else:
+            self._impure.add(key)
+        self._expressions.pop(key, None)
+        self._programs.clear()
+
+    def predicate(self, guard: str) -> Callable[[Mapping[str, Any]], bool]:
+        """
+        A standalone predicate for one guard (evaluated through a one-guard program).
+        """
+        program = self.program([guard])
+        return lambda scope: program.evaluate(scope) == 0
+
+    def program(self, guards: Sequence[str]) -> DecisionProgram:
+        key = tuple(guards)
+        program = self._programs.get(key)
+        if program is None:
+            program = self._programs[key] = self._build(key)
+        return program
+
+    def check(self, graph: GraphIR) -> dict[str, str]:
+        """
+        Compile every guard of `graph` ahead of the run; returns {guard: error}.
+        """
+        errors: dict[str, str] = {}
+        guards = {e.guard for e in graph.edges if e.guard is not None}
+        guards.update(n.guard for n in graph.nodes if n.guard is not None)
+        for guard in sorted(guards):
+            try:
+                self.program([guard])
+            except GuardError as exc:
+                errors[guard] = str(exc)
+        return errors
+
+    def _build(self, guards: tuple[str, ...]) -> DecisionProgram:
+        functions: dict[str, GuardFn] = {}
+        body: ast.expr = ast.Constant(-1)
+        for pos in reversed(range(len(guards))):
+            guard = guards[pos]
+            fn = self._functions.get(guard)
+            if fn is not None:
+                name = f"_guard{pos}"
+                functions[name] = fn
+                test: ast.expr = ast.Call(ast.Name(name, ast.Load()), [ast.Name("_scope", ast.Load())], [])
+            else:
+                test = _BoundMultiply().visit(copy.deepcopy(self._expression(guard)))
+            body = ast.IfExp(test=test, body=ast.Constant(pos), orelse=body)
+        tree = ast.fix_missing_locations(ast.Expression(body))
+        code = compile(tree, f"<guards {' | '.join(guards)}>", "eval")
+        return DecisionProgram(guards, code, functions, pure=self._impure.isdisjoint(guards))
+
+    def _expression(self, guard: str) -> ast.expr:
+        tree = self._expressions.get(guard)
+        if tree is None:
+            tree = self._expressions[guard] = parse_expression(guard)
+        return tree
+
+
+def parse_expression(text: str) -> ast.expr:
+    """
+    Parse and validate a guard expression; raises GuardError if it is not allowed.
+    """
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise GuardError(f"Guard expression exceeds {MAX_EXPRESSION_LENGTH} characters.")
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as exc:
+        raise GuardError(f"Guard {text!r} is not a valid expression: {exc.msg}.") from None
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise GuardError(f"Guard {text!r}: {type(node).__name__} is not allowed.")
+        if isinstance(node, ast.Name) and node.id.startswith("_"):
+            raise GuardError(f"Guard {text!r}: names may not start with '_' ({node.id}).")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in SAFE_FUNCTIONS:
+                raise GuardError(f"Guard {text!r}: only {sorted(SAFE_FUNCTIONS)} may be called.")
+            if node.keywords:
+                raise GuardError(f"Guard {text!r}: keyword arguments are not allowed.")
+        if isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Slice):
+            raise GuardError(f"Guard {text!r}: slices are not allowed.")
+    return tree.body
+
+
+class GuardEvaluator:
+    """
+    DECISION policy for one run: `Frontier(gi, decide=evaluator.decide)`.
+
+    Notes:
+    - A DECISION takes the out-edge of the first guard (in GraphIR edge order) that
+      holds, or else every unguarded out-edge; with neither, GuardError is raised.
+      A loop's back-edge is just a guarded out-edge of its DECISION.
+    - All guards of a DECISION are evaluated by one DecisionProgram call.
+    - Results are memoized per (DECISION node, scope version): re-deciding while the
+      scope is unchanged (e.g. a loop whose body publishes nothing) skips evaluation.
+      DECISIONs with a guard registered `pure=False` are evaluated every time.
+    - Node ids key the memo, so use one evaluator per run.
+    """
+
+    def __init__(self, registry: Optional[GuardRegistry] = None, scope: Optional[GuardScope] = None):
+        self.registry = registry or GuardRegistry()
+        self.scope = scope if scope is not None else GuardScope()
+        self.evaluations = 0
+        self.hits = 0
+        self._memo: dict[str, tuple[int, list[str]]] = {}
+        self._plans: dict[str, tuple[DecisionProgram, list[str], list[str]]] = {}
+
+    def decide(self, node: Node, out_edges: Sequence[Edge]) -> list[str]:
+        version = self.scope.version
+        plan = self._plans.get(node.node_id)
+        if plan is None:
+            plan = self._plans[node.node_id] = self._plan(out_edges)
+        program, targets, default = plan
+        memo = self._memo.get(node.node_id)
+        if memo is not None and memo[0] == version and program.pure:
+            self.hits += 1
+            return memo[1]
+        self.evaluations += 1
+        try:
+            pos = program.evaluate(self.scope) if targets else -1
+        except Exception as exc:
+            raise GuardError(self._describe(node, program, exc)) from exc
+        if pos >= 0:
+            chosen = [targets[pos]]
+        elif default:
+            chosen = default
+        else:
+            raise GuardError(
+                f"DECISION node '{node.node_id}': no guard held and there is no unguarded edge."
+            )
+        self._memo[node.node_id] = (version, chosen)
+        return chosen
+
+    def decide_many(self, decisions: Iterable[tuple[Node, Sequence[Edge]]]) -> dict[str, list[str]]:
+        """
+        Decide several DECISION nodes against the same scope version.
+        """
+        return {node.node_id: self.decide(node, edges) for node, edges in decisions}
+
+    def _plan(self, out_edges: Sequence[Edge]) -> tuple[DecisionProgram, list[str], list[str]]:
+        guarded = [(e.guard, e.dst) for e in out_edges if e.guard is not None]
+        program = self.registry.program([guard for guard, _ in guarded])
+        return program, [dst for _, dst in guarded], [e.dst for e in out_edges if e.guard is None]
+
+    def _describe(self, node: Node, program: DecisionProgram, exc: Exception) -> str:
+        # The fused program does not say which guard raised; retry them one by one.
+        for guard in program.guards:
+            try:
+                self.registry.predicate(guard)(self.scope)
+            except Exception as inner:
+                return f"DECISION node '{node.node_id}': guard {guard!r} failed: {inner!r}."
+        return f"DECISION node '{node.node_id}': guard evaluation failed: {exc!r}."
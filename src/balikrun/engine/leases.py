@@ -0,0 +1,197 @@
+# src/balikrun/engine/leases.py
+from __future__ import annotations
+
+import itertools
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Iterable, Optional
+
+
+class LeaseError(RuntimeError):
+    """
+    Raised when a lease operation refers to a lease that is no longer active
+    (unknown, expired, revoked or already committed).
+    """
+
+
+@dataclass(frozen=True)
+class Lease:
+    """
+    Exclusive, time-limited claim of one worker on one TASK node.
+
+    attempt:
+      1-based execution attempt of node_id this lease belongs to.
+    """
+    lease_id: str
+    node_id: str
+    task_id: str
+    worker_id: str
+    attempt: int
+    granted_at: float
+    expires_at: float
+
+
+class LeaseManager:
+    """
+    Tracks active leases and guarantees at most one commit per node attempt.
+
+    Notes:
+    - `commit()` succeeds only for an active lease; a late result from an expired or
+      revoked lease raises LeaseError instead of double-committing the node.
+    - A node may hold several leases at once (speculative duplicates); the holder
+      releases the others when the first one commits, so the losers' results fail
+      to commit.
+    - Partition affinity: the first grant of a node in a partition (see
+      balikrun.engine.partition) binds the partition to that worker, and `prefer()`
+      ranks a worker's own partitions first (claiming at most one unbound partition
+      per call), so nodes sharing artifacts stay on one machine. A dropped worker's partitions are unbound.
+    - Time comes from `clock` (monotonic by default) so tests can drive expiry.
+    - Not thread-safe: owned by one coordinator loop.
+    """
+
+    def __init__(self, *, ttl: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        if ttl <= 0:
+            raise ValueError("LeaseManager.ttl must be positive.")
+        self.ttl = ttl
+        self._clock = clock
+        self._ids = itertools.count()
+        self._active: dict[str, Lease] = {}
+        self._by_worker: dict[str, dict[str, None]] = {}
+        self._by_node: dict[str, dict[str, None]] = {}
+        self._attempts: dict[str, int] = {}
+        self._owners: dict[int, str] = {}  # partition -> worker_id
+
+    def __len__(self) -> int:
+        return len(self._active)
+
+    def __contains__(self, lease_id: str) -> bool:
+        return lease_id in self._active
+
+    def attempts(self, node_id: str) -> int:
+        return self._attempts.get(node_id, 0)
+
+    def now(self) -> float:
+        return self._clock()
+
+    def grant(self, node_id: str, task_id: str, worker_id: str, *, partition: Optional[int] = None) -> Lease:
+        now = self._clock()
+        attempt = self._attempts.get(node_id, 0) + 1
+        self._attempts[node_id] = attempt
+        lease = Lease(
+            lease_id=f"L{next(self._ids)}",
+            node_id=node_id,
+            task_id=task_id,
+            worker_id=worker_id,
+            attempt=attempt,
+            granted_at=now,
+            expires_at=now + self.ttl,
+        )
+        self._active[lease.lease_id] = lease
+        self._by_worker.setdefault(worker_id, {})[lease.lease_id] = None
+        self._by_node.setdefault(node_id, {})[lease.lease_id] = None
+        if partition is not None:
+            self._owners.setdefault(partition, worker_id)
+        return lease
+
+    def owner(self, partition: int) -> Optional[str]:
+        return self._owners.get(partition)
+
+    def prefer(self, worker_id: str, candidates: Iterable[tuple[str, Optional[int]]], n: int) -> list[str]:
+        """
+        Choose up to `n` node_ids for `worker_id` from (node_id, partition) pairs in
+        queue order: its own partitions first, then unpartitioned nodes and one unbound
+        partition, then other workers' -- so an idle worker still gets work. Other
+        unbound partitions are left for other workers: granting their nodes would bind
+        them all to this one.
+        """
+        own: list[str] = []
+        free: list[str] = []
+        other: list[str] = []
+        claimed: Optional[int] = None
+        for node_id, partition in candidates:
+            owner = None if partition is None else self._owners.get(partition)
+            if owner == worker_id:
+                own.append(node_id)
+                if len(own) == n:
+                    break
+            elif partition is None:
+                free.append(node_id)
+            elif owner is None:
+                if claimed is None:
+                    claimed = partition
+                if partition == claimed:
+                    free.append(node_id)
+            else:
+                other.append(node_id)
+        return (own + free + other)[:n]
+
+    def get(self, lease_id: str) -> Lease:
+        lease = self._active.get(lease_id)
+        if lease is None:
+            raise LeaseError(f"Lease '{lease_id}' is not active.")
+        return lease
+
+    def renew(self, lease_id: str) -> Lease:
+        lease = replace(self.get(lease_id), expires_at=self._clock() + self.ttl)
+        self._active[lease_id] = lease
+        return lease
+
+    def renew_worker(self, worker_id: str) -> None:
+        """
+        Heartbeat: extend every active lease held by `worker_id`.
+        """
+        for lease_id in self._by_worker.get(worker_id, ()):
+            self.renew(lease_id)
+
+    def commit(self, lease_id: str) -> Lease:
+        """
+        Consume an active lease for its result. Raises LeaseError if not active.
+        """
+        return self._drop(self.get(lease_id))
+
+    def release(self, lease_id: str) -> Lease:
+        """
+        Give a lease up without a result (revoked, cancelled or worker lost).
+        """
+        return self._drop(self.get(lease_id))
+
+    def for_worker(self, worker_id: str) -> list[Lease]:
+        return [self._active[i] for i in self._by_worker.get(worker_id, ())]
+
+    def for_node(self, node_id: str) -> list[Lease]:
+        """
+        Active leases on `node_id`: more than one while a speculative duplicate runs.
+        """
+        return [self._active[i] for i in self._by_node.get(node_id, ())]
+
+    def release_worker(self, worker_id: str) -> list[Lease]:
+        """
+        Release every lease held by `worker_id` (e.g., its connection dropped).
+        """
+        self._owners = {p: w for p, w in self._owners.items() if w != worker_id}
+        return [self._drop(lease) for lease in self.for_worker(worker_id)]
+
+    def expire(self, now: Optional[float] = None) -> list[Lease]:
+        """
+        Drop and return leases whose expiry is at or before `now`.
+        """
+        t = self._clock() if now is None else now
+        expired = [lease for lease in self._active.values() if lease.expires_at <= t]
+        return [self._drop(lease) for lease in expired]
+
+    def active(self) -> Iterable[Lease]:
+        return list(self._active.values())
+
+    def _drop(self, lease: Lease) -> Lease:
+        del self._active[lease.lease_id]
+        held = self._by_worker.get(lease.worker_id)
+        if held is not None:
+            held.pop(lease.lease_id, None)
+            if not held:
+                del self._by_worker[lease.worker_id]
+        on_node = self._by_node.get(lease.node_id)
+        if on_node is not None:
+            on_node.pop(lease.lease_id, None)
+            if not on_node:
+                del self._by_node[lease.node_id]
+        return lease
@@ -0,0 +1,126 @@
+# src/balikrun/engine/migration.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+from balikrun.diff import GraphDiff, diff_graph_ir
+from balikrun.engine.scheduler import (
+    IN_FLIGHT_STATES,
+    GraphIndex,
+    NodeState,
+    ready_nodes,
+)
+from balikrun.ir import GraphIR
+
+
+@dataclass(frozen=True)
+class MigrationPlan:
+    """
+    How a live run moves from one GraphIR version to another.
+
+    states:
+      Node states on the new graph. Every new node_id has an entry.
+
+    carried:
+      node_ids whose state (COMPLETED, FAILED, SKIPPED, ...) is kept as-is.
+
+    retained_in_flight:
+      In-flight (LEASED/RUNNING) node_ids whose leases stay valid on the new graph.
+
+    invalidated:
+      node_ids that had a non-PENDING state on the old graph but are reset to PENDING
+      because they, an incoming edge, or an upstream node changed.
+
+    cancel:
+      In-flight node_ids the engine must cancel: removed from the graph or invalidated.
+
+    dropped:
+      node_ids removed from the graph (whatever their state).
+
+    ready:
+      Ready node_ids on the new graph given `states`.
+    """
+    graph: GraphIR
+    diff: GraphDiff
+    states: dict[str, NodeState]
+    carried: frozenset[str]
+    retained_in_flight: frozenset[str]
+    invalidated: frozenset[str]
+    cancel: frozenset[str]
+    dropped: frozenset[str]
+    ready: list[str]
+
+
+def invalidation_roots(diff: GraphDiff, new: GraphIR) -> set[str]:
+    """
+    New-graph node_ids whose own definition or inputs changed.
+
+    A node's inputs change when any incoming edge was added, removed or changed.
+    """
+    roots = set(diff.added_nodes) | diff.changed_nodes
+    for _, dst, _ in diff.added_edges | diff.removed_edges | diff.changed_edges:
+        roots.add(dst)
+    present = {n.node_id for n in new.nodes}
+    return roots & present
+
+
+def plan_migration(
+    old: GraphIR,
+    new: GraphIR,
+    states: Mapping[str, NodeState],
+    *,
+    diff: Optional[GraphDiff] = None,
+    new_index: Optional[GraphIndex] = None,
+) -> MigrationPlan:
+    """
+    Map a run's node states from `old` onto `new`.
+
+    Nodes are matched by node_id, so compile with `CompileOptions.preserve_spec_node_ids`
+    and give TaskReferences explicit node_ids: those are the ids that survive edits.
+    Everything reachable from an invalidation root (see `invalidation_roots`) is reset
+    to PENDING; the rest keeps its state, so only new or invalidated work is scheduled.
+    """
+    d = diff if diff is not None else diff_graph_ir(old, new)
+    gi = new_index if new_index is not None else GraphIndex.from_graph(new)
+
+    stale = gi.descendants(invalidation_roots(d, new))
+
+    new_states: dict[str, NodeState] = {}
+    carried: set[str] = set()
+    retained: set[str] = set()
+    invalidated: set[str] = set()
+    cancel: set[str] = set()
+
+    for node_id in gi.node_ids:
+        prior = states.get(node_id, NodeState.PENDING)
+        if prior == NodeState.PENDING:
+            new_states[node_id] = NodeState.PENDING
+        elif node_id in stale:
+            new_states[node_id] = NodeState.PENDING
+            invalidated.add(node_id)
+            if prior in IN_FLIGHT_STATES:
+                cancel.add(node_id)
+        else:
+            new_states[node_id] = prior
+            if prior in IN_FLIGHT_STATES:
+                retained.add(node_id)
+            else:
+                carried.add(node_id)
+
+    dropped = set(d.removed_nodes)
+    for node_id in dropped:
+        if states.get(node_id) in IN_FLIGHT_STATES:
+            cancel.add(node_id)
+
+    return MigrationPlan(
+        graph=new,
+        diff=d,
+        states=new_states,
+        carried=frozenset(carried),
+        retained_in_flight=frozenset(retained),
+        invalidated=frozenset(invalidated),
+        cancel=frozenset(cancel),
+        dropped=frozenset(dropped),
+        ready=ready_nodes(gi, new_states),
+    )
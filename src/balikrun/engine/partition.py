@@ -0,0 +1,202 @@
+# src/balikrun/engine/partition.py
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import Optional
+
+from balikrun.engine.scheduler import GraphIndex
+from balikrun.ir import Edge, GraphIR, Node, NodeKind
+
+# Node.meta key holding a TASK's partition id (an int in [0, k)).
+PARTITION_KEY = "partition"
+
+# Edge.meta key holding the expected size in bytes of what flows along the edge.
+ARTIFACT_BYTES_KEY = "artifact_bytes"
+
+# Weight of an edge without an artifact size: a cut still costs a little, so ties
+# break towards fewer cut edges.
+DEFAULT_EDGE_WEIGHT = 1.0
+
+
+def edge_weight(edge: Edge) -> float:
+    return float(edge.meta.get(ARTIFACT_BYTES_KEY, DEFAULT_EDGE_WEIGHT))
+
+
+def node_weight(node: Node) -> float:
+    """
+    Balance weight: a TASK's `meta["cost"]` (default 1); control nodes are free.
+    """
+    if node.kind != NodeKind.TASK:
+        return 0.0
+    return float(node.meta.get("cost", 1.0))
+
+
+def node_partition(node: Node) -> Optional[int]:
+    value = node.meta.get(PARTITION_KEY)
+    return None if value is None else int(value)
+
+
+@dataclass(frozen=True)
+class Partitioning:
+    """
+    Result of partition_graph().
+
+    parts:
+      Partition of each node, by GraphIndex integer index.
+
+    loads:
+      Total node weight per partition.
+
+    cut:
+      Total weight of edges whose endpoints are in different partitions.
+    """
+    k: int
+    parts: tuple[int, ...]
+    loads: tuple[float, ...]
+    cut: float
+
+
+def partition_graph(
+    graph: GraphIR,
+    k: int,
+    *,
+    imbalance: float = 0.05,
+    passes: int = 8,
+    index: Optional[GraphIndex] = None,
+) -> Partitioning:
+    """
+    Split `graph` into `k` parts of balanced node weight, minimizing the weight of
+    cut edges.
+
+    Notes:
+    - Seed: greedy graph growing. Each part starts at the first unassigned node in
+      DFS topological order from ENTRY and repeatedly absorbs the unassigned node
+      most strongly connected to it, until it holds total / k weight; the last part
+      takes the rest. Heavy hand-offs are absorbed before light cross-links, so a
+      pipeline (chain of TASKs) stays whole. O((nodes + edges) log nodes).
+    - Refinement: up to `passes` sweeps moving each node to the neighbouring part
+      it is most strongly connected to, if that lowers the cut (or keeps it and
+      evens out loads) without exceeding (1 + imbalance) * total / k.
+      Each sweep is O(nodes + edges).
+    """
+    if k < 1:
+        raise ValueError("partition_graph: k must be at least 1.")
+    if imbalance < 0:
+        raise ValueError("partition_graph: imbalance must be non-negative.")
+    gi = index or GraphIndex.from_graph(graph)
+    n = len(gi)
+    weights = [node_weight(node) for node in graph.nodes]
+    adj: list[dict[int, float]] = [{} for _ in range(n)]
+    for e in graph.edges:
+        s, d = gi.index[e.src], gi.index[e.dst]
+        if s != d:
+            w = edge_weight(e)
+            adj[s][d] = adj[s].get(d, 0.0) + w
+            adj[d][s] = adj[d].get(s, 0.0) + w
+
+    order = _dfs_order(gi)
+    rank = [0] * n
+    for r, i in enumerate(order):
+        rank[i] = r
+    total = sum(weights)
+    target = total / k
+    parts = [-1] * n
+    loads = [0.0] * k
+    nxt = 0  # position in `order` of the next candidate seed
+    for p in range(k - 1):
+        heap: list[tuple[float, int, int]] = []
+        conn: dict[int, float] = {}
+        while loads[p] < target:
+            i = -1
+            while heap:
+                negw, _, j = heapq.heappop(heap)
+                if parts[j] < 0 and conn[j] == -negw:
+                    i = j
+                    break
+            if i < 0:
+                while nxt < n and parts[order[nxt]] >= 0:
+                    nxt += 1
+                if nxt == n:
+                    break
+                i = order[nxt]
+            parts[i] = p
+            loads[p] += weights[i]
+            for j, w in adj[i].items():
+                if parts[j] < 0:
+                    conn[j] = conn.get(j, 0.0) + w
+                    heapq.heappush(heap, (-conn[j], rank[j], j))
+    for i in range(n):
+        if parts[i] < 0:
+            parts[i] = k - 1
+            loads[k - 1] += weights[i]
+
+    cap = max((1.0 + imbalance) * target, max(weights, default=0.0))
+    for _ in range(passes):
+        moved = 0
+        for i in order:
+            p = parts[i]
+            by_part: dict[int, float] = {}
+            for j, w in adj[i].items():
+                by_part[parts[j]] = by_part.get(parts[j], 0.0) + w
+            here = by_part.get(p, 0.0)
+            wi = weights[i]
+            best, best_key = p, (0.0, 0.0)
+            for q, c in by_part.items():
+                if q == p or loads[q] + wi > cap:
+                    continue
+                key = (c - here, loads[p] - (loads[q] + wi))
+                if key[0] > 0 or (key[0] == 0 and key[1] > 0):
+                    if key > best_key:
+                        best, best_key = q, key
+            if best != p:
+                parts[i] = best
+                loads[p] -= wi
+                loads[best] += wi
+                moved += 1
+        if not moved:
+            break
+
+    cut = sum(w for i in range(n) for j, w in adj[i].items() if i < j and parts[i] != parts[j])
+    return Partitioning(k=k, parts=tuple(parts), loads=tuple(loads), cut=cut)
+
+
+def assign_partitions(graph: GraphIR, k: int, **kwargs) -> GraphIR:
+    """
+    Copy of `graph` with each TASK's partition id in `meta["partition"]` (see
+    partition_graph for the options).
+    """
+    result = partition_graph(graph, k, **kwargs)
+    nodes = [
+        node.model_copy(update={"meta": {**node.meta, PARTITION_KEY: p}}) if node.kind == NodeKind.TASK else node
+        for node, p in zip(graph.nodes, result.parts)
+    ]
+    return graph.model_copy(update={"nodes": nodes})
+
+
+def _dfs_order(gi: GraphIndex) -> list[int]:
+    """
+    Reverse DFS postorder from ENTRY (a topological order once back-edges are
+    ignored), followed by any nodes ENTRY does not reach.
+    """
+    n = len(gi)
+    seen = [False] * n
+    order: list[int] = []
+    for root in (gi.index[gi.graph.entry_id], *range(n)):
+        if seen[root]:
+            continue
+        seen[root] = True
+        post: list[int] = []
+        stack = [(root, iter(gi.succ[root]))]
+        while stack:
+            i, it = stack[-1]
+            for j in it:
+                if not seen[j]:
+                    seen[j] = True
+                    stack.append((j, iter(gi.succ[j])))
+                    break
+            else:
+                stack.pop()
+                post.append(i)
+        order.extend(reversed(post))
+    return order
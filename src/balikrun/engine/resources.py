@@ -0,0 +1,230 @@
+# src/balikrun/engine/resources.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping, Optional, Sequence, Union
+
+from balikrun.ir import Node
+
+# Order of the components of a ResourceVector.
+RESOURCE_DIMENSIONS: tuple[str, ...] = ("cpu", "memory_mb", "gpu")
+
+ResourceVector = tuple[float, ...]
+
+# What a TASK without a `resources` annotation is assumed to need.
+DEFAULT_REQUEST: ResourceVector = (1.0, 0.0, 0.0)
+
+ResourceLike = Union[ResourceVector, Mapping[str, Any]]
+
+
+def resource_vector(value: Optional[ResourceLike], *, default: ResourceVector = DEFAULT_REQUEST) -> ResourceVector:
+    """
+    Normalize a mapping ({"cpu": 2, "memory_mb": 4096}) or a vector to a ResourceVector.
+
+    Missing dimensions of a mapping are 0; `None` yields `default`.
+    """
+    if value is None:
+        return default
+    if isinstance(value, Mapping):
+        unknown = set(value) - set(RESOURCE_DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown resource dimensions: {sorted(unknown)}.")
+        vec = tuple(float(value.get(d) or 0.0) for d in RESOURCE_DIMENSIONS)
+    else:
+        vec = tuple(float(x) for x in value)
+        if len(vec) != len(RESOURCE_DIMENSIONS):
+            raise ValueError(f"Resource vectors have {len(RESOURCE_DIMENSIONS)} components.")
+    if any(x < 0 for x in vec):
+        raise ValueError("Resource values must be non-negative.")
+    return vec
+
+
+def node_resources(node: Node) -> ResourceVector:
+    """
+    Requirements of a TASK node, from `node.meta["resources"]` (see TaskResources).
+    """
+    return resource_vector(node.meta.get("resources"))
+
+
+def fits(request: Sequence[float], free: Sequence[float]) -> bool:
+    return all(r <= f for r, f in zip(request, free))
+
+
+@dataclass
+class Placement:
+    """
+    Result of ResourcePacker.place().
+
+    assignments:
+      worker_id -> node_ids placed on it (already allocated), in placement order.
+
+    deferred:
+      Fit some worker's total capacity but not its current free capacity; retry later.
+
+    unplaceable:
+      Exceed the total capacity of every known worker.
+    """
+    assignments: dict[str, list[str]] = field(default_factory=dict)
+    deferred: list[str] = field(default_factory=list)
+    unplaceable: list[str] = field(default_factory=list)
+
+    @property
+    def placed(self) -> int:
+        return sum(len(v) for v in self.assignments.values())
+
+
+class ResourcePacker:
+    """
+    Multi-dimensional bin packing of ready tasks onto workers' free capacity.
+
+    Notes:
+    - Largest first: tasks are placed in decreasing order of dominant share (their
+      largest demand relative to the biggest worker in that dimension), so big tasks
+      are not starved by a stream of small ones.
+    - Best alignment: each task goes to the fitting worker maximizing the dot product
+      of its normalized demand and the worker's normalized free capacity (the "Tetris"
+      heuristic), minus the free capacity it would strand in dimensions it does not
+      use. Memory-heavy tasks go where memory is left, cpu-heavy tasks where cores are
+      left, and gpu boxes are kept for gpu tasks.
+    - One call is O(T log T + T * W * D) for T tasks, W workers and D dimensions.
+    - Not thread-safe: owned by one scheduler loop.
+    """
+
+    def __init__(self, workers: Optional[Mapping[str, ResourceLike]] = None):
+        self._capacity: dict[str, ResourceVector] = {}
+        self._free: dict[str, list[float]] = {}
+        self._scale: ResourceVector = (1.0,) * len(RESOURCE_DIMENSIONS)
+        for worker_id, capacity in (workers or {}).items():
+            self.add_worker(worker_id, capacity)
+
+    def __contains__(self, worker_id: str) -> bool:
+        return worker_id in self._capacity
+
+    def __len__(self) -> int:
+        return len(self._capacity)
+
+    def add_worker(self, worker_id: str, capacity: ResourceLike) -> None:
+        vec = resource_vector(capacity)
+        self._capacity[worker_id] = vec
+        self._free[worker_id] = list(vec)
+        self._rescale()
+
+    def remove_worker(self, worker_id: str) -> None:
+        self._capacity.pop(worker_id, None)
+        self._free.pop(worker_id, None)
+        self._rescale()
+
+    def capacity(self, worker_id: str) -> ResourceVector:
+        return self._capacity[worker_id]
+
+    def free(self, worker_id: str) -> ResourceVector:
+        return tuple(self._free[worker_id])
+
+    def allocate(self, worker_id: str, request: Sequence[float]) -> None:
+        free = self._free[worker_id]
+        if not fits(request, free):
+            raise ValueError(f"Request {tuple(request)} does not fit worker '{worker_id}' ({tuple(free)}).")
+        for i, r in enumerate(request):
+            free[i] -= r
+
+    def release(self, worker_id: str, request: Sequence[float]) -> None:
+        free = self._free.get(worker_id)
+        if free is None:
+            return  # worker already removed
+        cap = self._capacity[worker_id]
+        for i, r in enumerate(request):
+            free[i] = min(cap[i], free[i] + r)
+
+    def utilization(self) -> ResourceVector:
+        """
+        Allocated fraction of the cluster's total capacity, per dimension.
+        """
+        out = []
+        for i in range(len(RESOURCE_DIMENSIONS)):
+            total = sum(c[i] for c in self._capacity.values())
+            used = total - sum(f[i] for f in self._free.values())
+            out.append(used / total if total > 0 else 0.0)
+        return tuple(out)
+
+    def dominant_share(self, request: Sequence[float]) -> float:
+        return max((r / s for r, s in zip(request, self._scale)), default=0.0)
+
+    def place(
+        self,
+        tasks: Iterable[tuple[str, Sequence[float]]],
+        *,
+        workers: Optional[Iterable[str]] = None,
+        limits: Optional[Mapping[str, int]] = None,
+    ) -> Placement:
+        """
+        Place (node_id, request) pairs onto `workers` (default: all) and allocate them.
+
+        limits:
+          Optional maximum number of tasks per worker in this call (e.g., lease credit).
+        """
+        candidates = [w for w in (self._capacity if workers is None else workers) if w in self._capacity]
+        remaining = {w: (limits or {}).get(w, -1) for w in candidates}
+        open_slots = sum(1 for r in remaining.values() if r != 0)
+        # Work per distinct request shape: real workloads have few, and free capacity
+        # only shrinks during one call, so a shape that found no worker stays unplaced.
+        shares: dict[tuple[float, ...], float] = {}
+        items = []
+        for node_id, request in tasks:
+            shape = tuple(request)
+            share = shares.get(shape)
+            if share is None:
+                share = shares[shape] = self.dominant_share(shape)
+            items.append((node_id, shape, share))
+        items.sort(key=lambda t: -t[2])
+        failed: dict[tuple[float, ...], bool] = {}  # shape -> fits some worker's total capacity
+        out = Placement()
+        for k, (node_id, shape, _) in enumerate(items):
+            if open_slots == 0 or len(failed) == len(shares):
+                # Every worker is at its limit, or every shape has already failed.
+                for nid, rest_shape, _ in items[k:]:
+                    (out.deferred if failed.get(rest_shape, True) else out.unplaceable).append(nid)
+                break
+            placeable = failed.get(shape)
+            best = None if placeable is not None else self._best_worker(shape, candidates, remaining)
+            if best is None:
+                if placeable is None:
+                    placeable = failed[shape] = any(fits(shape, c) for c in self._capacity.values())
+                (out.deferred if placeable else out.unplaceable).append(node_id)
+                continue
+            self.allocate(best, shape)
+            remaining[best] -= 1
+            if remaining[best] == 0:
+                open_slots -= 1
+            out.assignments.setdefault(best, []).append(node_id)
+        return out
+
+    def _best_worker(
+        self, request: ResourceVector, candidates: Sequence[str], remaining: Mapping[str, int]
+    ) -> Optional[str]:
+        # Score = alignment of demand with free capacity, minus the free capacity of
+        # dimensions the task does not use (placing a cpu-only task on a gpu box
+        # strands its gpus).
+        scale = self._scale
+        best: Optional[str] = None
+        best_score = float("-inf")
+        for w in candidates:
+            if remaining[w] == 0:
+                continue
+            free = self._free[w]
+            if not fits(request, free):
+                continue
+            score = 0.0
+            for r, f, s in zip(request, free, scale):
+                score += (r / s) * (f / s) if r > 0 else -(f / s)
+            if score > best_score:
+                best, best_score = w, score
+        return best
+
+    def _rescale(self) -> None:
+        # Normalize each dimension by the largest single worker; dimensions nobody has
+        # keep a unit scale so zero demands do not divide by zero.
+        scale = []
+        for i in range(len(RESOURCE_DIMENSIONS)):
+            biggest = max((c[i] for c in self._capacity.values()), default=0.0)
+            scale.append(biggest if biggest > 0 else 1.0)
+        self._scale = tuple(scale)
@@ -0,0 +1,130 @@
+# src/balikrun/engine/retries.py
+from __future__ import annotations
+
+import bisect
+import math
+import random
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Mapping, Optional
+
+from balikrun.ir import Node
+from balikrun.specification import TaskRetry
+
+
+def _spec_default(name: str) -> Any:
+    return TaskRetry.model_fields[name].default
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Engine-side form of TaskRetry (see balikrun.specification), read from a TASK
+    node's `meta["retry"]`. Defaults and validation are TaskRetry's, so a hand-written
+    `meta["retry"]` and a compiled spec mean the same thing.
+
+    The delay before retry k (k = 1 after the first failure) is
+    min(max_backoff, backoff * multiplier ** (k - 1)), of which a `jitter` fraction
+    is drawn uniformly at random.
+    """
+    max_attempts: int = _spec_default("max_attempts")
+    backoff: float = _spec_default("backoff")
+    multiplier: float = _spec_default("multiplier")
+    max_backoff: float = _spec_default("max_backoff")
+    jitter: float = _spec_default("jitter")
+
+    def __post_init__(self) -> None:
+        TaskRetry.model_validate(asdict(self))
+
+    @classmethod
+    def from_meta(cls, meta: Optional[Mapping[str, Any]]) -> Optional["RetryPolicy"]:
+        """
+        Policy for `meta["retry"]` (None when absent). Raises ValueError for unknown
+        keys or invalid values.
+        """
+        if meta is None:
+            return None
+        return cls(**TaskRetry.model_validate(meta).model_dump())
+
+    def delay(self, failures: int, rng: random.Random) -> float:
+        """
+        Seconds to wait after the `failures`-th failed execution.
+        """
+        base = min(self.max_backoff, self.backoff * self.multiplier ** max(0, failures - 1))
+        return base * (1.0 - self.jitter * rng.random())
+
+
+def node_retry_policy(node: Node, default: Optional[RetryPolicy] = None) -> Optional[RetryPolicy]:
+    return RetryPolicy.from_meta(node.meta.get("retry")) or default
+
+
+@dataclass(frozen=True)
+class SpeculationPolicy:
+    """
+    When to launch a duplicate of a straggling TASK.
+
+    An execution is a straggler once it has been running for longer than `multiplier`
+    times the `percentile` of its task_id's observed runtimes, given at least
+    `min_samples` observations. Each node gets at most `max_copies` duplicates;
+    duplicates only go to workers that would otherwise idle.
+    """
+    percentile: float = 0.95
+    multiplier: float = 1.5
+    min_samples: int = 20
+    max_copies: int = 1
+
+    def __post_init__(self) -> None:
+        if not 0 < self.percentile <= 1:
+            raise ValueError("SpeculationPolicy.percentile must be in (0, 1].")
+        if self.multiplier <= 0 or self.min_samples < 1 or self.max_copies < 1:
+            raise ValueError("SpeculationPolicy multiplier, min_samples and max_copies must be positive.")
+
+
+class RuntimeStats:
+    """
+    Sliding window of observed runtimes per task_id, with percentile queries.
+
+    Each task_id keeps its last `window` samples in arrival order and in sorted order,
+    so a sample costs O(log w + w) (a memmove) and a percentile O(1).
+    """
+
+    def __init__(self, *, window: int = 1000):
+        if window < 1:
+            raise ValueError("RuntimeStats.window must be positive.")
+        self.window = window
+        self._recent: dict[str, deque[float]] = {}
+        self._sorted: dict[str, list[float]] = {}
+
+    def count(self, task_id: str) -> int:
+        return len(self._sorted.get(task_id, ()))
+
+    def record(self, task_id: str, seconds: float) -> None:
+        recent = self._recent.get(task_id)
+        if recent is None:
+            recent = self._recent[task_id] = deque()
+            self._sorted[task_id] = []
+        ordered = self._sorted[task_id]
+        if len(recent) == self.window:
+            old = recent.popleft()
+            del ordered[bisect.bisect_left(ordered, old)]
+        recent.append(seconds)
+        bisect.insort(ordered, seconds)
+
+    def percentile(self, task_id: str, q: float) -> Optional[float]:
+        """
+        Nearest-rank q-quantile (0 < q <= 1) of task_id's runtimes, or None if unseen.
+        """
+        ordered = self._sorted.get(task_id)
+        if not ordered:
+            return None
+        return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+    def threshold(self, task_id: str, policy: SpeculationPolicy) -> Optional[float]:
+        """
+        Runtime past which an execution of task_id is a straggler, or None if there
+        are too few observations to tell.
+        """
+        if self.count(task_id) < policy.min_samples:
+            return None
+        p = self.percentile(task_id, policy.percentile)
+        return None if p is None else p * policy.multiplier
@@ -0,0 +1,77 @@
+# src/balikrun/engine/runs.py
+from __future__ import annotations
+
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional
+
+from balikrun.compile import CompileCache, CompileOptions
+from balikrun.engine.events import EventLog, EventType
+from balikrun.engine.views import RunStateView
+from balikrun.ir import GraphIR
+from balikrun.specification import Block
+
+
+@dataclass(frozen=True)
+class Run:
+    """
+    A submitted run: one execution of a compiled GraphIR.
+    """
+    run_id: str
+    graph: GraphIR
+    spec_digest: str
+
+
+@dataclass
+class RunRegistry:
+    """
+    Owns the runs of one engine process and the structures derived from them.
+
+    Submission compiles through `cache`, registers the run with `view` and appends
+    RUN_CREATED to `log`. The view is attached to the log at construction, so every
+    later append (from workers, the scheduler, ...) keeps status current.
+    """
+    log: EventLog = field(default_factory=EventLog)
+    cache: CompileCache = field(default_factory=CompileCache)
+    view: RunStateView = field(default_factory=RunStateView)
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+        self._runs: dict[str, Run] = {}
+        self.view.attach(self.log)
+
+    def __contains__(self, run_id: str) -> bool:
+        return run_id in self._runs
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def submit(
+        self,
+        spec: Block,
+        *,
+        options: Optional[CompileOptions] = None,
+        run_id: Optional[str] = None,
+    ) -> Run:
+        """
+        Compile `spec` (through the cache) and create a run for it.
+
+        Raises NotImplementedError if the spec uses blocks the compiler does not support.
+        """
+        digest, graph = self.cache.compile_keyed(spec, options=options)
+        run = Run(run_id=run_id or uuid.uuid4().hex, graph=graph, spec_digest=digest)
+        with self._lock:
+            if run.run_id in self._runs:
+                raise ValueError(f"Run '{run.run_id}' already exists.")
+            self._runs[run.run_id] = run
+        self.view.register(run.run_id, graph)
+        self.log.append(
+            run.run_id,
+            EventType.RUN_CREATED,
+            data={"graph_id": graph.graph_id, "spec_digest": digest},
+        )
+        return run
+
+    def get(self, run_id: str) -> Optional[Run]:
+        return self._runs.get(run_id)
@@ -0,0 +1,467 @@
+# src/balikrun/engine/scheduler.py
+from __future__ import annotations
+
+import gc
+import itertools
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Iterable, Iterator, Mapping, Optional, Sequence
+
+from balikrun.ir import Edge, GraphIR, Node, NodeKind
+from balikrun.specification import JoinMode
+
+
+class NodeState(str, Enum):
+    """
+    Execution state of one GraphIR node within a run.
+    """
+    PENDING = "PENDING"
+    LEASED = "LEASED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+    SKIPPED = "SKIPPED"
+    CANCELLED = "CANCELLED"
+
+
+# States in which a worker currently holds the node.
+IN_FLIGHT_STATES = frozenset({NodeState.LEASED, NodeState.RUNNING})
+
+# States that satisfy an AND-join predecessor.
+SATISFIED_STATES = frozenset({NodeState.COMPLETED, NodeState.SKIPPED})
+
+# States from which the node will not run again without an explicit reset.
+TERMINAL_STATES = frozenset(
+    {NodeState.COMPLETED, NodeState.FAILED, NodeState.SKIPPED, NodeState.CANCELLED}
+)
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """
+    Suspend the cyclic garbage collector while building large acyclic structures.
+
+    Allocating millions of tuples/lists next to a large GraphIR triggers repeated
+    full collections that scan every model object, which can double build times.
+    Re-entrant: the collector is re-enabled only if it was enabled on entry.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def node_join_mode(node: Node) -> JoinMode:
+    """
+    Readiness policy of a node.
+
+    AND: every predecessor must be satisfied (COMPLETED or SKIPPED).
+    OR: one COMPLETED predecessor is enough.
+
+    MERGE nodes close exclusive regions (choices, loop headers) and are OR by
+    construction. JOIN nodes default to AND; an OR-join is recorded as
+    `Node.meta["join"] == "OR"`. All other kinds are AND.
+    """
+    if node.kind == NodeKind.MERGE:
+        return JoinMode.OR
+    if node.kind == NodeKind.JOIN and str(node.meta.get("join", "AND")).upper() == "OR":
+        return JoinMode.OR
+    return JoinMode.AND
+
+
+@dataclass(frozen=True)
+class GraphIndex:
+    """
+    Integer-indexed adjacency of a GraphIR, built once per graph version.
+
+    node_ids[i] is the node_id of integer index i (GraphIR.nodes order); succ/pred hold
+    the integer indices of successors/predecessors. Edge multiplicity (different labels
+    between the same pair) is collapsed: readiness only depends on which nodes connect.
+    """
+    graph: GraphIR
+    node_ids: tuple[str, ...]
+    index: Mapping[str, int]
+    succ: tuple[tuple[int, ...], ...]
+    pred: tuple[tuple[int, ...], ...]
+    join_modes: tuple[JoinMode, ...]
+
+    @classmethod
+    def from_graph(cls, g: GraphIR) -> "GraphIndex":
+        with gc_paused():
+            node_ids = tuple(n.node_id for n in g.nodes)
+            index = {node_id: i for i, node_id in enumerate(node_ids)}
+            succ: list[list[int]] = [[] for _ in node_ids]
+            pred: list[list[int]] = [[] for _ in node_ids]
+            for e in g.edges:
+                s = index[e.src]
+                d = index[e.dst]
+                succ[s].append(d)
+                pred[d].append(s)
+            joins = (NodeKind.MERGE, NodeKind.JOIN)
+            return cls(
+                graph=g,
+                node_ids=node_ids,
+                index=index,
+                succ=tuple(_unique(s) for s in succ),
+                pred=tuple(_unique(p) for p in pred),
+                join_modes=tuple(
+                    node_join_mode(n) if n.kind in joins else JoinMode.AND for n in g.nodes
+                ),
+            )
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def node(self, node_id: str) -> Node:
+        return self.graph.nodes[self.index[node_id]]
+
+    def successors(self, node_id: str) -> list[str]:
+        return [self.node_ids[j] for j in self.succ[self.index[node_id]]]
+
+    def predecessors(self, node_id: str) -> list[str]:
+        return [self.node_ids[j] for j in self.pred[self.index[node_id]]]
+
+    def descendants(self, node_ids: Iterable[str]) -> set[str]:
+        """
+        All node_ids reachable from `node_ids` (inclusive), following edges forward.
+        """
+        seen: set[int] = set()
+        stack = [self.index[n] for n in node_ids]
+        while stack:
+            i = stack.pop()
+            if i in seen:
+                continue
+            seen.add(i)
+            stack.extend(self.succ[i])
+        return {self.node_ids[i] for i in seen}
+
+    def back_edges(self) -> set[tuple[int, int]]:
+        """
+        Loop back-edges as (src, dst) integer indices: edges into a node on the
+        current DFS path from ENTRY. Iterative, O(nodes + edges).
+        """
+        succ = self.succ
+        back: set[tuple[int, int]] = set()
+        on_path = bytearray(len(self.node_ids))
+        seen = bytearray(len(self.node_ids))
+        entry = self.index[self.graph.entry_id]
+        seen[entry] = on_path[entry] = 1
+        path = [entry]
+        iters = [iter(succ[entry])]
+        while iters:
+            v = next(iters[-1], -1)
+            if v < 0:
+                on_path[path.pop()] = 0
+                iters.pop()
+            elif on_path[v]:
+                back.add((path[-1], v))
+            elif not seen[v]:
+                seen[v] = on_path[v] = 1
+                path.append(v)
+                iters.append(iter(succ[v]))
+        return back
+
+    def loop_body(self, src: int, head: int) -> set[int]:
+        """
+        Natural loop of the back-edge src -> head (integer indices): the head plus
+        every node that reaches `src` without passing through the head. O(body).
+        """
+        pred = self.pred
+        seen = {head}
+        stack = [src]
+        while stack:
+            i = stack.pop()
+            if i in seen:
+                continue
+            seen.add(i)
+            stack.extend(pred[i])
+        return seen
+
+
+def _unique(ids: list[int]) -> tuple[int, ...]:
+    # Order-preserving de-duplication; only multi-edges (several labels) need it.
+    return tuple(dict.fromkeys(ids)) if len(ids) > 1 else tuple(ids)
+
+
+def is_ready(gi: GraphIndex, states: Mapping[str, NodeState], node_id: str) -> bool:
+    """
+    True if `node_id` is PENDING and its predecessors satisfy its join mode.
+
+    Nodes absent from `states` are treated as PENDING.
+    """
+    i = gi.index[node_id]
+    if states.get(node_id, NodeState.PENDING) != NodeState.PENDING:
+        return False
+    preds = gi.pred[i]
+    if not preds:
+        return True
+    ids = gi.node_ids
+    if gi.join_modes[i] == JoinMode.OR:
+        return any(states.get(ids[j]) == NodeState.COMPLETED for j in preds)
+    return all(states.get(ids[j]) in SATISFIED_STATES for j in preds)
+
+
+def ready_nodes(gi: GraphIndex, states: Mapping[str, NodeState]) -> list[str]:
+    """
+    All ready node_ids, in GraphIR.nodes order.
+    """
+    return [node_id for node_id in gi.node_ids if is_ready(gi, states, node_id)]
+
+
+Decide = Callable[[Node, Sequence[Edge]], Iterable[str]]
+StateListener = Callable[[str, NodeState], None]
+
+
+def take_unguarded(node: Node, out_edges: Sequence[Edge]) -> list[str]:
+    """
+    Default DECISION policy: follow the edges that carry no guard.
+
+    Raises ValueError if every out-edge is guarded; plug a guard evaluator into
+    Frontier(decide=...) for such graphs (see balikrun.engine.guards.GuardEvaluator).
+    """
+    chosen = [e.dst for e in out_edges if e.guard is None]
+    if not chosen:
+        raise ValueError(
+            f"DECISION node '{node.node_id}' has only guarded edges and no guard evaluator."
+        )
+    return chosen
+
+
+class Frontier:
+    """
+    Drives one run over a GraphIndex: tracks node states and hands out ready TASKs.
+
+    Control nodes (ENTRY, EXIT, FORK, JOIN, MERGE, DECISION) never reach a worker;
+    they complete as soon as they are ready. DECISION nodes complete by calling
+    `decide(node, out_edges)` for the successors to activate; the others are SKIPPED,
+    and skipping propagates to nodes all of whose predecessors were skipped.
+    Choosing an already-visited successor (a loop back-edge) resets the loop body --
+    nodes reachable from the target that can reach the DECISION -- to PENDING.
+
+    `on_state(node_id, state)` is called for every transition (e.g., to append events).
+    """
+
+    def __init__(
+        self,
+        gi: GraphIndex,
+        *,
+        decide: Optional[Decide] = None,
+        on_state: Optional[StateListener] = None,
+    ):
+        self.gi = gi
+        self.states: dict[str, NodeState] = {}
+        self.activations: dict[str, int] = {}
+        self._decide = decide or take_unguarded
+        self._on_state = on_state
+        self._ready: deque[str] = deque()
+        self._queued: set[str] = set()
+        self._in_flight: set[str] = set()
+        self._deferred: set[str] = set()
+        self._out_edges: Optional[dict[str, list[Edge]]] = None
+        self._failures = 0  # nodes currently FAILED
+
+    @property
+    def ready_count(self) -> int:
+        return len(self._ready)
+
+    @property
+    def in_flight(self) -> frozenset[str]:
+        return frozenset(self._in_flight)
+
+    @property
+    def done(self) -> bool:
+        return self.states.get(self.gi.graph.exit_id) == NodeState.COMPLETED
+
+    @property
+    def failed(self) -> bool:
+        return self._failures > 0
+
+    @property
+    def stalled(self) -> bool:
+        """
+        True if nothing is ready, in flight or deferred but the run has not reached EXIT.
+        """
+        return not self.done and not self._ready and not self._in_flight and not self._deferred
+
+    def start(self) -> None:
+        self._activate(self.gi.graph.entry_id)
+
+    def take(self, n: int) -> list[str]:
+        """
+        Pop up to `n` ready TASK node_ids (FIFO) and mark them LEASED.
+        """
+        out: list[str] = []
+        while self._ready and len(out) < n:
+            node_id = self._ready.popleft()
+            self._queued.discard(node_id)
+            self._in_flight.add(node_id)
+            self._set(node_id, NodeState.LEASED)
+            out.append(node_id)
+        return out
+
+    def peek(self, n: Optional[int] = None) -> list[str]:
+        """
+        Ready TASK node_ids in queue order (up to `n`), without taking them.
+        """
+        if n is None:
+            return list(self._ready)
+        return list(itertools.islice(self._ready, n))
+
+    def take_ids(self, node_ids: Iterable[str]) -> list[str]:
+        """
+        Take specific ready nodes (e.g., chosen by a packer from `peek()`) and mark
+        them LEASED; ids that are not ready are ignored. Returns the ids taken.
+        """
+        wanted = {nid for nid in node_ids if nid in self._queued}
+        if not wanted:
+            return []
+        out = [nid for nid in self._ready if nid in wanted]
+        self._ready = deque(nid for nid in self._ready if nid not in wanted)
+        for node_id in out:
+            self._queued.discard(node_id)
+            self._in_flight.add(node_id)
+            self._set(node_id, NodeState.LEASED)
+        return out
+
+    def requeue(self, node_ids: Iterable[str]) -> None:
+        """
+        Return in-flight nodes (revoked or expired leases) or deferred nodes (retry
+        backoff elapsed) to the front of the queue.
+        """
+        for node_id in reversed(list(node_ids)):
+            if node_id in self._in_flight:
+                self._in_flight.discard(node_id)
+                self._set(node_id, NodeState.PENDING)
+            elif node_id in self._deferred:
+                self._deferred.discard(node_id)
+            else:
+                continue
+            self._ready.appendleft(node_id)
+            self._queued.add(node_id)
+
+    def defer(self, node_id: str) -> None:
+        """
+        Record a failed attempt that will be retried: the node goes FAILED, then
+        PENDING without being queued, until `requeue()` after its backoff.
+        """
+        if node_id not in self._in_flight:
+            return
+        self._in_flight.discard(node_id)
+        self._set(node_id, NodeState.FAILED)
+        self._set(node_id, NodeState.PENDING)
+        self._deferred.add(node_id)
+
+    def mark_running(self, node_id: str) -> None:
+        if node_id in self._in_flight:
+            self._set(node_id, NodeState.RUNNING)
+
+    def complete(self, node_id: str) -> None:
+        self._in_flight.discard(node_id)
+        self._set(node_id, NodeState.COMPLETED)
+        self._advance(node_id)
+
+    def fail(self, node_id: str) -> None:
+        self._in_flight.discard(node_id)
+        self._set(node_id, NodeState.FAILED)
+
+    def _set(self, node_id: str, state: NodeState) -> None:
+        prior = self.states.get(node_id)
+        self._failures += (state == NodeState.FAILED) - (prior == NodeState.FAILED)
+        self.states[node_id] = state
+        if self._on_state is not None:
+            self._on_state(node_id, state)
+
+    def _activate(self, node_id: str) -> None:
+        # Iterative to keep long chains of control nodes off the Python stack.
+        stack = [node_id]
+        while stack:
+            nid = stack.pop()
+            if nid in self._queued:
+                continue
+            node = self.gi.node(nid)
+            self.activations[nid] = self.activations.get(nid, 0) + 1
+            if node.kind == NodeKind.TASK:
+                self._ready.append(nid)
+                self._queued.add(nid)
+                continue
+            self._set(nid, NodeState.COMPLETED)
+            stack.extend(reversed(self._next(node)))
+
+    def _advance(self, node_id: str) -> None:
+        for nid in self._next(self.gi.node(node_id)):
+            self._activate(nid)
+
+    def _next(self, node: Node) -> list[str]:
+        """
+        Successors of a just-completed node that become active.
+        """
+        if node.kind == NodeKind.DECISION:
+            return self._decide_successors(node)
+        return [s for s in self.gi.successors(node.node_id) if is_ready(self.gi, self.states, s)]
+
+    def _decide_successors(self, node: Node) -> list[str]:
+        if self._out_edges is None:
+            self._out_edges = {}
+            for e in self.gi.graph.edges:
+                self._out_edges.setdefault(e.src, []).append(e)
+        chosen = list(dict.fromkeys(self._decide(node, self._out_edges.get(node.node_id, []))))
+        activate: list[str] = []
+        looped = False
+        for dst in chosen:
+            if self.states.get(dst, NodeState.PENDING) != NodeState.PENDING:
+                self._reset_loop_body(dst, node.node_id)
+                looped = True
+                activate.append(dst)
+            elif is_ready(self.gi, self.states, dst):
+                activate.append(dst)
+        if not looped:
+            # Going round a loop again leaves the exit branch pending for a later pass.
+            for succ in self.gi.successors(node.node_id):
+                if succ not in chosen:
+                    self._skip(succ, node.node_id)
+        return activate
+
+    def _skip(self, node_id: str, via: str) -> None:
+        """
+        Dead-path elimination: `node_id` lost its edge from `via`; skip it (and
+        onwards) once every predecessor is skipped or is `via` itself.
+        """
+        stack = [(node_id, via)]
+        while stack:
+            nid, dead = stack.pop()
+            if self.states.get(nid, NodeState.PENDING) != NodeState.PENDING:
+                continue
+            preds = self.gi.predecessors(nid)
+            if not all(p == dead or self.states.get(p) == NodeState.SKIPPED for p in preds):
+                # Still reachable via another predecessor; maybe it is ready now.
+                if is_ready(self.gi, self.states, nid):
+                    self._activate(nid)
+                continue
+            self._set(nid, NodeState.SKIPPED)
+            stack.extend((succ, nid) for succ in self.gi.successors(nid))
+
+    def _reset_loop_body(self, target: str, decision: str) -> None:
+        forward = self.gi.descendants([target])
+        backward = self._ancestors(decision)
+        for nid in forward & backward:
+            prior = self.states.pop(nid, None)
+            if prior == NodeState.FAILED:
+                self._failures -= 1
+            if prior is not None and self._on_state is not None:
+                self._on_state(nid, NodeState.PENDING)
+
+    def _ancestors(self, node_id: str) -> set[str]:
+        seen: set[int] = set()
+        stack = [self.gi.index[node_id]]
+        while stack:
+            i = stack.pop()
+            if i in seen:
+                continue
+            seen.add(i)
+            stack.extend(self.gi.pred[i])
+        return {self.gi.node_ids[i] for i in seen}
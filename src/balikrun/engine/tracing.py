@@ -0,0 +1,245 @@
+# src/balikrun/engine/tracing.py
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+# One recorded span: (name, start_ns, end_ns, node_id, task_id, tid)
+Span = tuple[str, int, int, Optional[str], Optional[str], Optional[str]]
+
+# Ring slot: (seq, *Span)
+_Slot = tuple[int, str, int, int, Optional[str], Optional[str], Optional[str]]
+
+
+class Phase:
+    """
+    Span names for the node lifecycle, as recorded by the engine.
+
+    SCHEDULE:   coordinator picking ready nodes off the frontier (per batch)
+    QUEUE_WAIT: lease granted -> task started on the worker
+    COMPUTE:    task body on the worker
+    REPORT:     task finished -> result received by the coordinator
+    COMMIT:     coordinator committing the result and advancing the frontier
+    """
+    SCHEDULE = "schedule"
+    QUEUE_WAIT = "queue_wait"
+    COMPUTE = "compute"
+    REPORT = "report"
+    COMMIT = "commit"
+
+
+class _SpanContext:
+    __slots__ = ("_tracer", "_name", "_node_id", "_task_id", "_tid", "_start")
+
+    def __init__(self, tracer: "Tracer", name: str, node_id, task_id, tid):
+        self._tracer = tracer
+        self._name = name
+        self._node_id = node_id
+        self._task_id = task_id
+        self._tid = tid
+
+    def __enter__(self) -> "_SpanContext":
+        self._start = self._tracer.clock()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        t = self._tracer
+        t.record(self._name, self._start, t.clock(), self._node_id, self._task_id, self._tid)
+
+
+class Tracer:
+    """
+    Span recorder backed by a fixed-size ring buffer.
+
+    Notes:
+    - Recording is one clock read, one tuple and one list store; the slot index comes
+      from itertools.count(), whose next() is atomic under the GIL, so concurrent
+      threads never take a lock. When the ring wraps, the oldest spans are overwritten
+      (`dropped` counts them).
+    - Timestamps are `time.time_ns()` by default so spans reported by worker processes
+      (wall-clock) line up with coordinator spans.
+    - Hot paths should guard with `if tracer.enabled:`, read time through the bound
+      `tracer.clock` and call `record()` positionally; NULL_TRACER makes the disabled
+      case a single attribute check.
+    """
+    enabled = True
+
+    def __init__(self, capacity: int = 1 << 16, *, clock: Callable[[], int] = time.time_ns):
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError("Tracer.capacity must be a positive power of two.")
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self._buf: list[Optional[_Slot]] = [None] * capacity
+        self._next = itertools.count()
+        self.clock = clock
+
+    def now(self) -> int:
+        return self.clock()
+
+    def record(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: int,
+        node_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        tid: Optional[str] = None,
+    ) -> None:
+        i = next(self._next)
+        self._buf[i & self._mask] = (i, name, start_ns, end_ns, node_id, task_id, tid)
+
+    def span(
+        self,
+        name: str,
+        node_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        tid: Optional[str] = None,
+    ) -> _SpanContext:
+        """
+        Context manager recording the enclosed block (convenient, not for hot loops).
+        """
+        return _SpanContext(self, name, node_id, task_id, tid)
+
+    @property
+    def written(self) -> int:
+        """
+        Total spans recorded since construction or clear() (including overwritten ones).
+        """
+        seqs = [slot[0] for slot in self._buf if slot is not None]
+        return max(seqs) + 1 if seqs else 0
+
+    @property
+    def dropped(self) -> int:
+        return max(0, self.written - self.capacity)
+
+    def spans(self) -> list[Span]:
+        """
+        Recorded spans, oldest first (at most `capacity`).
+        """
+        slots = sorted((slot for slot in self._buf if slot is not None), key=lambda x: x[0])
+        return [slot[1:] for slot in slots]
+
+    def clear(self) -> None:
+        self._buf = [None] * self.capacity
+        self._next = itertools.count()
+
+    def to_chrome_trace(self, *, pid: int = 0) -> dict[str, Any]:
+        """
+        Chrome trace-event JSON (chrome://tracing, Perfetto): one complete ("X") event
+        per span, one lane (tid) per worker.
+        """
+        events = []
+        lanes: dict[str, int] = {}
+        for name, start, end, node_id, task_id, tid in self.spans():
+            lane = lanes.setdefault(tid or "main", len(lanes))
+            args = {}
+            if node_id is not None:
+                args["node_id"] = node_id
+            if task_id is not None:
+                args["task_id"] = task_id
+            events.append(
+                {
+                    "name": name,
+                    "cat": "balikrun",
+                    "ph": "X",
+                    "ts": start / 1000,
+                    "dur": max(0, end - start) / 1000,
+                    "pid": pid,
+                    "tid": lane,
+                    "args": args,
+                }
+            )
+        for tid, lane in lanes.items():
+            events.append(
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": lane, "args": {"name": tid}}
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_otlp(self, *, service_name: str = "balikrun", trace_id: Optional[str] = None) -> dict[str, Any]:
+        """
+        OpenTelemetry OTLP/JSON (ExportTraceServiceRequest) with all spans in one trace.
+        """
+        trace_id = trace_id or os.urandom(16).hex()
+        spans = []
+        for i, (name, start, end, node_id, task_id, tid) in enumerate(self.spans()):
+            attrs = [
+                {"key": k, "value": {"stringValue": v}}
+                for k, v in (("node_id", node_id), ("task_id", task_id), ("worker_id", tid))
+                if v is not None
+            ]
+            spans.append(
+                {
+                    "traceId": trace_id,
+                    "spanId": f"{i + 1:016x}",
+                    "name": name,
+                    "kind": 1,
+                    "startTimeUnixNano": str(start),
+                    "endTimeUnixNano": str(end),
+                    "attributes": attrs,
+                }
+            )
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": {"stringValue": service_name}}
+                        ]
+                    },
+                    "scopeSpans": [{"scope": {"name": "balikrun.engine"}, "spans": spans}],
+                }
+            ]
+        }
+
+    def export(self, path: Union[str, Path], *, format: str = "chrome") -> Path:
+        """
+        Write the trace as JSON; `format` is "chrome" or "otlp".
+        """
+        if format == "chrome":
+            payload = self.to_chrome_trace()
+        elif format == "otlp":
+            payload = self.to_otlp()
+        else:
+            raise ValueError(f"Unknown trace format {format!r}; expected 'chrome' or 'otlp'.")
+        p = Path(path)
+        p.write_text(json.dumps(payload))
+        return p
+
+
+class _NullSpanContext:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpanContext":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpanContext()
+
+
+class NullTracer(Tracer):
+    """
+    Disabled tracer: every operation is a no-op.
+    """
+    enabled = False
+
+    def __init__(self) -> None:
+        super().__init__(capacity=1)
+
+    def now(self) -> int:
+        return 0
+
+    def record(self, *args: Any) -> None:
+        return None
+
+    def span(self, *args: Any, **kwargs: Any) -> _NullSpanContext:  # type: ignore[override]
+        return _NULL_SPAN
+
+
+NULL_TRACER = NullTracer()
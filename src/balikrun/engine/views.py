@@ -0,0 +1,264 @@
+# src/balikrun/engine/views.py
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+from balikrun.engine.events import Event, EventLog, EventType
+from balikrun.engine.scheduler import (
+    IN_FLIGHT_STATES,
+    SATISFIED_STATES,
+    GraphIndex,
+    JoinMode,
+    NodeState,
+)
+from balikrun.ir import GraphIR, NodeKind
+
+
+@dataclass
+class TaskTimings:
+    """
+    Aggregated RUNNING -> COMPLETED/FAILED durations of one task_id within a run.
+    """
+    count: int = 0
+    total: float = 0.0
+    min: float = float("inf")
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.mean,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+        }
+
+
+class _RunAggregate:
+    """
+    Mutable per-run aggregate owned by RunStateView.
+
+    Every NODE_STATE event adjusts counters in O(1) and re-checks readiness of the
+    node and its successors in O(out-degree), keeping `ready` and `in_flight` exact.
+    Readiness is read off per-node counts of satisfied / completed predecessors
+    (the same rule as scheduler.is_ready), so a JOIN is never rescanned.
+    """
+    __slots__ = (
+        "run_id",
+        "gi",
+        "kinds",
+        "node_states",
+        "state_counts",
+        "kind_counts",
+        "ready",
+        "satisfied",
+        "completed",
+        "in_flight",
+        "started_at",
+        "timings",
+        "last_seq",
+        "finished",
+    )
+
+    def __init__(self, run_id: str, graph: GraphIR, gi: Optional[GraphIndex] = None):
+        self.run_id = run_id
+        self.gi = gi if gi is not None else GraphIndex.from_graph(graph)
+        self.kinds: dict[str, NodeKind] = {n.node_id: n.kind for n in graph.nodes}
+        self.node_states: dict[str, NodeState] = {}
+        self.state_counts: dict[NodeState, int] = {s: 0 for s in NodeState}
+        self.state_counts[NodeState.PENDING] = len(graph.nodes)
+        self.kind_counts: dict[NodeKind, dict[NodeState, int]] = {
+            k: {s: 0 for s in NodeState} for k in NodeKind
+        }
+        for kind in self.kinds.values():
+            self.kind_counts[kind][NodeState.PENDING] += 1
+        self.ready: set[str] = set(
+            n for n in self.gi.node_ids if not self.gi.pred[self.gi.index[n]]
+        )
+        # Per node index: predecessors in SATISFIED_STATES / in COMPLETED.
+        self.satisfied = [0] * len(self.gi)
+        self.completed = [0] * len(self.gi)
+        self.in_flight: set[str] = set()
+        self.started_at: dict[str, float] = {}
+        self.timings: dict[str, TaskTimings] = {}
+        self.last_seq = -1
+        self.finished = False
+
+    def apply(self, event: Event) -> None:
+        self.last_seq = event.seq
+        if event.type == EventType.RUN_FINISHED:
+            self.finished = True
+            return
+        node_id = event.node_id
+        state = event.state
+        if event.type != EventType.NODE_STATE or state is None or node_id not in self.kinds:
+            return
+
+        prior = self.node_states.get(node_id, NodeState.PENDING)
+        kind = self.kinds[node_id]
+        self.state_counts[prior] -= 1
+        self.state_counts[state] += 1
+        self.kind_counts[kind][prior] -= 1
+        self.kind_counts[kind][state] += 1
+        if state == NodeState.PENDING:
+            self.node_states.pop(node_id, None)
+        else:
+            self.node_states[node_id] = state
+
+        if state in IN_FLIGHT_STATES:
+            self.in_flight.add(node_id)
+        else:
+            self.in_flight.discard(node_id)
+
+        if state == NodeState.RUNNING:
+            self.started_at[node_id] = event.ts
+        elif state in (NodeState.COMPLETED, NodeState.FAILED):
+            t0 = self.started_at.pop(node_id, None)
+            if t0 is not None and event.task_id is not None:
+                timings = self.timings.get(event.task_id)
+                if timings is None:
+                    timings = self.timings[event.task_id] = TaskTimings()
+                timings.add(event.ts - t0)
+
+        i = self.gi.index[node_id]
+        sat = (state in SATISFIED_STATES) - (prior in SATISFIED_STATES)
+        done = (state == NodeState.COMPLETED) - (prior == NodeState.COMPLETED)
+        self._refresh(i)
+        for j in self.gi.succ[i]:
+            self.satisfied[j] += sat
+            self.completed[j] += done
+            if sat or done:
+                self._refresh(j)
+
+    def _refresh(self, i: int) -> None:
+        gi = self.gi
+        node_id = gi.node_ids[i]
+        n_pred = len(gi.pred[i])
+        if node_id in self.node_states:
+            ready = False
+        elif not n_pred:
+            ready = True
+        elif gi.join_modes[i] == JoinMode.OR:
+            ready = self.completed[i] > 0
+        else:
+            ready = self.satisfied[i] == n_pred
+        if ready:
+            self.ready.add(node_id)
+        else:
+            self.ready.discard(node_id)
+
+
+class RunStateView:
+    """
+    In-memory materialized view of run status, maintained incrementally.
+
+    Attach to an EventLog with `attach()`; each append updates the owning run's
+    aggregate, so status queries never scan events or node rows.
+
+    Notes:
+    - `count()`, `status()` and the size fields are O(1) in the number of nodes/events.
+    - `frontier()` returns the ready and in-flight node_ids (O(size of the frontier)).
+    - `rebuild()` replays an EventLog into a fresh view; the result equals the view
+      that was attached while the events were appended.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._runs: dict[str, _RunAggregate] = {}
+
+    @classmethod
+    def rebuild(
+        cls,
+        events: Iterable[Event],
+        graphs: Mapping[str, GraphIR],
+    ) -> "RunStateView":
+        """
+        Rebuild a view from raw events; `graphs` maps run_id to the run's GraphIR.
+        """
+        view = cls()
+        for run_id, graph in graphs.items():
+            view.register(run_id, graph)
+        for event in events:
+            view.apply(event)
+        return view
+
+    def attach(self, log: EventLog) -> Callable[[], None]:
+        return log.subscribe(self.apply)
+
+    def register(self, run_id: str, graph: GraphIR, *, index: Optional[GraphIndex] = None) -> None:
+        agg = _RunAggregate(run_id, graph, index)
+        with self._lock:
+            self._runs[run_id] = agg
+
+    def apply(self, event: Event) -> None:
+        agg = self._runs.get(event.run_id)
+        if agg is None:
+            return
+        with self._lock:
+            agg.apply(event)
+
+    def __contains__(self, run_id: str) -> bool:
+        return run_id in self._runs
+
+    def count(self, run_id: str, state: NodeState, kind: Optional[NodeKind] = None) -> int:
+        """
+        Number of the run's nodes in `state` (optionally of one NodeKind).
+        """
+        agg = self._runs[run_id]
+        if kind is None:
+            return agg.state_counts[state]
+        return agg.kind_counts[kind][state]
+
+    def frontier(self, run_id: str) -> dict[str, frozenset[str]]:
+        """
+        Ready (schedulable) and in-flight node_ids of the run.
+        """
+        agg = self._runs[run_id]
+        with self._lock:
+            return {"ready": frozenset(agg.ready), "in_flight": frozenset(agg.in_flight)}
+
+    def timings(self, run_id: str) -> dict[str, TaskTimings]:
+        agg = self._runs[run_id]
+        with self._lock:
+            return {task_id: TaskTimings(**vars(t)) for task_id, t in agg.timings.items()}
+
+    def status(self, run_id: str) -> Optional[dict[str, Any]]:
+        """
+        Status snapshot of one run, or None if the run is unknown.
+
+        Size is bounded by the number of NodeState/NodeKind values and task_ids, never
+        by the number of nodes or events.
+        """
+        agg = self._runs.get(run_id)
+        if agg is None:
+            return None
+        with self._lock:
+            return {
+                "run_id": agg.run_id,
+                "graph_id": agg.gi.graph.graph_id,
+                "finished": agg.finished,
+                "last_seq": agg.last_seq,
+                "counts": {s.value: n for s, n in agg.state_counts.items()},
+                "counts_by_kind": {
+                    k.value: {s.value: n for s, n in by_state.items() if n}
+                    for k, by_state in agg.kind_counts.items()
+                    if any(by_state.values())
+                },
+                "ready": len(agg.ready),
+                "in_flight": len(agg.in_flight),
+                "timings": {task_id: t.as_dict() for task_id, t in agg.timings.items()},
+            }
@@ -0,0 +1,221 @@
+# src/balikrun/engine/worker.py
+from __future__ import annotations
+
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing.connection import Client
+from typing import Any, Callable, Mapping, Optional
+
+# Worker-side half of the distributed executor. Only the standard library is imported
+# here: worker processes start by importing this module (see LocalBroker.spawn_workers),
+# so pydantic model building and the coordinator's graph machinery stay out of their
+# cold start.
+#
+# Wire protocol (pickled tuples over multiprocessing.connection):
+#
+# worker -> coordinator
+#   ("hello", worker_id, capacity, resources)
+#       resources: {"cpu": .., "memory_mb": .., "gpu": ..} or None (not resource-aware)
+#   ("pull", worker_id, credit, results, queued, revoked)
+#       results: list[TaskResult] finished since the last pull
+#       queued:  lease_ids received but not started yet (candidates for stealing)
+#       revoked: lease_ids dropped in answer to a revoke request
+#   ("heartbeat", worker_id, running, running_for)
+#       renews the worker's leases between pulls; never answered. running: lease_id
+#       executing now (or None), for running_for seconds. Also sent as each task starts.
+#
+# coordinator -> worker
+#   ("work", grants, revoke, heartbeat)
+#       grants: list[LeaseGrant]; revoke: lease_ids to drop if not started yet
+#       heartbeat: seconds between heartbeats while the worker holds leases
+#   ("shutdown",)
+#
+# A pull that yields no work from a worker with an empty queue is parked (no reply)
+# until work appears, so idle workers block in recv() instead of polling.
+
+
+@dataclass(frozen=True)
+class LeaseGrant:
+    """
+    What a worker receives for one leased TASK node.
+    """
+    lease_id: str
+    node_id: str
+    task_id: str
+    attempt: int
+    run_id: str = ""
+    inputs: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class TaskContext:
+    """
+    Argument passed to task callables on the worker.
+
+    inputs:
+      TASK node_ids whose outputs flow into this node (set when the coordinator has
+      an ArtifactStore; read them with `store.get(run_id, node_id, name)`).
+    """
+    node_id: str
+    task_id: str
+    attempt: int
+    lease_id: str
+    worker_id: str
+    run_id: str = ""
+    inputs: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class TaskResult:
+    lease_id: str
+    ok: bool
+    value: Any = None
+    error: Optional[str] = None
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+
+TaskFn = Callable[[TaskContext], Any]
+
+
+class _Heartbeat:
+    """
+    Background thread that sends a heartbeat every `interval` seconds while `active`,
+    so leases outlive tasks that run longer than the lease ttl. Heartbeats also tell
+    the coordinator which lease is executing and for how long (straggler detection).
+    """
+
+    def __init__(self, conn: Any, send_lock: threading.Lock, worker_id: str):
+        self.interval: Optional[float] = None
+        self.active = False
+        self._running: Optional[tuple[str, float]] = None  # (lease_id, monotonic start)
+        self._conn = conn
+        self._send_lock = send_lock
+        self._worker_id = worker_id
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def start(self, lease_id: str) -> None:
+        self._running = (lease_id, time.monotonic())
+        self.send()
+
+    def finish(self) -> None:
+        self._running = None
+
+    def send(self) -> None:
+        running = self._running  # read once: the main thread swaps it
+        lease_id, running_for = None, 0.0
+        if running is not None:
+            lease_id, running_for = running[0], time.monotonic() - running[1]
+        with self._send_lock:
+            self._conn.send(("heartbeat", self._worker_id, lease_id, running_for))
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval or 0.1):
+            if not self.active or self.interval is None:
+                continue
+            try:
+                self.send()
+            except (ConnectionError, OSError, ValueError):
+                return
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def run_worker(
+    address: Any,
+    authkey: bytes,
+    worker_id: str,
+    tasks: Mapping[str, TaskFn],
+    *,
+    capacity: int = 4,
+    report_every: Optional[int] = None,
+    resources: Optional[Mapping[str, float]] = None,
+) -> None:
+    """
+    Worker process main loop: pull batched leases, execute them in order, report back.
+
+    capacity:
+      Maximum leases held locally (executing + queued); the coordinator never grants
+      more than the credit the worker advertises, which bounds its backlog.
+
+    report_every:
+      Results are piggybacked on the next pull, which happens when the local queue is
+      empty or this many results are pending (default: half the capacity). Between
+      pulls a heartbeat thread renews the worker's leases at the interval the
+      coordinator asks for.
+
+    resources:
+      Capacity advertised to the coordinator (see balikrun.engine.resources); leases
+      are then bin-packed so the requirements of the tasks it holds never exceed it.
+    """
+    batch = report_every or max(1, capacity // 2)
+    conn = Client(address, authkey=authkey)
+    conn.send(("hello", worker_id, capacity, dict(resources) if resources else None))
+    pending: deque[LeaseGrant] = deque()
+    results: list[TaskResult] = []
+    revoked: list[str] = []
+    send_lock = threading.Lock()
+    heartbeat = _Heartbeat(conn, send_lock, worker_id)
+    try:
+        while True:
+            if not pending or len(results) >= batch:
+                # The pull renews this worker's leases; the reply comes back at once
+                # unless it holds none (parked), so no heartbeats while waiting.
+                heartbeat.active = False
+                with send_lock:
+                    conn.send(
+                        (
+                            "pull",
+                            worker_id,
+                            capacity - len(pending),
+                            results,
+                            [g.lease_id for g in pending],
+                            revoked,
+                        )
+                    )
+                results, revoked = [], []
+                msg = conn.recv()
+                if msg[0] == "shutdown":
+                    return
+                _, grants, revoke, heartbeat.interval = msg
+                heartbeat.active = True
+                if revoke:
+                    drop = set(revoke)
+                    revoked = [g.lease_id for g in pending if g.lease_id in drop]
+                    pending = deque(g for g in pending if g.lease_id not in drop)
+                pending.extend(grants)
+                continue
+
+            grant = pending.popleft()
+            ctx = TaskContext(
+                node_id=grant.node_id,
+                task_id=grant.task_id,
+                attempt=grant.attempt,
+                lease_id=grant.lease_id,
+                worker_id=worker_id,
+                run_id=grant.run_id,
+                inputs=grant.inputs,
+            )
+            heartbeat.start(grant.lease_id)
+            t0 = time.time()
+            try:
+                fn = tasks[grant.task_id]
+                value = fn(ctx)
+                results.append(TaskResult(grant.lease_id, True, value, None, t0, time.time()))
+            except Exception:
+                results.append(
+                    TaskResult(grant.lease_id, False, None, traceback.format_exc(), t0, time.time())
+                )
+            heartbeat.finish()
+    except (EOFError, ConnectionError, OSError):
+        return
+    finally:
+        heartbeat.stop()
+        conn.close()
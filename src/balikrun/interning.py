@@ -0,0 +1,176 @@
+# src/balikrun/interning.py
+from __future__ import annotations
+
+import hashlib
+from enum import Enum
+from typing import Any, Mapping, TypeVar
+
+from pydantic import BaseModel
+
+from balikrun.specification import SpecificationModel
+
+M = TypeVar("M", bound=SpecificationModel)
+
+
+class SpecInterner:
+    """
+    Hash-consing table for frozen specification nodes.
+
+    Interning rebuilds a spec bottom-up so that structurally equal subtrees are
+    represented by one shared instance. Because specification models are frozen,
+    sharing is safe and never observable through the public model API.
+
+    Notes:
+    - Canonical instances compare by identity: for two interned nodes `a` and `b`,
+      `a == b` iff `a is b`. Use `same()` for the O(1) check. Nodes that differ only
+      in which fields were set explicitly (`model_fields_set`) are kept apart, so
+      `model_dump(exclude_unset=True)` is unchanged by interning.
+    - `structural_hash()` and `digest()` are computed once per canonical node and
+      cached; child hashes are reused rather than re-walking the subtree.
+    - `digest()` is a stable content hash (hex) suitable for cache keys that must
+      survive process restarts; it covers field values only, so an explicit default
+      and an unset one digest alike. `structural_hash()` is an in-process int.
+    - The table holds strong references; drop the interner to release memory.
+    """
+
+    def __init__(self) -> None:
+        self._table: dict[tuple[Any, ...], SpecificationModel] = {}
+        # Keyed by id() of canonical instances; safe because `_table` keeps them alive.
+        self._keys: dict[int, tuple[Any, ...]] = {}
+        self._hashes: dict[int, int] = {}
+        self._digests: dict[int, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __contains__(self, node: object) -> bool:
+        return id(node) in self._keys
+
+    def intern(self, node: M) -> M:
+        """
+        Return the canonical instance structurally equal to `node`.
+
+        Children are interned first; a node whose children are all already canonical
+        is reused as-is when it is the first of its shape, otherwise it is replaced by
+        the existing canonical instance.
+        """
+        if id(node) in self._keys:
+            return node
+
+        cls = type(node)
+        values: dict[str, Any] = {}
+        # Which fields were set explicitly shows in `model_dump(exclude_unset=True)`,
+        # so it is part of the shape.
+        key_parts: list[Any] = [cls, frozenset(node.model_fields_set)]
+        rebuilt = False
+        for name in cls.model_fields:
+            raw = getattr(node, name)
+            value = self._intern_value(raw)
+            if value is not raw:
+                rebuilt = True
+            values[name] = value
+            key_parts.append(self._value_key(value))
+        key = tuple(key_parts)
+
+        canonical = self._table.get(key)
+        if canonical is not None:
+            self.hits += 1
+            return canonical  # type: ignore[return-value]
+
+        self.misses += 1
+        if rebuilt:
+            # Fields are already validated; only the children were swapped for equal ones.
+            node = cls.model_construct(_fields_set=set(node.model_fields_set), **values)
+        self._table[key] = node
+        self._keys[id(node)] = key
+        return node
+
+    def validate(self, model: type[M], data: Mapping[str, Any]) -> M:
+        """
+        Validate `data` as `model` and intern the result.
+        """
+        return self.intern(model.model_validate(data))
+
+    def same(self, a: SpecificationModel, b: SpecificationModel) -> bool:
+        """
+        O(1) structural equality for interned nodes.
+        """
+        self._require_canonical(a)
+        self._require_canonical(b)
+        return a is b
+
+    def structural_hash(self, node: SpecificationModel) -> int:
+        """
+        Cached in-process structural hash of an interned node.
+        """
+        self._require_canonical(node)
+        h = self._hashes.get(id(node))
+        if h is None:
+            key = self._keys[id(node)]
+            # Child entries in the key are canonical ids, so hashing the key is shallow.
+            h = hash((key[0].__qualname__,) + key[1:])
+            self._hashes[id(node)] = h
+        return h
+
+    def digest(self, node: SpecificationModel) -> str:
+        """
+        Cached stable content digest (blake2b-128, hex) of an interned node.
+        """
+        self._require_canonical(node)
+        d = self._digests.get(id(node))
+        if d is None:
+            cls = type(node)
+            hasher = hashlib.blake2b(digest_size=16)
+            hasher.update(cls.__qualname__.encode())
+            for name in cls.model_fields:
+                hasher.update(b"\x00")
+                hasher.update(name.encode())
+                hasher.update(b"=")
+                hasher.update(self._digest_value(getattr(node, name)).encode())
+            d = hasher.hexdigest()
+            self._digests[id(node)] = d
+        return d
+
+    def _intern_value(self, value: Any) -> Any:
+        if isinstance(value, SpecificationModel):
+            return self.intern(value)
+        if isinstance(value, list):
+            items = [self._intern_value(v) for v in value]
+            if all(a is b for a, b in zip(items, value)):
+                return value
+            return items
+        return value
+
+    def _value_key(self, value: Any) -> Any:
+        if isinstance(value, SpecificationModel):
+            return ("node", id(value))
+        if isinstance(value, list):
+            return ("list",) + tuple(self._value_key(v) for v in value)
+        if isinstance(value, Enum):
+            return ("enum", type(value).__qualname__, value.value)
+        if isinstance(value, BaseModel):
+            # Frozen value objects (SpecificationValue); set fields show in dumps too.
+            return ("model", type(value).__qualname__, frozenset(value.model_fields_set), value)
+        return ("value", type(value).__qualname__, value)
+
+    def _digest_value(self, value: Any) -> str:
+        if isinstance(value, SpecificationModel):
+            return "node:" + self.digest(value)
+        if isinstance(value, list):
+            return "[" + ",".join(self._digest_value(v) for v in value) + "]"
+        if isinstance(value, Enum):
+            return repr(value.value)
+        return repr(value)
+
+    def _require_canonical(self, node: SpecificationModel) -> None:
+        if id(node) not in self._keys:
+            raise ValueError("Node is not interned by this SpecInterner; call intern() first.")
+
+
+def intern_spec(node: M, *, interner: SpecInterner | None = None) -> M:
+    """
+    Convenience wrapper: intern `node` with `interner` (or a fresh one).
+    """
+    return (interner or SpecInterner()).intern(node)
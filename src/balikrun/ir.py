@@ -18,8 +18,9 @@ class IRModel(BaseModel):
     Notes:
     - Intended to be persisted as JSON.
     - Frozen + forbid extra fields for versioned reproducibility.
+    - Validators are built on first use (`defer_build`) to keep imports cheap.
     """
-    model_config = ConfigDict(frozen=True, extra="forbid")
+    model_config = ConfigDict(frozen=True, extra="forbid", defer_build=True)
 
 
 class NodeKind(str, Enum):
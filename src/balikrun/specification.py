@@ -22,14 +22,102 @@ class SpecificationModel(BaseModel):
   - These objects are intended to be persisted as JSON.
   - Keep models immutable to support versioning and reproducibility.
   - `node_id` is optional but recommended for stable diffs and UI identity.
+  - Validators are built on first use (`defer_build`), so importing this module does
+    not pay for schema construction; forward references such as "Block" resolve
+    against this module's namespace at that point.
   """
   node_id: Optional[NonEmptyStr] = None
-  model_config = ConfigDict(frozen=True, extra="forbid")
+  model_config = ConfigDict(frozen=True, extra="forbid", defer_build=True)
+
+
+class SpecificationValue(BaseModel):
+  """
+  Base class for value objects nested in specification nodes (e.g. a task's resources).
+
+  Same config as SpecificationModel, but without `node_id`: values have no identity
+  of their own.
+  """
+  model_config = ConfigDict(frozen=True, extra="forbid", defer_build=True)
+
+
+class TaskResources(SpecificationValue):
+  """
+  Resources one execution of a task needs on a worker.
+
+  cpu:       cores (fractional allowed)
+  memory_mb: resident memory
+  gpu:       whole devices
+
+  The compiler copies these into the TASK node's `meta["resources"]`, where the
+  engine's resource-aware scheduler reads them.
+  """
+  cpu: float = 1.0
+  memory_mb: float = 0.0
+  gpu: int = 0
+
+  @field_validator("cpu", "memory_mb", "gpu")
+  @classmethod
+  def _non_negative(cls, v: float) -> float:
+    if v < 0:
+      raise ValueError("TaskResources values must be non-negative.")
+    return v
+
+
+class TaskRetry(SpecificationValue):
+  """
+  Retry policy of a task: how often a failed execution is retried and how long the
+  engine waits before each retry.
+
+  max_attempts: total executions allowed, including the first
+  backoff:      delay before the first retry, in seconds
+  multiplier:   growth factor of the delay per further retry
+  max_backoff:  cap on the delay
+  jitter:       fraction of each delay that is randomized (0 = fixed delays,
+                1 = uniform in [0, delay]), so failed fan-out tasks do not retry in lockstep
+
+  The compiler copies these into the TASK node's `meta["retry"]`.
+  """
+  max_attempts: int = 3
+  backoff: float = 1.0
+  multiplier: float = 2.0
+  max_backoff: float = 60.0
+  jitter: float = 0.5
+
+  @field_validator("max_attempts")
+  @classmethod
+  def _max_attempts_positive(cls, v: int) -> int:
+    if v < 1:
+      raise ValueError("TaskRetry.max_attempts must be at least 1.")
+    return v
+
+  @field_validator("backoff", "max_backoff")
+  @classmethod
+  def _delay_non_negative(cls, v: float) -> float:
+    if v < 0:
+      raise ValueError("TaskRetry delays must be non-negative.")
+    return v
+
+  @field_validator("multiplier")
+  @classmethod
+  def _multiplier_at_least_one(cls, v: float) -> float:
+    if v < 1:
+      raise ValueError("TaskRetry.multiplier must be at least 1.")
+    return v
+
+  @field_validator("jitter")
+  @classmethod
+  def _jitter_fraction(cls, v: float) -> float:
+    if not 0 <= v <= 1:
+      raise ValueError("TaskRetry.jitter must be between 0 and 1.")
+    return v
 
 
 class TaskReference(SpecificationModel):
   task_id: NonEmptyStr
   kind: Literal["task_ref"] = "task_ref"
+  # Omitted from dumps when unset so specs without resources keep their canonical form.
+  resources: Optional[TaskResources] = Field(default=None, exclude_if=lambda v: v is None)
+  retry: Optional[TaskRetry] = Field(default=None, exclude_if=lambda v: v is None)
 
 class SequenceBlock(SpecificationModel):
   kind: Literal["sequence"] = "sequence"
@@ -163,13 +251,3 @@ Block = Annotated[
   ],
   Field(discriminator="kind"),
 ]
-
-# Resolve forward references.
-TaskReference.model_rebuild()
-SequenceBlock.model_rebuild()
-ChoiceCase.model_rebuild()
-ChoiceBlock.model_rebuild()
-ParallelBranch.model_rebuild()
-ParallelBlock.model_rebuild()
-LoopBlock.model_rebuild()
-CompositeBlock.model_rebuild()
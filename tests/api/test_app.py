@@ -0,0 +1,102 @@
+# tests/api/test_app.py
+from __future__ import annotations
+
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from balikrun.api import create_app
+from balikrun.engine.events import EventType
+from balikrun.engine.runs import RunRegistry
+from balikrun.engine.scheduler import NodeState
+
+SPEC = {
+    "kind": "sequence",
+    "items": [
+        {"kind": "task_ref", "task_id": "ingest", "node_id": "ingest"},
+        {"kind": "task_ref", "task_id": "train", "node_id": "train"},
+    ],
+}
+
+
+def test_app_submit_compiles_through_cache_and_reports_status():
+    reg = RunRegistry()
+    with TestClient(create_app(reg)) as client:
+        r1 = client.post("/runs", json={"spec": SPEC, "graph_id": "g"})
+        r2 = client.post("/runs", json={"spec": SPEC, "graph_id": "g"})
+        assert r1.status_code == 201 and r2.status_code == 201
+        assert r1.json()["spec_digest"] == r2.json()["spec_digest"]
+        assert r1.json()["node_count"] == 4
+        assert reg.cache.hits == 1
+
+        run_id = r1.json()["run_id"]
+        reg.log.append(run_id, EventType.NODE_STATE, node_id="ingest", state=NodeState.RUNNING)
+
+        status = client.get(f"/runs/{run_id}").json()
+        assert status["counts"]["RUNNING"] == 1
+        assert status["counts"]["PENDING"] == 3
+
+
+def test_app_submits_off_the_event_loop():
+    # Compiling blocks; it must not run on the loop that serves the event streams.
+    reg = RunRegistry()
+    on_loop = []
+    submit = reg.submit
+
+    def probe(*args, **kwargs):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return submit(*args, **kwargs)
+
+    reg.submit = probe  # type: ignore[method-assign]
+    with TestClient(create_app(reg)) as client:
+        assert client.post("/runs", json={"spec": SPEC}).status_code == 201
+    assert on_loop == [False]
+
+
+def test_app_rejects_invalid_and_uncompilable_specs():
+    with TestClient(create_app()) as client:
+        bad = client.post("/runs", json={"spec": {"kind": "sequence", "items": []}})
+        assert bad.status_code == 422
+
+        loop = {"kind": "loop", "guard": "g", "body": {"kind": "task_ref", "task_id": "t"}}
+        unsupported = client.post("/runs", json={"spec": loop})
+        assert unsupported.status_code == 422
+
+        assert client.get("/runs/nope").status_code == 404
+
+
+def test_app_streams_events_as_sse_until_run_finished():
+    reg = RunRegistry()
+    with TestClient(create_app(reg)) as client:
+        run_id = client.post("/runs", json={"spec": SPEC}).json()["run_id"]
+        reg.log.append(run_id, EventType.NODE_STATE, node_id="ingest", state=NodeState.COMPLETED)
+        reg.log.append(run_id, EventType.RUN_FINISHED)
+
+        with client.stream("GET", f"/runs/{run_id}/events") as resp:
+            assert resp.headers["content-type"].startswith("text/event-stream")
+            body = "".join(resp.iter_text())
+
+        data = [json.loads(line[6:]) for line in body.splitlines() if line.startswith("data: ")]
+        assert [e["type"] for e in data] == ["RUN_CREATED", "NODE_STATE", "RUN_FINISHED"]
+
+        # Resuming from Last-Event-ID only replays newer events.
+        with client.stream(
+            "GET", f"/runs/{run_id}/events", headers={"Last-Event-ID": str(data[0]["seq"])}
+        ) as resp:
+            body = "".join(resp.iter_text())
+        assert body.count("data: ") == 2
+
+
+def test_app_streams_events_over_websocket():
+    reg = RunRegistry()
+    with TestClient(create_app(reg)) as client:
+        run_id = client.post("/runs", json={"spec": SPEC}).json()["run_id"]
+        with client.websocket_connect(f"/runs/{run_id}/ws") as ws:
+            assert json.loads(ws.receive_text())["type"] == "RUN_CREATED"
+            reg.log.append(run_id, EventType.RUN_FINISHED)
+            assert json.loads(ws.receive_text())["type"] == "RUN_FINISHED"
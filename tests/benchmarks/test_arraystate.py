@@ -0,0 +1,18 @@
+# tests/benchmarks/test_arraystate.py
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from benchmarks.arraystate import measure  # noqa: E402
+
+
+def test_array_frontier_ends_in_the_same_states_as_frontier():
+    r = measure(3000, batch=256, width=300)
+    assert all(shape["states_match"] for shape in r.values())
+    assert r["layered"]["tasks"] == r["fan_tree"]["tasks"] == 3000
+    # Same-process ratios on shapes without a wide JOIN (fan_out's mostly measures
+    # Frontier's quadratic JOIN recheck); typically x5-8 here, so 2 leaves room for noise.
+    assert r["fan_tree"]["speedup"] > 2
+    assert r["layered"]["speedup"] > 2
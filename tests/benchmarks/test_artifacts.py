@@ -0,0 +1,14 @@
+# tests/benchmarks/test_artifacts.py
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from benchmarks.artifacts import measure  # noqa: E402
+
+
+def test_measure_reads_back_through_both_paths(tmp_path):
+    r = measure(1, 2, tmp_path)
+    assert set(r) == {"pickle", "store"}
+    assert not any(tmp_path.iterdir())
@@ -0,0 +1,10 @@
+# tests/benchmarks/test_event_queries.py
+from __future__ import annotations
+
+from benchmarks.event_queries import measure
+
+
+def test_indexed_queries_agree_with_a_full_scan():
+    out = measure(5_000, runs=10, nodes=50)
+    assert set(out) == {"node", "task_run", "window"}
+    assert all(r["matches"] > 0 for r in out.values())
@@ -0,0 +1,11 @@
+# tests/benchmarks/test_fairshare.py
+from __future__ import annotations
+
+from benchmarks.fairshare import simulate
+
+
+def test_fair_share_keeps_interactive_runs_ahead_of_a_sweep():
+    fifo = simulate("fifo", sweep=90, small=10, workers=16)
+    fair = simulate("fair", sweep=90, small=10, workers=16)
+    assert fair["tasks"] == fifo["tasks"]
+    assert fair["small_p95"] < fifo["small_p95"] / 4
@@ -0,0 +1,10 @@
+# tests/benchmarks/test_guards.py
+from __future__ import annotations
+
+from benchmarks.guards import measure
+
+
+def test_measure_reports_every_strategy():
+    r = measure(4, 200)
+    assert set(r) == {"interpret", "per_guard", "batched", "memoized"}
+    assert all(ns > 0 for ns in r.values())
@@ -0,0 +1,23 @@
+# tests/benchmarks/test_import_time.py
+from __future__ import annotations
+
+import pytest
+
+import balikrun
+from benchmarks.import_time import TARGETS, measure
+
+
+@pytest.mark.parametrize("module", ["balikrun", "balikrun.engine.worker", "balikrun.engine.artifacts"])
+def test_import_boundaries_hold(module):
+    _, forbidden = TARGETS[module]
+    assert measure(module, forbidden, repeat=1)["loaded"] == []
+
+
+def test_balikrun_resolves_public_names_lazily():
+    from balikrun.ir import GraphIR
+
+    assert balikrun.GraphIR is GraphIR
+    assert "compile_to_graph_ir" in dir(balikrun)
+    assert sorted(balikrun.__all__) == sorted(balikrun._LAZY)
+    with pytest.raises(AttributeError):
+        balikrun.not_a_name
@@ -0,0 +1,12 @@
+# tests/benchmarks/test_packing.py
+from __future__ import annotations
+
+from benchmarks.packing import CLUSTER, generate_tasks, simulate
+
+
+def test_packed_policy_beats_head_of_line_fifo():
+    tasks = generate_tasks(1_000, seed=0)
+    fifo = simulate(tasks, CLUSTER, policy="fifo")
+    packed = simulate(tasks, CLUSTER, policy="packed")
+    assert packed["makespan"] < fifo["makespan"]
+    assert packed["backlogged_utilization"]["memory_mb"] > fifo["backlogged_utilization"]["memory_mb"]
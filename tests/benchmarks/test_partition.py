@@ -0,0 +1,11 @@
+# tests/benchmarks/test_partition.py
+from __future__ import annotations
+
+from benchmarks.partition import pipelines, simulate
+
+
+def test_affinity_moves_less_data_than_fifo():
+    graph = pipelines(16, 10)
+    fifo = simulate(graph, 4, "fifo")
+    affinity = simulate(graph, 4, "affinity")
+    assert affinity["moved_bytes"] < fifo["moved_bytes"] / 2
@@ -0,0 +1,16 @@
+# tests/benchmarks/test_simulate.py
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.simulate import simulate
+from benchmarks.workloads import GRAPHS
+
+
+@pytest.mark.parametrize("workload", list(GRAPHS))
+def test_simulate_completes_every_workload(workload):
+    out = simulate(workload, 200, workers=8, latency=0.1)
+    r = out["result"]
+    assert r.completed
+    assert 0 < r.peak_concurrency <= 8
+    assert r.critical_path[0] != r.critical_path[-1]
@@ -0,0 +1,40 @@
+# tests/benchmarks/test_workloads.py
+from __future__ import annotations
+
+import io
+
+import pytest
+from pydantic import TypeAdapter
+
+from balikrun.compile import compile_to_graph_ir
+from balikrun.engine.scheduler import GraphIndex
+from balikrun.ir import GraphIR
+from balikrun.specification import Block
+from benchmarks.run import BENCHMARKS, _drive, compare, run
+from benchmarks.workloads import COMPILABLE_SPECS, GRAPHS, SPECS
+
+
+@pytest.mark.parametrize("name", sorted(SPECS))
+def test_spec_workloads_validate(name):
+    TypeAdapter(Block).validate_python(SPECS[name](50))
+
+
+@pytest.mark.parametrize("name", sorted(COMPILABLE_SPECS))
+def test_compilable_workloads_compile(name):
+    g = compile_to_graph_ir(TypeAdapter(Block).validate_python(COMPILABLE_SPECS[name](50)))
+    assert sum(1 for n in g.nodes if n.kind == "TASK") == 50
+
+
+@pytest.mark.parametrize("name", sorted(GRAPHS))
+def test_graph_workloads_schedule_to_exit(name):
+    gi = GraphIndex.from_graph(GraphIR.model_validate(GRAPHS[name](70)))
+    assert _drive(gi) > 0
+
+
+def test_run_produces_results_and_compare_flags_regressions():
+    doc = run(sorted(BENCHMARKS), [10], repeat=1, out=io.StringIO())
+    assert "schedule/usage_mix/10" in doc["results"]
+    assert compare(doc, doc, threshold=0.25) == []
+
+    slower = {"results": {k: {**v, "seconds": v["seconds"] * 2} for k, v in doc["results"].items()}}
+    assert len(compare(slower, doc, threshold=0.25)) == len(doc["results"])
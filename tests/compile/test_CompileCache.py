@@ -0,0 +1,39 @@
+# tests/compile/test_CompileCache.py
+from __future__ import annotations
+
+from balikrun.compile import CompileCache, CompileOptions
+from balikrun.specification import SequenceBlock, TaskReference
+
+
+def _spec(*task_ids: str) -> SequenceBlock:
+    return SequenceBlock(items=[TaskReference(task_id=t) for t in task_ids])
+
+
+def test_CompileCache_reuses_graph_for_equal_specs():
+    """
+    Equal specs built as separate objects share one compiled GraphIR.
+    """
+    cache = CompileCache()
+    g1 = cache.compile(_spec("a", "b"))
+    g2 = cache.compile(_spec("a", "b"))
+    assert g1 is g2
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_CompileCache_keys_on_options():
+    cache = CompileCache()
+    g1 = cache.compile(_spec("a"), options=CompileOptions(graph_id="x"))
+    g2 = cache.compile(_spec("a"), options=CompileOptions(graph_id="y"))
+    assert g1 is not g2
+    assert g2.graph_id == "y"
+
+
+def test_CompileCache_evicts_least_recently_used():
+    cache = CompileCache(maxsize=2)
+    a = cache.compile(_spec("a"))
+    cache.compile(_spec("b"))
+    cache.compile(_spec("a"))
+    cache.compile(_spec("c"))
+    assert len(cache) == 2
+    assert cache.compile(_spec("a")) is a
+    assert cache.misses == 3
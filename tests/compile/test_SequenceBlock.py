@@ -57,3 +57,30 @@ def test_preserves_spec_node_id_for_TaskReference_when_enabled():
     task_nodes = [n for n in g.nodes if n.kind == NodeKind.TASK]
     assert len(task_nodes) == 1
     assert task_nodes[0].node_id == "task_ingest"
+
+
+def test_task_resources_are_lowered_into_node_meta():
+    spec = SequenceBlock(
+        items=[
+            TaskReference(task_id="train", resources={"cpu": 8, "memory_mb": 16384}),
+            TaskReference(task_id="report"),
+        ]
+    )
+    g = compile_to_graph_ir(spec)
+    tasks = {n.task_id: n for n in g.nodes if n.kind == NodeKind.TASK}
+    assert tasks["train"].meta["resources"] == {"cpu": 8.0, "memory_mb": 16384.0, "gpu": 0}
+    assert "resources" not in tasks["report"].meta
+
+
+def test_task_retry_policy_is_lowered_into_node_meta():
+    spec = SequenceBlock(items=[TaskReference(task_id="train", retry={"max_attempts": 4}), TaskReference(task_id="report")])
+    g = compile_to_graph_ir(spec)
+    tasks = {n.task_id: n for n in g.nodes if n.kind == NodeKind.TASK}
+    assert tasks["train"].meta["retry"] == {
+        "max_attempts": 4,
+        "backoff": 1.0,
+        "multiplier": 2.0,
+        "max_backoff": 60.0,
+        "jitter": 0.5,
+    }
+    assert "retry" not in tasks["report"].meta
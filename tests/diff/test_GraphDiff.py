@@ -0,0 +1,130 @@
+# tests/diff/test_GraphDiff.py
+from __future__ import annotations
+
+from balikrun.compile import CompileOptions, compile_to_graph_ir
+from balikrun.diff import diff_graph_ir, graph_fingerprint
+from balikrun.ir import GraphIR
+from balikrun.specification import SequenceBlock, TaskReference
+
+
+def _graph(nodes: list[dict], edges: list[dict]) -> GraphIR:
+    return GraphIR.model_validate(
+        {"graph_id": "g", "nodes": nodes, "edges": edges, "entry_id": "n0", "exit_id": "n9"}
+    )
+
+
+def test_GraphDiff_identical_graphs_are_empty():
+    spec = SequenceBlock(items=[TaskReference(task_id="a"), TaskReference(task_id="b")])
+    opts = CompileOptions(graph_id="g")
+    d = diff_graph_ir(compile_to_graph_ir(spec, options=opts), compile_to_graph_ir(spec, options=opts))
+    assert d.is_empty
+
+
+def test_GraphDiff_reports_added_removed_and_changed():
+    """
+    Nodes align by node_id and edges by (src, dst, label); content changes are separate
+    from additions/removals.
+    """
+    old = _graph(
+        [
+            {"node_id": "n0", "kind": "ENTRY"},
+            {"node_id": "a", "kind": "TASK", "task_id": "train"},
+            {"node_id": "b", "kind": "TASK", "task_id": "eval"},
+            {"node_id": "n9", "kind": "EXIT"},
+        ],
+        [
+            {"src": "n0", "dst": "a"},
+            {"src": "a", "dst": "b", "guard": "ok"},
+            {"src": "b", "dst": "n9"},
+        ],
+    )
+    new = _graph(
+        [
+            {"node_id": "n0", "kind": "ENTRY"},
+            {"node_id": "a", "kind": "TASK", "task_id": "train", "meta": {"gpus": 2}},
+            {"node_id": "c", "kind": "TASK", "task_id": "publish"},
+            {"node_id": "n9", "kind": "EXIT"},
+        ],
+        [
+            {"src": "n0", "dst": "a"},
+            {"src": "a", "dst": "c"},
+            {"src": "c", "dst": "n9"},
+        ],
+    )
+    d = diff_graph_ir(old, new)
+
+    assert d.added_nodes == {"c"}
+    assert d.removed_nodes == {"b"}
+    assert d.changed_nodes == {"a"}
+    assert d.added_edges == {("a", "c", None), ("c", "n9", None)}
+    assert d.removed_edges == {("a", "b", None), ("b", "n9", None)}
+    assert d.changed_edges == frozenset()
+    assert not d.entry_changed and not d.exit_changed
+    assert {"a", "c", "n9"} <= d.touched_nodes()
+
+
+def test_GraphDiff_detects_edge_content_change():
+    nodes = [{"node_id": "n0", "kind": "ENTRY"}, {"node_id": "n9", "kind": "EXIT"}]
+    old = _graph(nodes, [{"src": "n0", "dst": "n9", "guard": "g1"}])
+    new = _graph(nodes, [{"src": "n0", "dst": "n9", "guard": "g2"}])
+    d = diff_graph_ir(old, new)
+    assert d.changed_edges == {("n0", "n9", None)}
+    assert not d.added_edges and not d.removed_edges
+
+
+def test_GraphDiff_meta_changes_with_equal_hashes_are_detected():
+    """
+    hash(-1) == hash(-2) and 1 == True == 1.0: content is compared with type tags,
+    not through hash().
+    """
+    pairs = [(-1, -2), (1, True), (1, 1.0), ([1], (1,)), ({"a": 1}, {"a": 1.0}), (0.0, -0.0)]
+    for before, after in pairs:
+        old = _graph(
+            [
+                {"node_id": "n0", "kind": "ENTRY"},
+                {"node_id": "a", "kind": "TASK", "task_id": "t", "meta": {"priority": before}},
+                {"node_id": "n9", "kind": "EXIT"},
+            ],
+            [{"src": "n0", "dst": "a", "meta": {"w": before}}, {"src": "a", "dst": "n9"}],
+        )
+        new = _graph(
+            [
+                {"node_id": "n0", "kind": "ENTRY"},
+                {"node_id": "a", "kind": "TASK", "task_id": "t", "meta": {"priority": after}},
+                {"node_id": "n9", "kind": "EXIT"},
+            ],
+            [{"src": "n0", "dst": "a", "meta": {"w": after}}, {"src": "a", "dst": "n9"}],
+        )
+        d = diff_graph_ir(old, new)
+        assert d.changed_nodes == {"a"}, (before, after)
+        assert d.changed_edges == {("n0", "a", None)}, (before, after)
+
+
+def test_GraphDiff_equal_meta_is_unchanged():
+    meta = {"priority": float("nan"), "tags": ["x", "y"], "opts": {"b": 1, 2: "a"}}
+    nodes = [
+        {"node_id": "n0", "kind": "ENTRY"},
+        {"node_id": "a", "kind": "TASK", "task_id": "t", "meta": meta},
+        {"node_id": "n9", "kind": "EXIT"},
+    ]
+    edges = [{"src": "n0", "dst": "a"}, {"src": "a", "dst": "n9"}]
+    assert diff_graph_ir(_graph(nodes, edges), _graph(nodes, edges)).is_empty
+
+
+def test_GraphDiff_sees_meta_edited_in_place():
+    """
+    Node.meta is a mutable dict on a frozen graph; fingerprints must not go stale.
+    """
+    nodes = [
+        {"node_id": "n0", "kind": "ENTRY"},
+        {"node_id": "a", "kind": "TASK", "task_id": "t", "meta": {"partition": 0}},
+        {"node_id": "n9", "kind": "EXIT"},
+    ]
+    edges = [{"src": "n0", "dst": "a"}, {"src": "a", "dst": "n9"}]
+    old, new = _graph(nodes, edges), _graph(nodes, edges)
+    before = graph_fingerprint(new)
+    assert diff_graph_ir(old, new).is_empty
+
+    new.nodes[1].meta["partition"] = 1
+    assert graph_fingerprint(new) != before
+    assert diff_graph_ir(old, new).changed_nodes == {"a"}
@@ -0,0 +1,142 @@
+# tests/engine/test_ArrayFrontier.py
+from __future__ import annotations
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from balikrun.engine.arraystate import ArrayFrontier  # noqa: E402
+from balikrun.engine.scheduler import Frontier, GraphIndex, NodeState, ready_nodes  # noqa: E402
+from balikrun.ir import GraphIR  # noqa: E402
+
+
+def _random_dag(n_tasks: int, seed: int) -> GraphIR:
+    """
+    Layered DAG of TASKs with FORK/JOIN/MERGE(OR) control nodes sprinkled in.
+    """
+    rng = random.Random(seed)
+    nodes = [{"node_id": "entry", "kind": "ENTRY"}]
+    edges = []
+    layers = [["entry"]]
+    k = 0
+    while k < n_tasks:
+        layer = []
+        for _ in range(rng.randint(1, 6)):
+            roll = rng.random()
+            if roll < 0.15:
+                node = {"node_id": f"c{k}", "kind": "JOIN"}
+            elif roll < 0.25:
+                node = {"node_id": f"c{k}", "kind": "MERGE", "meta": {"join": "OR"}}
+            else:
+                node = {"node_id": f"t{k}", "kind": "TASK", "task_id": "t"}
+            k += 1
+            nodes.append(node)
+            layer.append(node["node_id"])
+            prev = [x for layer_ in layers[-2:] for x in layer_]
+            for src in rng.sample(prev, rng.randint(1, min(3, len(prev)))):
+                edges.append({"src": src, "dst": node["node_id"]})
+        layers.append(layer)
+    nodes.append({"node_id": "exit", "kind": "EXIT"})
+    has_succ = {e["src"] for e in edges}
+    for node in nodes[:-1]:
+        if node["node_id"] not in has_succ:
+            edges.append({"src": node["node_id"], "dst": "exit"})
+    return GraphIR.model_validate(
+        {"graph_id": "dag", "nodes": nodes, "edges": edges, "entry_id": "entry", "exit_id": "exit"}
+    )
+
+
+def _pending_free(states):
+    return {k: v for k, v in states.items() if v != NodeState.PENDING}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ArrayFrontier_matches_Frontier_and_ready_nodes(seed):
+    gi = GraphIndex.from_graph(_random_dag(200, seed))
+    ref = Frontier(gi)
+    arr = ArrayFrontier(gi)
+    ref.start()
+    arr.start()
+    rng = random.Random(seed)
+    in_flight: list[int] = []
+    while not ref.done:
+        ready = set(ref.peek())
+        assert {gi.node_ids[i] for i in arr.peek().tolist()} == ready
+        assert set(ready_nodes(gi, ref.states)) == ready
+        assert arr.node_states() == _pending_free(ref.states)
+        # Queue order differs (Frontier wakes nodes one completion at a time); lease
+        # the same nodes on both sides.
+        taken = arr.take(rng.randint(1, 8))
+        assert sorted(ref.take_ids(gi.node_ids[i] for i in taken.tolist())) == sorted(
+            gi.node_ids[i] for i in taken.tolist()
+        )
+        in_flight += taken.tolist()
+        rng.shuffle(in_flight)
+        k = rng.randint(1, len(in_flight))
+        batch, in_flight = in_flight[:k], in_flight[k:]
+        for i in batch:
+            ref.complete(gi.node_ids[i])
+        arr.complete(np.array(batch))
+    assert arr.done
+    assert arr.node_states() == _pending_free(ref.states)
+    assert int(arr.attempts.sum()) == sum(1 for n in gi.graph.nodes if n.kind == "TASK")
+
+
+def test_ArrayFrontier_requeue_fail_and_rejects_decisions():
+    gi = GraphIndex.from_graph(_random_dag(20, 0))
+    arr = ArrayFrontier(gi)
+    arr.start()
+    first = arr.take(2)
+    arr.requeue(first[:1])
+    assert arr.in_flight == 1
+    again = arr.take(1)
+    assert again.tolist() == first[:1].tolist()
+    assert arr.attempts[again[0]] == 2
+    arr.fail(first[1])
+    assert arr.failed
+    arr.complete(first[1])  # no longer in flight: ignored
+    assert arr.node_states()[gi.node_ids[int(first[1])]] == NodeState.FAILED
+
+    g = GraphIR.model_validate(
+        {
+            "graph_id": "d",
+            "nodes": [{"node_id": "entry", "kind": "ENTRY"}, {"node_id": "d", "kind": "DECISION"},
+                      {"node_id": "exit", "kind": "EXIT"}],
+            "edges": [{"src": "entry", "dst": "d"}, {"src": "d", "dst": "exit"}],
+            "entry_id": "entry",
+            "exit_id": "exit",
+        }
+    )
+    with pytest.raises(ValueError, match="DECISION"):
+        ArrayFrontier(GraphIndex.from_graph(g))
+
+
+def test_ArrayFrontier_ignores_duplicate_and_finished_ids():
+    nodes = [{"node_id": n, "kind": n.upper()} for n in ("entry", "fork", "join", "exit")]
+    nodes += [{"node_id": t, "kind": "TASK", "task_id": "t"} for t in ("a", "b")]
+    edges = [("entry", "fork"), ("fork", "a"), ("fork", "b"), ("a", "join"), ("b", "join")]
+    edges.append(("join", "exit"))
+    g = GraphIR.model_validate(
+        {
+            "graph_id": "fj",
+            "nodes": nodes,
+            "edges": [{"src": s, "dst": d} for s, d in edges],
+            "entry_id": "entry",
+            "exit_id": "exit",
+        }
+    )
+    gi = GraphIndex.from_graph(g)
+    a, b = gi.index["a"], gi.index["b"]
+    arr = ArrayFrontier(gi)
+    arr.start()
+    assert sorted(arr.take(2).tolist()) == sorted([a, b])
+    arr.complete([a, a])
+    assert arr.in_flight == 1
+    assert not arr.done
+    assert "join" not in arr.node_states()  # still PENDING: b is in flight
+    arr.complete([a, b, b])  # a already completed: ignored
+    assert arr.in_flight == 0
+    assert arr.done
+    assert arr.remaining[gi.index["join"]] == 0
@@ -0,0 +1,137 @@
+# tests/engine/test_ArtifactRefs.py
+from __future__ import annotations
+
+import functools
+
+from balikrun.engine.artifacts import ArtifactRefs, ArtifactStore
+from balikrun.engine.distributed import Coordinator, LocalBroker, TaskContext
+from balikrun.engine.scheduler import Frontier, GraphIndex
+from balikrun.ir import GraphIR
+
+
+def _graph(nodes: list[dict], edges: list[tuple], entry: str = "entry", exit: str = "exit") -> GraphIR:
+    return GraphIR.model_validate(
+        {
+            "graph_id": "g",
+            "nodes": nodes,
+            "edges": [
+                {"src": e[0], "dst": e[1], **({"guard": e[2]} if len(e) > 2 else {})} for e in edges
+            ],
+            "entry_id": entry,
+            "exit_id": exit,
+        }
+    )
+
+
+def _task(node_id: str) -> dict:
+    return {"node_id": node_id, "kind": "TASK", "task_id": node_id}
+
+
+def _ctrl(node_id: str, kind: str) -> dict:
+    return {"node_id": node_id, "kind": kind}
+
+
+class _Run:
+    """
+    Drives a Frontier by hand; every TASK writes one output before completing.
+    """
+
+    def __init__(self, g: GraphIR, store: ArtifactStore, decide=None):
+        self.store = store
+        gi = GraphIndex.from_graph(g)
+        self.refs = ArtifactRefs(gi, store, "r")
+        self.frontier = Frontier(gi, decide=decide, on_state=self.refs.on_state)
+        self.frontier.start()
+
+    def run(self, node_id: str) -> None:
+        assert node_id in self.frontier.take_ids([node_id])
+        self.store.put("r", node_id, "out", node_id.encode())
+        self.frontier.complete(node_id)
+
+    def has(self, node_id: str) -> bool:
+        return self.store.exists("r", node_id, "out")
+
+
+def test_ArtifactRefs_collects_outputs_once_consumers_finish(tmp_path):
+    g = _graph(
+        [_ctrl("entry", "ENTRY"), _task("a"), _ctrl("fork", "FORK"), _task("b"), _task("c"),
+         _ctrl("join", "JOIN"), _task("d"), _ctrl("exit", "EXIT")],
+        [("entry", "a"), ("a", "fork"), ("fork", "b"), ("fork", "c"), ("b", "join"), ("c", "join"),
+         ("join", "d"), ("d", "exit")],
+    )
+    r = _Run(g, ArtifactStore(tmp_path))
+    assert r.refs.inputs("d") == ("b", "c")
+    r.run("a")
+    r.run("b")
+    assert r.has("a")  # c still needs it
+    r.run("c")
+    assert not r.has("a")
+    assert r.has("b") and r.has("c")
+    r.run("d")
+    assert not r.has("b") and not r.has("c")
+    assert r.has("d")  # consumed by EXIT: the run's result
+    assert r.frontier.done
+    assert r.refs.live == ["d"]
+    assert r.refs.finish() == 0
+
+
+def test_ArtifactRefs_skipped_branch_releases_its_reference(tmp_path):
+    g = _graph(
+        [_ctrl("entry", "ENTRY"), _task("a"), _ctrl("d", "DECISION"), _task("yes"), _task("no"),
+         _ctrl("m", "MERGE"), _ctrl("exit", "EXIT")],
+        [("entry", "a"), ("a", "d"), ("d", "yes", "ok"), ("d", "no"), ("yes", "m"), ("no", "m"), ("m", "exit")],
+    )
+    r = _Run(g, ArtifactStore(tmp_path), decide=lambda node, edges: ["no"])
+    r.run("a")
+    assert r.has("a")
+    r.run("no")
+    assert not r.has("a")
+
+
+def test_ArtifactRefs_holds_loop_inputs_until_the_loop_exits(tmp_path):
+    """
+    entry -> a -> m(MERGE) -> body -> d(DECISION) -> m (again) | post -> exit
+    """
+    g = _graph(
+        [_ctrl("entry", "ENTRY"), _task("a"), _ctrl("m", "MERGE"), _task("body"), _ctrl("d", "DECISION"),
+         _task("post"), _ctrl("exit", "EXIT")],
+        [("entry", "a"), ("a", "m"), ("m", "body"), ("body", "d"), ("d", "m", "again"), ("d", "post"),
+         ("post", "exit")],
+    )
+    rounds = iter([["m"], ["m"], ["post"]])
+    r = _Run(g, ArtifactStore(tmp_path), decide=lambda node, edges: next(rounds))
+    r.run("a")
+    for _ in range(3):
+        r.run("body")
+        assert r.has("a")  # the body runs again and reads it
+        assert r.has("body")  # the next iteration reads the previous one's output
+    # Leaving the loop (post is leased) releases a, and body's back-edge reference.
+    r.run("post")
+    assert not r.has("a")
+    assert not r.has("body")
+    assert r.has("post")
+
+
+def produce(root: str, ctx: TaskContext) -> int:
+    store = ArtifactStore(root)
+    inputs = [bytes(store.get(ctx.run_id, n, "out")) for n in ctx.inputs]
+    store.put(ctx.run_id, ctx.node_id, "out", b"".join(inputs) + ctx.node_id.encode())
+    return len(inputs)
+
+
+def test_Coordinator_passes_artifacts_and_collects_intermediates(tmp_path):
+    g = _graph(
+        [_ctrl("entry", "ENTRY"), *[{"node_id": n, "kind": "TASK", "task_id": "produce"} for n in "abc"],
+         _ctrl("exit", "EXIT")],
+        [("entry", "a"), ("a", "b"), ("b", "c"), ("c", "exit")],
+    )
+    store = ArtifactStore(tmp_path)
+    coord = Coordinator(g, run_id="r", artifacts=store)
+    with LocalBroker() as broker:
+        broker.spawn_workers(1, {"produce": functools.partial(produce, str(tmp_path))}, capacity=1)
+        result = coord.run(broker, timeout=60)
+
+    assert result.ok
+    assert result.outputs == {"a": 0, "b": 1, "c": 1}
+    assert bytes(store.get("r", "c", "out")) == b"abc"
+    assert store.names("r", "a") == [] and store.names("r", "b") == []
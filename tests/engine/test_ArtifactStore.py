@@ -0,0 +1,83 @@
+# tests/engine/test_ArtifactStore.py
+from __future__ import annotations
+
+import pytest
+
+from balikrun.engine.artifacts import ArtifactStore
+
+
+def test_ArtifactStore_round_trips_bytes_as_read_only_mmap(tmp_path):
+    store = ArtifactStore(tmp_path)
+    store.put("r", "n1", "blob", b"hello")
+    view = store.get("r", "n1", "blob")
+    assert isinstance(view, memoryview)
+    assert view.readonly
+    assert bytes(view) == b"hello"
+
+    store.put("r", "n1", "empty", b"")
+    assert bytes(store.get("r", "n1", "empty")) == b""
+
+
+def test_ArtifactStore_round_trips_arrays_zero_copy(tmp_path):
+    np = pytest.importorskip("numpy")
+    store = ArtifactStore(tmp_path)
+    arr = np.arange(12, dtype=np.float32).reshape(3, 4)
+    store.put("r", "n1", "x", arr)
+    out = store.get("r", "n1", "x")
+    assert isinstance(out, np.memmap)
+    assert out.dtype == np.float32 and out.shape == (3, 4)
+    assert np.array_equal(out, arr)
+    with pytest.raises(ValueError):
+        out[0, 0] = 1.0
+
+
+def test_ArtifactStore_pickles_other_values_and_stores_files(tmp_path):
+    store = ArtifactStore(tmp_path / "store")
+    store.put("r", "n1", "meta", {"rows": 3})
+    assert store.get("r", "n1", "meta") == {"rows": 3}
+
+    src = tmp_path / "report.csv"
+    src.write_bytes(b"a,b\n1,2\n")
+    store.put_file("r", "n1", "report", src)
+    assert src.exists()
+    assert bytes(store.get("r", "n1", "report")) == b"a,b\n1,2\n"
+    store.put_file("r", "n2", "report", src, move=True)
+    assert not src.exists()
+    assert store.path("r", "n2", "report").read_bytes() == b"a,b\n1,2\n"
+
+
+def test_ArtifactStore_is_write_once(tmp_path):
+    store = ArtifactStore(tmp_path)
+    store.put("r", "n1", "x", b"1")
+    with pytest.raises(ValueError, match="already written"):
+        store.put("r", "n1", "x", {"other": "format"})
+    with pytest.raises(ValueError, match="already written"):
+        store.put("r", "n1", "x", b"2")
+    assert bytes(store.get("r", "n1", "x")) == b"1"
+    assert store.names("r", "n1") == ["x"]
+
+
+def test_ArtifactStore_rewriting_identical_content_succeeds(tmp_path):
+    # A speculative duplicate of a deterministic task writes the same bytes again.
+    store = ArtifactStore(tmp_path)
+    first = store.put("r", "n1", "x", {"loss": 0.1})
+    assert store.put("r", "n1", "x", {"loss": 0.1}) == first
+    assert store.get("r", "n1", "x") == {"loss": 0.1}
+    assert sorted(p.name for p in first.parent.iterdir()) == [first.name]
+
+
+def test_ArtifactStore_encodes_keys_and_deletes(tmp_path):
+    store = ArtifactStore(tmp_path)
+    store.put("r", "../escape", "a/b", b"1")
+    store.put("r", "n1", ".hidden", b"2")
+    assert store.names("r", "../escape") == ["a/b"]
+    assert store.names("r", "n1") == [".hidden"]
+    assert all(p.is_relative_to(tmp_path) for p in tmp_path.rglob("*"))
+
+    assert store.nbytes("r") == 2
+    assert store.delete("r", "n1") == 1
+    assert not store.exists("r", "n1", ".hidden")
+    with pytest.raises(KeyError):
+        store.get("r", "n1", ".hidden")
+    store.drop_run("r")
+    assert store.nbytes() == 0
@@ -0,0 +1,307 @@
+# tests/engine/test_Coordinator.py
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+import pytest
+
+from balikrun.engine.distributed import Coordinator, LocalBroker, TaskContext
+from balikrun.engine.events import EventLog, EventType
+from balikrun.engine.leases import LeaseManager
+from balikrun.engine.partition import assign_partitions
+from balikrun.engine.retries import SpeculationPolicy
+from balikrun.engine.scheduler import NodeState, ready_nodes
+from balikrun.engine.tracing import Phase, Tracer
+from balikrun.ir import GraphIR, NodeKind
+
+
+def _fan_out(n: int, task_id: Optional[str] = None) -> GraphIR:
+    nodes = [{"node_id": "entry", "kind": "ENTRY"}, {"node_id": "fork", "kind": "FORK"}]
+    edges = [{"src": "entry", "dst": "fork"}]
+    for i in range(n):
+        nodes.append({"node_id": f"t{i}", "kind": "TASK", "task_id": task_id or ("square" if i else "boom")})
+        edges += [{"src": "fork", "dst": f"t{i}"}, {"src": f"t{i}", "dst": "join"}]
+    nodes += [{"node_id": "join", "kind": "JOIN"}, {"node_id": "exit", "kind": "EXIT"}]
+    edges.append({"src": "join", "dst": "exit"})
+    return GraphIR.model_validate(
+        {"graph_id": "fan", "nodes": nodes, "edges": edges, "entry_id": "entry", "exit_id": "exit"}
+    )
+
+
+def square(ctx: TaskContext) -> int:
+    time.sleep(0.002)
+    return int(ctx.node_id[1:]) ** 2
+
+
+def boom(ctx: TaskContext) -> None:
+    raise RuntimeError("boom")
+
+
+def test_Coordinator_runs_fan_out_across_worker_processes():
+    log = EventLog()
+    coord = Coordinator(_fan_out(40), run_id="r", log=log, max_batch=4)
+    with LocalBroker() as broker:
+        broker.spawn_workers(2, {"square": square, "boom": square}, capacity=4)
+        result = coord.run(broker, timeout=60)
+
+    assert result.ok
+    assert result.outputs == {f"t{i}": i * i for i in range(40)}
+    assert sum(result.tasks_per_worker.values()) == 40
+    completed = [
+        e for e in log.read("r") if e.type == EventType.NODE_STATE and e.state == NodeState.COMPLETED
+    ]
+    # Every node commits exactly once.
+    assert sorted(e.node_id for e in completed) == sorted(n.node_id for n in coord.graph.nodes)
+    assert log.read("r")[-1].type == EventType.RUN_FINISHED
+
+
+def test_Coordinator_stops_on_task_failure():
+    coord = Coordinator(_fan_out(3), run_id="r")
+    with LocalBroker() as broker:
+        broker.spawn_workers(1, {"square": square, "boom": boom}, capacity=2)
+        result = coord.run(broker, timeout=60)
+
+    assert not result.ok
+    assert result.states["t0"] == NodeState.FAILED
+    assert "RuntimeError: boom" in result.errors["t0"]
+
+
+def test_Coordinator_records_lifecycle_spans_per_task():
+    tracer = Tracer()
+    coord = Coordinator(_fan_out(6), run_id="r", tracer=tracer)
+    with LocalBroker() as broker:
+        broker.spawn_workers(1, {"square": square, "boom": square}, capacity=2)
+        assert coord.run(broker, timeout=60).ok
+
+    by_phase: dict[str, set] = {}
+    for name, start, end, node_id, task_id, tid in tracer.spans():
+        assert end >= start
+        by_phase.setdefault(name, set()).add(node_id)
+    tasks = {f"t{i}" for i in range(6)}
+    for phase in (Phase.QUEUE_WAIT, Phase.COMPUTE, Phase.REPORT, Phase.COMMIT):
+        assert by_phase[phase] == tasks
+    assert Phase.SCHEDULE in by_phase
+
+
+def _memory_graph() -> GraphIR:
+    nodes = [{"node_id": "entry", "kind": "ENTRY"}, {"node_id": "fork", "kind": "FORK"}]
+    edges = [{"src": "entry", "dst": "fork"}]
+    for i in range(6):
+        resources = {"cpu": 1, "memory_mb": 6_000 if i < 2 else 100}
+        nodes.append({"node_id": f"t{i}", "kind": "TASK", "task_id": "square", "meta": {"resources": resources}})
+        edges += [{"src": "fork", "dst": f"t{i}"}, {"src": f"t{i}", "dst": "join"}]
+    nodes += [{"node_id": "join", "kind": "JOIN"}, {"node_id": "exit", "kind": "EXIT"}]
+    edges.append({"src": "join", "dst": "exit"})
+    return GraphIR.model_validate(
+        {"graph_id": "mem", "nodes": nodes, "edges": edges, "entry_id": "entry", "exit_id": "exit"}
+    )
+
+
+def test_Coordinator_bin_packs_leases_onto_advertised_resources():
+    log = EventLog()
+    coord = Coordinator(_memory_graph(), run_id="r", log=log, max_batch=4)
+    with LocalBroker() as broker:
+        broker.spawn_workers(1, {"square": square}, capacity=4, resources={"cpu": 4, "memory_mb": 1_000}, prefix="small")
+        broker.spawn_workers(1, {"square": square}, capacity=4, resources={"cpu": 4, "memory_mb": 8_000}, prefix="big")
+        result = coord.run(broker, timeout=60)
+
+    assert result.ok
+    workers = {
+        e.node_id: e.data["worker_id"]
+        for e in log.read("r")
+        if e.type == EventType.NODE_STATE and e.state == NodeState.COMPLETED and e.data
+    }
+    # Memory-heavy tasks only fit the big worker; all resources are returned at the end.
+    assert workers["t0"].startswith("big") and workers["t1"].startswith("big")
+    assert coord.packer.utilization() == (0.0, 0.0, 0.0)
+
+
+def test_Coordinator_fails_a_task_no_worker_can_fit():
+    log = EventLog()
+    coord = Coordinator(_memory_graph(), run_id="r", log=log, placement_timeout=0.2)
+    t0 = time.perf_counter()
+    with LocalBroker() as broker:
+        small = {"cpu": 4, "memory_mb": 1_000}
+        broker.spawn_workers(1, {"square": square}, capacity=4, resources=small)
+        result = coord.run(broker)
+
+    assert not result.ok
+    assert set(result.errors) == {"t0", "t1"}
+    assert "exceed the capacity of every worker" in result.errors["t0"]
+    assert result.states["t0"] == NodeState.FAILED
+    assert time.perf_counter() - t0 < 30
+
+
+def slow_first(ctx: TaskContext) -> int:
+    time.sleep(1.0 if ctx.node_id == "t0" else 0.01)
+    return ctx.attempt
+
+
+def test_Coordinator_heartbeats_keep_long_tasks_leased():
+    # t0 outlives the ttl several times over, and t1 waits behind it on the same worker.
+    coord = Coordinator(_fan_out(2, "work"), run_id="r", leases=LeaseManager(ttl=0.3))
+    with LocalBroker() as broker:
+        broker.spawn_workers(1, {"work": slow_first}, capacity=2)
+        result = coord.run(broker, timeout=30)
+
+    assert result.ok
+    assert result.outputs == {"t0": 1, "t1": 1}
+    assert coord.leases.attempts("t0") == coord.leases.attempts("t1") == 1
+
+
+def flaky(ctx: TaskContext) -> int:
+    if ctx.attempt < 3:
+        raise RuntimeError(f"flaky {ctx.attempt}")
+    return ctx.attempt
+
+
+def _retried(max_attempts: int) -> GraphIR:
+    retry = {"max_attempts": max_attempts, "backoff": 0.01, "jitter": 0.0}
+    return GraphIR.model_validate(
+        {
+            "graph_id": "retry",
+            "nodes": [
+                {"node_id": "entry", "kind": "ENTRY"},
+                {"node_id": "t", "kind": "TASK", "task_id": "flaky", "meta": {"retry": retry}},
+                {"node_id": "exit", "kind": "EXIT"},
+            ],
+            "edges": [{"src": "entry", "dst": "t"}, {"src": "t", "dst": "exit"}],
+            "entry_id": "entry",
+            "exit_id": "exit",
+        }
+    )
+
+
+def test_Coordinator_retries_failed_tasks_with_backoff():
+    g = _retried(3)
+    log = EventLog()
+    coord = Coordinator(g, run_id="r", log=log)
+    with LocalBroker() as broker:
+        broker.spawn_workers(1, {"flaky": flaky}, capacity=1)
+        result = coord.run(broker, timeout=60)
+
+    assert result.ok
+    assert result.outputs == {"t": 3}
+    assert result.retries == 2
+    events = [e for e in log.read("r") if e.type == EventType.NODE_STATE and e.node_id == "t"]
+    assert [e.state for e in events] == [
+        NodeState.LEASED, NodeState.FAILED, NodeState.PENDING,
+        NodeState.LEASED, NodeState.FAILED, NodeState.PENDING,
+        NodeState.LEASED, NodeState.COMPLETED,
+    ]
+    assert [e.attempt for e in events if e.state in (NodeState.FAILED, NodeState.COMPLETED)] == [1, 2, 3]
+    failed = [e for e in log.read("r") if e.node_id == "t" and e.state == NodeState.FAILED]
+    assert [e.data["retry_in"] for e in failed] == [0.01, 0.02]
+
+    # Out of attempts: the node fails the run.
+    coord = Coordinator(_retried(2), run_id="r2")
+    with LocalBroker() as broker:
+        broker.spawn_workers(1, {"flaky": flaky}, capacity=1)
+        result = coord.run(broker, timeout=60)
+    assert not result.ok
+    assert "flaky 2" in result.errors["t"]
+
+
+def straggle(ctx: TaskContext) -> int:
+    time.sleep(1 if ctx.node_id == "t0" and ctx.attempt == 1 else 0.005)
+    return ctx.attempt
+
+
+def test_Coordinator_speculates_stragglers_and_commits_once():
+    log = EventLog()
+    coord = Coordinator(
+        _fan_out(12, "work"), run_id="r", log=log, max_batch=1,
+        speculation=SpeculationPolicy(percentile=0.9, multiplier=2.0, min_samples=5),
+    )
+    with LocalBroker() as broker:
+        broker.spawn_workers(2, {"work": straggle}, capacity=1)
+        result = coord.run(broker, timeout=60)
+
+    assert result.ok
+    assert result.speculated == 1
+    assert result.outputs["t0"] == 2  # the duplicate won; the straggler's late result is dropped
+    attempts = [e.data for e in log.read("r") if e.type == EventType.ATTEMPT]
+    assert [a["action"] for a in attempts] == ["speculate", "cancelled"]
+    assert attempts[1]["winner"] == attempts[0]["lease_id"]
+    completed = [e for e in log.read("r") if e.node_id == "t0" and e.state == NodeState.COMPLETED]
+    assert len(completed) == 1 and completed[0].data["speculative"]
+
+
+def steady(ctx: TaskContext) -> int:
+    time.sleep(0.02)
+    return 1
+
+
+def test_Coordinator_does_not_speculate_queued_leases():
+    """
+    Leases waiting in a worker's backlog are not stragglers: runtimes come from the
+    worker's own timestamps, and an idle worker steals unstarted leases instead of
+    duplicating them.
+    """
+    coord = Coordinator(
+        _fan_out(48, "work"), run_id="r", max_batch=8,
+        speculation=SpeculationPolicy(percentile=0.5, multiplier=1.5, min_samples=3),
+    )
+    with LocalBroker() as broker:
+        broker.spawn_workers(2, {"work": steady}, capacity=8)
+        result = coord.run(broker, timeout=60)
+
+    assert result.ok
+    assert result.speculated == 0
+    assert coord.runtimes.percentile("work", 0.5) < 0.1
+
+
+@pytest.mark.parametrize("capacity", [1, 4])
+def test_Coordinator_keeps_a_partition_on_one_worker(capacity: int):
+    nodes = [{"node_id": n, "kind": n.upper()} for n in ("entry", "fork", "join", "exit")]
+    edges = [{"src": "entry", "dst": "fork"}, {"src": "join", "dst": "exit"}]
+    for i in range(4):
+        prev = "fork"
+        for j in range(8):
+            nodes.append({"node_id": f"t{i}{j}", "kind": "TASK", "task_id": "square"})
+            edges.append({"src": prev, "dst": f"t{i}{j}", "meta": {"artifact_bytes": 1e6}})
+            prev = f"t{i}{j}"
+        edges.append({"src": prev, "dst": "join"})
+    g = assign_partitions(
+        GraphIR.model_validate(
+            {"graph_id": "pipes", "nodes": nodes, "edges": edges, "entry_id": "entry", "exit_id": "exit"}
+        ),
+        2,
+    )
+    log = EventLog()
+    coord = Coordinator(g, run_id="r", log=log)
+    with LocalBroker() as broker:
+        broker.spawn_workers(2, {"square": square}, capacity=capacity)
+        assert coord.run(broker, timeout=60).ok
+
+    # Affinity's guarantee (LeaseManager.prefer): a partition is bound to the worker
+    # that first leases from it, one grant claims at most one unbound partition, and a
+    # worker only takes another worker's node when none of its own or unbound
+    # partitions' nodes is ready. Replay the log to check every lease against the
+    # ready set at that moment; a grant's LEASED events are consecutive.
+    part = {n.node_id: n.meta["partition"] for n in g.nodes if n.kind == NodeKind.TASK}
+    events = [e for e in log.read("r") if e.type == EventType.NODE_STATE]
+    worker = {
+        e.node_id: e.data["worker_id"]
+        for e in events
+        if e.state == NodeState.COMPLETED and e.node_id in part
+    }
+    owner: dict[int, str] = {}
+    states: dict[str, NodeState] = {}
+    batch: tuple[str, set[int]] = ("", set())  # (worker_id, partitions it claimed)
+    for e in events:
+        if e.state != NodeState.LEASED:
+            batch = ("", set())
+        else:
+            w, p = worker[e.node_id], part[e.node_id]
+            if batch[0] != w:
+                batch = (w, set())
+            if p not in owner:
+                batch[1].add(p)
+                assert len(batch[1]) == 1, e.node_id
+            if owner.setdefault(p, w) != w:
+                ready = [n for n in ready_nodes(coord.gi, states) if n in part]
+                assert all(owner.get(part[n], w) != w for n in ready), e.node_id
+        states[e.node_id] = e.state
+    assert set(owner) == {0, 1}
@@ -0,0 +1,80 @@
+# tests/engine/test_EventLog.py
+from __future__ import annotations
+
+from balikrun.engine.events import EventLog, EventType
+from balikrun.engine.scheduler import NodeState
+
+
+def test_EventLog_assigns_increasing_seq_and_reads_per_run():
+    log = EventLog()
+    log.append("r1", EventType.RUN_CREATED)
+    log.append("r2", EventType.RUN_CREATED)
+    e = log.append("r1", EventType.NODE_STATE, node_id="n1", state=NodeState.RUNNING)
+
+    assert [x.seq for x in log] == [0, 1, 2]
+    assert [x.seq for x in log.read("r1")] == [0, 2]
+    assert log.read("r1", after=0) == [e]
+    assert [x.seq for x in log.read(after=0, limit=1)] == [1]
+
+
+def test_EventLog_notifies_listeners_on_append():
+    log = EventLog()
+    seen = []
+    unsubscribe = log.subscribe(seen.append)
+    log.append("r1", EventType.RUN_CREATED)
+    unsubscribe()
+    log.append("r1", EventType.RUN_FINISHED)
+    assert [x.type for x in seen] == [EventType.RUN_CREATED]
+
+
+def test_EventLog_listeners_may_append():
+    log = EventLog()
+    seen: list[tuple[str, int]] = []
+
+    def echo(event):
+        seen.append(("echo", event.seq))
+        if event.type == EventType.RUN_CREATED:
+            log.append(event.run_id, EventType.RUN_FINISHED)
+
+    log.subscribe(echo)
+    log.subscribe(lambda event: seen.append(("tail", event.seq)))
+    log.append("r1", EventType.RUN_CREATED)
+    # Every listener sees event 0 before any sees event 1.
+    assert seen == [("echo", 0), ("tail", 0), ("echo", 1), ("tail", 1)]
+    assert [e.type for e in log.read("r1")] == [EventType.RUN_CREATED, EventType.RUN_FINISHED]
+
+
+def test_EventLog_query_by_node_task_and_time_range():
+    log = EventLog(bucket_seconds=10)
+    for run_id in ("r1", "r2"):
+        log.append(run_id, EventType.RUN_CREATED)
+        for i in range(20):
+            log.append(
+                run_id,
+                EventType.NODE_STATE,
+                node_id=f"n{i % 4}",
+                task_id="train" if i % 2 else "eval",
+                state=NodeState.COMPLETED,
+                attempt=i // 4,
+            )
+    events = list(log)
+
+    def scan(run_id=None, node_id=None, task_id=None, since=None, until=None):
+        return [
+            e for e in events
+            if (run_id is None or e.run_id == run_id)
+            and (node_id is None or e.node_id == node_id)
+            and (task_id is None or e.task_id == task_id)
+            and (since is None or e.ts >= since)
+            and (until is None or e.ts <= until)
+        ]
+
+    assert log.query(node_id="n1") == scan(node_id="n1")
+    assert [e.attempt for e in log.query(run_id="r2", node_id="n1")] == [0, 1, 2, 3, 4]
+    assert log.query(run_id="r1", task_id="train") == scan(run_id="r1", task_id="train")
+    assert log.query(task_id="nope") == []
+    mid = events[10].ts
+    assert log.query(task_id="eval", since=mid) == scan(task_id="eval", since=mid)
+    assert log.query(until=mid) == scan(until=mid)
+    assert log.query(type=EventType.RUN_CREATED) == [events[0], events[21]]
+    assert log.query(node_id="n0", after=events[5].seq, limit=2) == scan(node_id="n0")[2:4]
@@ -0,0 +1,68 @@
+# tests/engine/test_EventSegments.py
+from __future__ import annotations
+
+import pytest
+
+from balikrun.engine.events import EventLog, EventSegments, EventType
+from balikrun.engine.scheduler import NodeState
+
+
+def _fill(log: EventLog, n: int) -> None:
+    for i in range(n):
+        log.append(
+            f"r{i % 3}",
+            EventType.NODE_STATE,
+            node_id=f"n{i % 7}",
+            task_id="train" if i % 2 else "eval",
+            state=NodeState.COMPLETED,
+        )
+
+
+def test_EventSegments_queries_match_the_in_memory_log(tmp_path):
+    log = EventLog()
+    store = EventSegments(tmp_path, segment_events=50, sparse_every=8)
+    unsubscribe = log.subscribe(store.append)
+    _fill(log, 230)
+
+    assert len(store) == 230
+    assert len(list(tmp_path.glob("*.jsonl"))) == 5
+    assert len(list(tmp_path.glob("*.idx.json"))) == 4  # the open segment has none yet
+    for kwargs in ({"run_id": "r1"}, {"node_id": "n3"}, {"run_id": "r2", "task_id": "train"},
+                   {"node_id": "n0", "after": 100, "limit": 5}, {"since": list(log)[120].ts}):
+        assert store.query(**kwargs) == log.query(**kwargs)
+    assert store.get(137) == list(log)[137]
+    assert store.get(999) is None
+    assert store.read("r0", after=200) == log.read("r0", after=200)
+    unsubscribe()
+    store.close()
+
+    # Reopen: sealed indexes load, the open segment is rescanned and appended to.
+    with EventSegments(tmp_path, segment_events=50, sparse_every=8) as again:
+        assert again.query(node_id="n5") == log.query(node_id="n5")
+        log.subscribe(again.append)
+        _fill(log, 30)
+        assert len(again) == 260
+        assert again.query(run_id="r0") == log.query(run_id="r0")
+
+
+def test_EventSegments_rebuilds_indexes_and_truncates_a_torn_tail(tmp_path):
+    log = EventLog()
+    store = EventSegments(tmp_path, segment_events=20, sparse_every=4)
+    log.subscribe(store.append)
+    _fill(log, 50)
+    store.close()
+
+    (tmp_path / "000000000000.idx.json").write_text("{not json")
+    (tmp_path / "000000000020.idx.json").unlink()
+    tail = tmp_path / "000000000040.jsonl"
+    tail.write_bytes(tail.read_bytes() + b'{"seq": 50, "run_')
+
+    store = EventSegments(tmp_path, segment_events=20, sparse_every=4)
+    assert len(store) == 50
+    assert (tmp_path / "000000000020.idx.json").exists()
+    assert store.query(node_id="n2") == log.query(node_id="n2")
+    store.rebuild()
+    assert store.query(task_id="eval") == log.query(task_id="eval")
+    with pytest.raises(ValueError):
+        store.append(list(log)[10])
+    store.close()
@@ -0,0 +1,157 @@
+# tests/engine/test_Frontier.py
+from __future__ import annotations
+
+from balikrun.engine.scheduler import Frontier, GraphIndex, NodeState
+from balikrun.ir import GraphIR
+
+
+def _graph(nodes: list[dict], edges: list[tuple], entry: str = "entry", exit: str = "exit") -> GraphIR:
+    return GraphIR.model_validate(
+        {
+            "graph_id": "g",
+            "nodes": nodes,
+            "edges": [
+                {"src": e[0], "dst": e[1], **({"guard": e[2]} if len(e) > 2 else {})} for e in edges
+            ],
+            "entry_id": entry,
+            "exit_id": exit,
+        }
+    )
+
+
+def _task(node_id: str) -> dict:
+    return {"node_id": node_id, "kind": "TASK", "task_id": node_id}
+
+
+def test_Frontier_runs_fork_join_and_completes_control_nodes_inline():
+    g = _graph(
+        [
+            {"node_id": "entry", "kind": "ENTRY"},
+            {"node_id": "fork", "kind": "FORK"},
+            _task("a"),
+            _task("b"),
+            {"node_id": "join", "kind": "JOIN"},
+            {"node_id": "exit", "kind": "EXIT"},
+        ],
+        [("entry", "fork"), ("fork", "a"), ("fork", "b"), ("a", "join"), ("b", "join"), ("join", "exit")],
+    )
+    f = Frontier(GraphIndex.from_graph(g))
+    f.start()
+    assert f.take(10) == ["a", "b"]
+    assert f.states["fork"] == NodeState.COMPLETED
+
+    f.complete("a")
+    assert "join" not in f.states
+    f.complete("b")
+    assert f.done
+
+
+def test_Frontier_decision_skips_unchosen_branch():
+    g = _graph(
+        [
+            {"node_id": "entry", "kind": "ENTRY"},
+            {"node_id": "d", "kind": "DECISION"},
+            _task("yes"),
+            _task("no"),
+            {"node_id": "m", "kind": "MERGE"},
+            {"node_id": "exit", "kind": "EXIT"},
+        ],
+        [("entry", "d"), ("d", "yes", "ok"), ("d", "no", "not_ok"), ("yes", "m"), ("no", "m"), ("m", "exit")],
+    )
+    f = Frontier(GraphIndex.from_graph(g), decide=lambda node, edges: ["no"])
+    f.start()
+    assert f.take(10) == ["no"]
+    assert f.states["yes"] == NodeState.SKIPPED
+    f.complete("no")
+    assert f.done
+
+
+def test_Frontier_loop_back_edge_resets_body():
+    """
+    entry -> m(MERGE) -> body -> d(DECISION) -> m (again) | exit
+    """
+    g = _graph(
+        [
+            {"node_id": "entry", "kind": "ENTRY"},
+            {"node_id": "m", "kind": "MERGE"},
+            _task("body"),
+            {"node_id": "d", "kind": "DECISION"},
+            {"node_id": "exit", "kind": "EXIT"},
+        ],
+        [("entry", "m"), ("m", "body"), ("body", "d"), ("d", "m", "again"), ("d", "exit", "stop")],
+    )
+    rounds = iter([["m"], ["m"], ["exit"]])
+    f = Frontier(GraphIndex.from_graph(g), decide=lambda node, edges: next(rounds))
+    f.start()
+    for _ in range(3):
+        assert f.take(1) == ["body"]
+        f.complete("body")
+    assert f.done
+    assert f.activations["body"] == 3
+
+
+def test_Frontier_requeue_returns_nodes_to_front():
+    g = _graph(
+        [{"node_id": "entry", "kind": "ENTRY"}, _task("a"), _task("b")]
+        + [{"node_id": "exit", "kind": "EXIT"}],
+        [("entry", "a"), ("entry", "b"), ("a", "exit"), ("b", "exit")],
+    )
+    f = Frontier(GraphIndex.from_graph(g))
+    f.start()
+    assert f.take(1) == ["a"]
+    f.requeue(["a"])
+    assert f.states["a"] == NodeState.PENDING
+    assert f.take(2) == ["a", "b"]
+
+
+def test_Frontier_take_ids_takes_selected_ready_nodes():
+    g = _graph(
+        [{"node_id": "entry", "kind": "ENTRY"}, _task("a"), _task("b"), _task("c"), {"node_id": "exit", "kind": "EXIT"}],
+        [("entry", "a"), ("entry", "b"), ("entry", "c"), ("a", "exit"), ("b", "exit"), ("c", "exit")],
+    )
+    f = Frontier(GraphIndex.from_graph(g))
+    f.start()
+    assert f.peek() == ["a", "b", "c"]
+    assert f.take_ids(["c", "a", "exit"]) == ["a", "c"]
+    assert f.states["c"] == NodeState.LEASED
+    assert f.peek() == ["b"]
+    assert f.in_flight == {"a", "c"}
+
+
+def test_Frontier_defer_parks_a_failed_node_until_requeued():
+    g = _graph(
+        [{"node_id": "entry", "kind": "ENTRY"}, _task("a"), {"node_id": "exit", "kind": "EXIT"}],
+        [("entry", "a"), ("a", "exit")],
+    )
+    seen = []
+    f = Frontier(GraphIndex.from_graph(g), on_state=lambda node_id, state: seen.append((node_id, state)))
+    f.start()
+    assert f.take(1) == ["a"]
+    f.defer("a")
+    assert seen[-2:] == [("a", NodeState.FAILED), ("a", NodeState.PENDING)]
+    assert not f.failed and not f.stalled
+    assert f.take(1) == []
+    f.requeue(["a"])
+    assert f.take(1) == ["a"]
+    f.complete("a")
+    assert f.done
+
+
+def test_Frontier_failed_tracks_currently_failed_nodes():
+    g = _graph(
+        [{"node_id": "entry", "kind": "ENTRY"}, _task("a"), _task("b")]
+        + [{"node_id": "exit", "kind": "EXIT"}],
+        [("entry", "a"), ("entry", "b"), ("a", "exit"), ("b", "exit")],
+    )
+    f = Frontier(GraphIndex.from_graph(g))
+    f.start()
+    assert sorted(f.take(2)) == ["a", "b"]
+    f.defer("a")
+    assert not f.failed
+    f.fail("b")
+    assert f.failed
+    f.requeue(["a"])
+    f.take(1)
+    f.fail("a")
+    assert f.failed
+    assert sum(s == NodeState.FAILED for s in f.states.values()) == 2
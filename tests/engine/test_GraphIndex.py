@@ -0,0 +1,63 @@
+# tests/engine/test_GraphIndex.py
+from __future__ import annotations
+
+from balikrun.engine.scheduler import GraphIndex, NodeState, ready_nodes
+from balikrun.ir import GraphIR
+
+
+def _fork_join(join: str = "AND") -> GraphIR:
+    return GraphIR.model_validate(
+        {
+            "graph_id": "fj",
+            "nodes": [
+                {"node_id": "entry", "kind": "ENTRY"},
+                {"node_id": "fork", "kind": "FORK"},
+                {"node_id": "a", "kind": "TASK", "task_id": "a"},
+                {"node_id": "b", "kind": "TASK", "task_id": "b"},
+                {"node_id": "join", "kind": "JOIN", "meta": {"join": join}},
+                {"node_id": "exit", "kind": "EXIT"},
+            ],
+            "edges": [
+                {"src": "entry", "dst": "fork"},
+                {"src": "fork", "dst": "a"},
+                {"src": "fork", "dst": "b"},
+                {"src": "a", "dst": "join"},
+                {"src": "b", "dst": "join"},
+                {"src": "join", "dst": "exit"},
+            ],
+            "entry_id": "entry",
+            "exit_id": "exit",
+        }
+    )
+
+
+def test_GraphIndex_adjacency():
+    gi = GraphIndex.from_graph(_fork_join())
+    assert gi.successors("fork") == ["a", "b"]
+    assert gi.predecessors("join") == ["a", "b"]
+    assert gi.descendants(["a"]) == {"a", "join", "exit"}
+
+
+def test_ready_nodes_AND_join_waits_for_all_branches():
+    gi = GraphIndex.from_graph(_fork_join())
+    assert ready_nodes(gi, {}) == ["entry"]
+
+    states = {"entry": NodeState.COMPLETED, "fork": NodeState.COMPLETED}
+    assert ready_nodes(gi, states) == ["a", "b"]
+
+    states |= {"a": NodeState.COMPLETED, "b": NodeState.RUNNING}
+    assert ready_nodes(gi, states) == []
+
+    states |= {"b": NodeState.SKIPPED}
+    assert ready_nodes(gi, states) == ["join"]
+
+
+def test_ready_nodes_OR_join_fires_on_first_branch():
+    gi = GraphIndex.from_graph(_fork_join(join="OR"))
+    states = {
+        "entry": NodeState.COMPLETED,
+        "fork": NodeState.COMPLETED,
+        "a": NodeState.COMPLETED,
+        "b": NodeState.RUNNING,
+    }
+    assert ready_nodes(gi, states) == ["join"]
@@ -0,0 +1,141 @@
+# tests/engine/test_GuardEvaluator.py
+from __future__ import annotations
+
+import pytest
+
+from balikrun.engine.distributed import Coordinator, LocalBroker, TaskContext
+from balikrun.engine.guards import GuardError, GuardEvaluator, GuardRegistry, GuardScope
+from balikrun.engine.scheduler import Frontier, GraphIndex, NodeState
+from balikrun.ir import GraphIR
+
+
+def _graph(nodes: list[dict], edges: list[tuple], entry: str = "entry", exit: str = "exit") -> GraphIR:
+    return GraphIR.model_validate(
+        {
+            "graph_id": "g",
+            "nodes": nodes,
+            "edges": [
+                {"src": e[0], "dst": e[1], **({"guard": e[2]} if len(e) > 2 else {})} for e in edges
+            ],
+            "entry_id": entry,
+            "exit_id": exit,
+        }
+    )
+
+
+def _task(node_id: str) -> dict:
+    return {"node_id": node_id, "kind": "TASK", "task_id": node_id}
+
+
+def _choice(guard_yes: str = "ok") -> GraphIR:
+    return _graph(
+        [
+            {"node_id": "entry", "kind": "ENTRY"},
+            {"node_id": "d", "kind": "DECISION"},
+            _task("yes"),
+            _task("no"),
+            {"node_id": "m", "kind": "MERGE"},
+            {"node_id": "exit", "kind": "EXIT"},
+        ],
+        [("entry", "d"), ("d", "yes", guard_yes), ("d", "no"), ("yes", "m"), ("no", "m"), ("m", "exit")],
+    )
+
+
+def _loop() -> GraphIR:
+    """
+    entry -> m(MERGE) -> tune -> d(DECISION) -> m (tune < 3) | exit
+    """
+    return _graph(
+        [
+            {"node_id": "entry", "kind": "ENTRY"},
+            {"node_id": "m", "kind": "MERGE"},
+            _task("tune"),
+            {"node_id": "d", "kind": "DECISION"},
+            {"node_id": "exit", "kind": "EXIT"},
+        ],
+        [("entry", "m"), ("m", "tune"), ("tune", "d"), ("d", "m", "tune < 3"), ("d", "exit")],
+    )
+
+
+def test_GuardEvaluator_takes_first_true_guard_else_unguarded_edges():
+    f = Frontier(GraphIndex.from_graph(_choice()), decide=GuardEvaluator(scope=GuardScope({"ok": True})).decide)
+    f.start()
+    assert f.take(10) == ["yes"]
+    assert f.states["no"] == NodeState.SKIPPED
+
+    f = Frontier(GraphIndex.from_graph(_choice()), decide=GuardEvaluator(scope=GuardScope({"ok": False})).decide)
+    f.start()
+    assert f.take(10) == ["no"]
+
+
+def test_GuardEvaluator_memoizes_per_scope_version():
+    calls = []
+    registry = GuardRegistry({"ok": lambda scope: calls.append(1) or scope["flag"]})
+    ev = GuardEvaluator(registry, GuardScope({"flag": True}))
+    g = _choice()
+    gi = GraphIndex.from_graph(g)
+    node = gi.node("d")
+    edges = [e for e in g.edges if e.src == "d"]
+
+    assert ev.decide(node, edges) == ["yes"]
+    assert ev.decide(node, edges) == ["yes"]
+    assert (ev.evaluations, ev.hits, len(calls)) == (1, 1, 1)
+
+    ev.scope.set("flag", False)
+    assert ev.decide(node, edges) == ["no"]
+    assert (ev.evaluations, len(calls)) == (2, 2)
+
+
+def test_GuardEvaluator_reevaluates_impure_guards():
+    # A guard that reads state outside the scope must not be frozen by the memo.
+    polls = iter([False, False, True])
+    registry = GuardRegistry()
+    registry.register("ok", lambda scope: next(polls), pure=False)
+    ev = GuardEvaluator(registry)
+    g = _choice()
+    node = GraphIndex.from_graph(g).node("d")
+    edges = [e for e in g.edges if e.src == "d"]
+
+    assert [ev.decide(node, edges) for _ in range(3)] == [["no"], ["no"], ["yes"]]
+    assert (ev.evaluations, ev.hits) == (3, 0)
+
+
+def test_GuardEvaluator_drives_loop_from_scope():
+    scope = GuardScope({"tune": 0})
+    f = Frontier(GraphIndex.from_graph(_loop()), decide=GuardEvaluator(scope=scope).decide)
+    f.start()
+    for i in range(1, 4):
+        assert f.take(1) == ["tune"]
+        scope.set("tune", i)
+        f.complete("tune")
+    assert f.done
+    assert f.activations["tune"] == 3
+
+
+def test_GuardEvaluator_names_the_failing_guard():
+    g = _graph(
+        [{"node_id": "entry", "kind": "ENTRY"}, {"node_id": "d", "kind": "DECISION"}, _task("a"), {"node_id": "exit", "kind": "EXIT"}],
+        [("entry", "d"), ("d", "a", "missing > 1"), ("a", "exit")],
+    )
+    f = Frontier(GraphIndex.from_graph(g), decide=GuardEvaluator().decide)
+    with pytest.raises(GuardError, match="'missing > 1' failed"):
+        f.start()
+
+    f = Frontier(GraphIndex.from_graph(g), decide=GuardEvaluator(scope=GuardScope({"missing": 0})).decide)
+    with pytest.raises(GuardError, match="no guard held"):
+        f.start()
+
+
+def attempt(ctx: TaskContext) -> int:
+    return ctx.attempt
+
+
+def test_Coordinator_publishes_outputs_to_guard_scope():
+    coord = Coordinator(_loop(), run_id="r", guards=GuardEvaluator())
+    with LocalBroker() as broker:
+        broker.spawn_workers(1, {"tune": attempt}, capacity=1)
+        result = coord.run(broker, timeout=60)
+
+    assert result.ok
+    assert coord.frontier.activations["tune"] == 3
+    assert coord.guards.scope["tune"] == 3
@@ -0,0 +1,103 @@
+# tests/engine/test_GuardRegistry.py
+from __future__ import annotations
+
+import pytest
+
+from balikrun.engine.guards import GuardError, GuardRegistry, GuardScope
+from balikrun.ir import GraphIR
+
+
+def test_GuardRegistry_evaluates_expressions_against_scope():
+    reg = GuardRegistry()
+    scope = GuardScope({"train": {"loss": 0.05, "epochs": 3}, "mode": "fast", "tags": ["a", "b"]})
+    assert reg.predicate('train["loss"] < 0.1 and train["epochs"] >= 3')(scope)
+    assert reg.predicate('mode in ("fast", "cheap")')(scope)
+    assert reg.predicate("len(tags) == 2 and not max(1, 2) > 2")(scope)
+    assert not reg.predicate('mode == "slow" or tags[0] == "z"')(scope)
+
+
+def test_GuardRegistry_bare_name_tests_truthiness():
+    pred = GuardRegistry().predicate("is_good")
+    assert pred({"is_good": True})
+    assert not pred({"is_good": 0})
+
+
+def test_GuardRegistry_registered_key_takes_precedence_over_expression():
+    reg = GuardRegistry({"is_good": lambda scope: scope["score"] > 0.9})
+    assert "is_good" in reg
+    assert reg.predicate("is_good")({"score": 0.95, "is_good": False})
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        "x.__class__",
+        "__import__('os')",
+        "open('f')",
+        "[y for y in x]",
+        "lambda: 1",
+        "_private",
+        "x[1:2]",
+        "len(x, key=1)",
+        "x = 1",
+        "1 +",
+    ],
+)
+def test_GuardRegistry_rejects_unsafe_or_invalid_expressions(expr):
+    with pytest.raises(GuardError):
+        GuardRegistry().program([expr])
+
+
+def test_GuardRegistry_bounds_sequence_repetition():
+    reg = GuardRegistry()
+    assert reg.predicate('len("ab" * 3) == 6 and 2 * 3 == 6 and 2 * [0] == [0, 0]')({})
+    assert reg.predicate("x * 2.5 == 5.0")({"x": 2})
+    huge = [
+        ('"x" * 1000000000', {}),
+        ("s * n", {"s": "ab", "n": 10**6}),
+        ("n * [0]", {"n": 10**9}),
+    ]
+    for expr, scope in huge:
+        with pytest.raises(GuardError, match="repeats a sequence"):
+            reg.predicate(expr)(scope)
+
+
+def test_GuardRegistry_compiles_each_guard_set_once():
+    reg = GuardRegistry()
+    assert reg.program(["a", "b"]) is reg.program(["a", "b"])
+    p = reg.program(["a", "b > 1", "c"])
+    assert p.evaluate({"a": False, "b": 2, "c": True}) == 1
+    assert p.evaluate({"a": False, "b": 0, "c": False}) == -1
+
+    reg.register("a", lambda scope: True)
+    assert reg.program(["a", "b > 1", "c"]).evaluate({}) == 0
+
+
+def test_GuardRegistry_check_reports_bad_guards_in_graph():
+    g = GraphIR.model_validate(
+        {
+            "graph_id": "g",
+            "nodes": [
+                {"node_id": "entry", "kind": "ENTRY"},
+                {"node_id": "d", "kind": "DECISION"},
+                {"node_id": "exit", "kind": "EXIT"},
+            ],
+            "edges": [
+                {"src": "entry", "dst": "d"},
+                {"src": "d", "dst": "exit", "guard": "ok"},
+                {"src": "d", "dst": "exit", "label": "bad", "guard": "x.y"},
+            ],
+            "entry_id": "entry",
+            "exit_id": "exit",
+        }
+    )
+    assert list(GuardRegistry().check(g)) == ["x.y"]
+
+
+def test_GuardScope_bumps_version_on_writes():
+    scope = GuardScope({"a": 1})
+    scope.set("b", 2)
+    scope.update({"c": 3})
+    scope.update({})
+    assert scope.version == 2
+    assert dict(scope) == {"a": 1, "b": 2, "c": 3}
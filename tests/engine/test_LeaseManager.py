@@ -0,0 +1,84 @@
+# tests/engine/test_LeaseManager.py
+from __future__ import annotations
+
+import pytest
+
+from balikrun.engine.leases import LeaseError, LeaseManager
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_LeaseManager_commit_is_single_use():
+    lm = LeaseManager(ttl=10)
+    lease = lm.grant("n1", "t", "w0")
+    assert lm.commit(lease.lease_id) == lease
+    with pytest.raises(LeaseError):
+        lm.commit(lease.lease_id)
+
+
+def test_LeaseManager_expired_lease_cannot_commit_and_attempt_increments():
+    clock = _Clock()
+    lm = LeaseManager(ttl=10, clock=clock)
+    first = lm.grant("n1", "t", "w0")
+    clock.now = 5
+    lm.renew_worker("w0")
+    clock.now = 12
+    assert lm.expire() == []
+    clock.now = 15
+    assert [x.lease_id for x in lm.expire()] == [first.lease_id]
+
+    second = lm.grant("n1", "t", "w1")
+    assert second.attempt == 2
+    with pytest.raises(LeaseError):
+        lm.commit(first.lease_id)
+    lm.commit(second.lease_id)
+
+
+def test_LeaseManager_release_worker_returns_its_leases():
+    lm = LeaseManager()
+    a = lm.grant("a", "t", "w0")
+    lm.grant("b", "t", "w1")
+    assert lm.release_worker("w0") == [a]
+    assert [x.node_id for x in lm.for_worker("w1")] == ["b"]
+    assert len(lm) == 1
+
+
+def test_LeaseManager_tracks_concurrent_leases_per_node():
+    lm = LeaseManager(ttl=10)
+    first = lm.grant("n1", "t", "w0")
+    dup = lm.grant("n1", "t", "w1")
+    assert lm.for_node("n1") == [first, dup]
+    lm.commit(dup.lease_id)
+    assert lm.for_node("n1") == [first]
+    lm.release(first.lease_id)
+    assert lm.for_node("n1") == []
+
+
+def test_LeaseManager_prefers_a_workers_own_partitions():
+    lm = LeaseManager(ttl=10)
+    lm.grant("a0", "t", "w0", partition=0)
+    lm.grant("b0", "t", "w1", partition=1)
+    assert lm.owner(0) == "w0" and lm.owner(1) == "w1"
+    ready = [("b1", 1), ("x", None), ("a1", 0), ("c0", 2), ("a2", 0)]
+    assert lm.prefer("w0", ready, 2) == ["a1", "a2"]
+    assert lm.prefer("w0", ready, 4) == ["a1", "a2", "x", "c0"]
+    assert lm.prefer("w2", ready, 5) == ["x", "c0", "b1", "a1", "a2"]
+    lm.release_worker("w0")
+    assert lm.owner(0) is None
+
+
+def test_LeaseManager_prefer_claims_one_unbound_partition_per_batch():
+    lm = LeaseManager(ttl=10)
+    ready = [("a0", 0), ("b0", 1), ("a1", 0), ("b1", 1)]
+    part = dict(ready)
+    assert lm.prefer("w0", ready, 4) == ["a0", "a1"]
+    for node_id in lm.prefer("w0", ready, 4):
+        lm.grant(node_id, "t", "w0", partition=part[node_id])
+    assert lm.owner(0) == "w0" and lm.owner(1) is None
+    assert lm.prefer("w1", [("b0", 1), ("b1", 1)], 4) == ["b0", "b1"]
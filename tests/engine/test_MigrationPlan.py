@@ -0,0 +1,79 @@
+# tests/engine/test_MigrationPlan.py
+from __future__ import annotations
+
+from balikrun.compile import CompileOptions, compile_to_graph_ir
+from balikrun.engine.migration import plan_migration
+from balikrun.engine.scheduler import NodeState
+from balikrun.specification import SequenceBlock, TaskReference
+
+OPTS = CompileOptions(graph_id="g", preserve_spec_node_ids=True)
+
+
+def _t(name: str, task_id: str | None = None) -> TaskReference:
+    return TaskReference(node_id=name, task_id=task_id or name)
+
+
+def test_MigrationPlan_keeps_completed_prefix_and_schedules_only_new_work():
+    """
+    Appending a task after a partially completed pipeline keeps completed work and
+    in-flight leases; only the appended task becomes pending.
+    """
+    old = compile_to_graph_ir(SequenceBlock(items=[_t("ingest"), _t("train")]), options=OPTS)
+    new = compile_to_graph_ir(
+        SequenceBlock(items=[_t("ingest"), _t("train"), _t("publish")]), options=OPTS
+    )
+    states = {
+        old.entry_id: NodeState.COMPLETED,
+        "ingest": NodeState.COMPLETED,
+        "train": NodeState.RUNNING,
+    }
+    plan = plan_migration(old, new, states)
+
+    assert plan.states["ingest"] == NodeState.COMPLETED
+    assert plan.states["train"] == NodeState.RUNNING
+    assert plan.states["publish"] == NodeState.PENDING
+    assert plan.retained_in_flight == {"train"}
+    assert plan.cancel == frozenset()
+    assert plan.invalidated == frozenset()
+    assert plan.ready == []
+
+
+def test_MigrationPlan_invalidates_changed_node_and_descendants():
+    """
+    Editing a task resets it and everything downstream; in-flight descendants are
+    cancelled, upstream results are carried.
+    """
+    old = compile_to_graph_ir(
+        SequenceBlock(items=[_t("ingest"), _t("train"), _t("eval")]), options=OPTS
+    )
+    new = compile_to_graph_ir(
+        SequenceBlock(items=[_t("ingest"), _t("train", "train_v2"), _t("eval")]), options=OPTS
+    )
+    states = {
+        old.entry_id: NodeState.COMPLETED,
+        "ingest": NodeState.COMPLETED,
+        "train": NodeState.COMPLETED,
+        "eval": NodeState.RUNNING,
+    }
+    plan = plan_migration(old, new, states)
+
+    assert plan.carried == {old.entry_id, "ingest"}
+    assert plan.invalidated == {"train", "eval"}
+    assert plan.cancel == {"eval"}
+    assert plan.ready == ["train"]
+
+
+def test_MigrationPlan_cancels_removed_in_flight_nodes():
+    old = compile_to_graph_ir(SequenceBlock(items=[_t("ingest"), _t("scratch")]), options=OPTS)
+    new = compile_to_graph_ir(SequenceBlock(items=[_t("ingest")]), options=OPTS)
+    states = {
+        old.entry_id: NodeState.COMPLETED,
+        "ingest": NodeState.COMPLETED,
+        "scratch": NodeState.LEASED,
+    }
+    plan = plan_migration(old, new, states)
+
+    assert plan.dropped == {"scratch"}
+    assert plan.cancel == {"scratch"}
+    assert "scratch" not in plan.states
+    assert plan.ready == [new.exit_id]
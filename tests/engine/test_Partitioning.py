@@ -0,0 +1,58 @@
+# tests/engine/test_Partitioning.py
+from __future__ import annotations
+
+import pytest
+
+from balikrun.engine.partition import PARTITION_KEY, assign_partitions, node_partition, partition_graph
+from balikrun.ir import GraphIR
+
+
+def _pipelines(m: int, length: int, cross_bytes: float = 0.0) -> GraphIR:
+    """
+    ENTRY -> FORK -> m chains of `length` TASKs (1 MB hand-offs) -> JOIN -> EXIT,
+    optionally with lighter links from chain i stage j to chain i+1 stage j+1.
+    """
+    nodes = [{"node_id": n, "kind": n.upper()} for n in ("entry", "fork", "join", "exit")]
+    edges = [{"src": "entry", "dst": "fork"}, {"src": "join", "dst": "exit"}]
+    for i in range(m):
+        prev = "fork"
+        for j in range(length):
+            node_id = f"p{i}s{j}"
+            nodes.append({"node_id": node_id, "kind": "TASK", "task_id": f"stage{j}"})
+            meta = {"artifact_bytes": 1e6} if prev != "fork" else {}
+            edges.append({"src": prev, "dst": node_id, "meta": meta})
+            if cross_bytes and i + 1 < m and j + 1 < length:
+                edges.append({"src": node_id, "dst": f"p{i + 1}s{j + 1}", "meta": {"artifact_bytes": cross_bytes}})
+            prev = node_id
+        edges.append({"src": prev, "dst": "join"})
+    return GraphIR.model_validate(
+        {"graph_id": "pipes", "nodes": nodes, "edges": edges, "entry_id": "entry", "exit_id": "exit"}
+    )
+
+
+def test_partition_graph_keeps_pipelines_whole_and_balanced():
+    g = _pipelines(8, 12)
+    result = partition_graph(g, 4)
+    by_node = dict(zip((n.node_id for n in g.nodes), result.parts))
+    for i in range(8):
+        assert len({by_node[f"p{i}s{j}"] for j in range(12)}) == 1
+    assert result.loads == (24.0,) * 4
+    # Only the weightless FORK/JOIN edges of 8 pipelines can be cut.
+    assert result.cut <= 16
+
+
+def test_partition_graph_refinement_lowers_weighted_cut():
+    g = _pipelines(6, 10, cross_bytes=1e3)
+    one_pass = partition_graph(g, 3, passes=0)
+    refined = partition_graph(g, 3)
+    assert refined.cut <= one_pass.cut
+    assert max(refined.loads) <= 1.05 * 20
+    with pytest.raises(ValueError):
+        partition_graph(g, 0)
+
+
+def test_assign_partitions_writes_task_meta():
+    g = assign_partitions(_pipelines(2, 3), 2)
+    parts = {n.node_id: node_partition(n) for n in g.nodes}
+    assert parts["fork"] is None and PARTITION_KEY not in g.nodes[0].meta
+    assert {parts[f"p0s{j}"] for j in range(3)} != {parts[f"p1s{j}"] for j in range(3)}
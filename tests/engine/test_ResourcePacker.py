@@ -0,0 +1,55 @@
+# tests/engine/test_ResourcePacker.py
+from __future__ import annotations
+
+import pytest
+
+from balikrun.engine.resources import ResourcePacker, node_resources, resource_vector
+from balikrun.ir import Node
+
+
+def test_resource_vector_normalizes_mappings_and_rejects_unknown_dimensions():
+    assert resource_vector({"cpu": 2, "memory_mb": 512}) == (2.0, 512.0, 0.0)
+    assert resource_vector(None) == (1.0, 0.0, 0.0)
+    with pytest.raises(ValueError):
+        resource_vector({"disk": 1})
+    with pytest.raises(ValueError):
+        resource_vector((1, 2))
+
+
+def test_node_resources_reads_task_meta():
+    node = Node(node_id="t", kind="TASK", task_id="train", meta={"resources": {"cpu": 4, "gpu": 1}})
+    assert node_resources(node) == (4.0, 0.0, 1.0)
+
+
+def test_ResourcePacker_aligns_tasks_with_complementary_capacity():
+    packer = ResourcePacker({"cpu_box": {"cpu": 16, "memory_mb": 8_000}, "mem_box": {"cpu": 4, "memory_mb": 64_000}})
+    placement = packer.place(
+        [
+            ("small", (1, 1_000, 0)),
+            ("cpu_heavy", (8, 1_000, 0)),
+            ("mem_heavy", (2, 48_000, 0)),
+        ]
+    )
+    assert placement.assignments["mem_box"][0] == "mem_heavy"
+    assert "cpu_heavy" in placement.assignments["cpu_box"]
+    assert placement.placed == 3
+    assert packer.free("mem_box") == (2.0, 16_000.0, 0.0)
+
+
+def test_ResourcePacker_defers_until_release_and_flags_unplaceable():
+    packer = ResourcePacker({"w": {"cpu": 4, "memory_mb": 1_000}})
+    placement = packer.place([("a", (3, 0, 0)), ("b", (3, 0, 0)), ("gpu", (1, 0, 1))])
+    assert placement.assignments == {"w": ["a"]}
+    assert placement.deferred == ["b"]
+    assert placement.unplaceable == ["gpu"]
+
+    packer.release("w", (3, 0, 0))
+    assert packer.place([("b", (3, 0, 0))]).assignments == {"w": ["b"]}
+    assert packer.utilization()[0] == pytest.approx(0.75)
+
+
+def test_ResourcePacker_respects_per_worker_limits():
+    packer = ResourcePacker({"w": {"cpu": 8}})
+    placement = packer.place([(f"t{i}", (1, 0, 0)) for i in range(5)], limits={"w": 2})
+    assert placement.assignments == {"w": ["t0", "t1"]}
+    assert placement.deferred == ["t2", "t3", "t4"]
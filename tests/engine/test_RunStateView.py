@@ -0,0 +1,113 @@
+# tests/engine/test_RunStateView.py
+from __future__ import annotations
+
+from balikrun.compile import CompileOptions, compile_to_graph_ir
+from balikrun.engine.events import EventLog, EventType
+from balikrun.engine.scheduler import GraphIndex, NodeState, ready_nodes
+from balikrun.engine.views import RunStateView
+from balikrun.ir import GraphIR, NodeKind
+from balikrun.specification import SequenceBlock, TaskReference
+
+
+def _graph():
+    spec = SequenceBlock(
+        items=[
+            TaskReference(node_id="ingest", task_id="ingest"),
+            TaskReference(node_id="train", task_id="train"),
+        ]
+    )
+    return compile_to_graph_ir(spec, options=CompileOptions(graph_id="g"))
+
+
+def _drive(log: EventLog, g) -> None:
+    log.append("r", EventType.NODE_STATE, node_id=g.entry_id, state=NodeState.COMPLETED)
+    log.append("r", EventType.NODE_STATE, node_id="ingest", task_id="ingest", state=NodeState.LEASED)
+    log.append("r", EventType.NODE_STATE, node_id="ingest", task_id="ingest", state=NodeState.RUNNING)
+    log.append("r", EventType.NODE_STATE, node_id="ingest", task_id="ingest", state=NodeState.COMPLETED)
+
+
+def test_RunStateView_counts_frontier_and_timings_update_on_append():
+    g = _graph()
+    log = EventLog()
+    view = RunStateView()
+    view.attach(log)
+    view.register("r", g)
+
+    assert view.count("r", NodeState.PENDING) == 4
+    assert view.frontier("r")["ready"] == {g.entry_id}
+
+    _drive(log, g)
+
+    assert view.count("r", NodeState.COMPLETED) == 2
+    assert view.count("r", NodeState.COMPLETED, kind=NodeKind.TASK) == 1
+    assert view.count("r", NodeState.PENDING, kind=NodeKind.TASK) == 1
+    assert view.frontier("r") == {"ready": frozenset({"train"}), "in_flight": frozenset()}
+    assert view.timings("r")["ingest"].count == 1
+
+    log.append("r", EventType.NODE_STATE, node_id="train", task_id="train", state=NodeState.RUNNING)
+    status = view.status("r")
+    assert status["in_flight"] == 1 and status["ready"] == 0
+    assert status["counts_by_kind"]["TASK"] == {"COMPLETED": 1, "RUNNING": 1}
+
+
+def test_RunStateView_rebuild_matches_live_view():
+    g = _graph()
+    log = EventLog()
+    live = RunStateView()
+    live.attach(log)
+    live.register("r", g)
+    _drive(log, g)
+    log.append("r", EventType.RUN_FINISHED)
+
+    rebuilt = RunStateView.rebuild(log, {"r": g})
+    assert rebuilt.status("r") == live.status("r")
+    assert rebuilt.frontier("r") == live.frontier("r")
+
+
+def test_RunStateView_reset_to_PENDING_withdraws_successor_readiness():
+    g = _graph()
+    log = EventLog()
+    view = RunStateView()
+    view.attach(log)
+    view.register("r", g)
+    _drive(log, g)
+
+    log.append("r", EventType.NODE_STATE, node_id="ingest", state=NodeState.PENDING)
+    assert view.frontier("r")["ready"] == {"ingest"}
+
+
+def test_RunStateView_ready_matches_ready_nodes_under_join_and_or_merge():
+    """
+    Counters of satisfied predecessors give the same ready set as is_ready(), for an
+    AND-join and an OR-merge, including completions undone by a reset to PENDING.
+    """
+    nodes = [{"node_id": n, "kind": n.upper()} for n in ("entry", "fork", "join", "exit")]
+    nodes.append({"node_id": "merge", "kind": "MERGE", "meta": {"join": "OR"}})
+    edges = [{"src": "entry", "dst": "fork"}, {"src": "join", "dst": "exit"}]
+    edges.append({"src": "merge", "dst": "join"})
+    for i in range(6):
+        nodes.append({"node_id": f"t{i}", "kind": "TASK", "task_id": "t"})
+        edges.append({"src": "fork", "dst": f"t{i}"})
+        edges.append({"src": f"t{i}", "dst": "join" if i < 4 else "merge"})
+    g = GraphIR.model_validate(
+        {"graph_id": "g", "nodes": nodes, "edges": edges, "entry_id": "entry", "exit_id": "exit"}
+    )
+    gi = GraphIndex.from_graph(g)
+    log = EventLog()
+    view = RunStateView()
+    view.attach(log)
+    view.register("r", g)
+    states: dict[str, NodeState] = {}
+    steps = [("entry", NodeState.COMPLETED), ("fork", NodeState.COMPLETED)]
+    steps += [(f"t{i}", NodeState.COMPLETED) for i in (0, 1, 4, 2)]
+    steps += [("t4", NodeState.PENDING), ("t5", NodeState.SKIPPED), ("t5", NodeState.PENDING)]
+    steps += [("t5", NodeState.COMPLETED), ("merge", NodeState.COMPLETED)]
+    steps += [("t3", NodeState.SKIPPED)]
+    for node_id, state in steps:
+        log.append("r", EventType.NODE_STATE, node_id=node_id, state=state)
+        if state == NodeState.PENDING:
+            states.pop(node_id, None)
+        else:
+            states[node_id] = state
+        assert view.frontier("r")["ready"] == set(ready_nodes(gi, states)), (node_id, state)
+    assert view.frontier("r")["ready"] == {"join", "t4"}
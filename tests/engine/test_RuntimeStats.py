@@ -0,0 +1,53 @@
+# tests/engine/test_RuntimeStats.py
+from __future__ import annotations
+
+import random
+from dataclasses import asdict
+
+import pytest
+
+from balikrun.engine.retries import RetryPolicy, RuntimeStats, SpeculationPolicy
+from balikrun.specification import TaskRetry
+
+
+def test_RuntimeStats_percentile_over_a_sliding_window():
+    stats = RuntimeStats(window=4)
+    assert stats.percentile("t", 0.5) is None
+    for s in (5.0, 1.0, 3.0, 2.0):
+        stats.record("t", s)
+    assert stats.percentile("t", 0.5) == 2.0
+    assert stats.percentile("t", 1.0) == 5.0
+    stats.record("t", 4.0)  # evicts 5.0
+    assert stats.count("t") == 4
+    assert stats.percentile("t", 1.0) == 4.0
+
+
+def test_RuntimeStats_threshold_needs_min_samples():
+    policy = SpeculationPolicy(percentile=0.5, multiplier=2.0, min_samples=3)
+    stats = RuntimeStats()
+    stats.record("t", 1.0)
+    stats.record("t", 2.0)
+    assert stats.threshold("t", policy) is None
+    stats.record("t", 3.0)
+    assert stats.threshold("t", policy) == 4.0
+    with pytest.raises(ValueError):
+        SpeculationPolicy(percentile=0)
+
+
+def test_RetryPolicy_backoff_is_capped_and_jittered():
+    policy = RetryPolicy.from_meta({"max_attempts": 5, "backoff": 1.0, "multiplier": 3.0, "max_backoff": 5.0, "jitter": 0.0})
+    rng = random.Random(0)
+    assert [policy.delay(k, rng) for k in (1, 2, 3)] == [1.0, 3.0, 5.0]
+    jittered = RetryPolicy(backoff=2.0, jitter=0.5)
+    assert all(1.0 <= jittered.delay(1, rng) <= 2.0 for _ in range(100))
+    assert RetryPolicy.from_meta(None) is None
+
+
+def test_RetryPolicy_shares_TaskRetry_defaults_and_validation():
+    assert asdict(RetryPolicy()) == TaskRetry().model_dump()
+    assert RetryPolicy.from_meta({}) == RetryPolicy()
+    for bad in ({"max_attempts": 0}, {"backoff": -1.0}, {"max_atempts": 2}):
+        with pytest.raises(ValueError):
+            RetryPolicy.from_meta(bad)
+    with pytest.raises(ValueError):
+        RetryPolicy(jitter=2.0)
@@ -0,0 +1,174 @@
+# tests/engine/test_Simulator.py
+from __future__ import annotations
+
+import pytest
+
+from balikrun.engine.simulator import Simulator, fixed
+from balikrun.ir import GraphIR
+
+
+def _graph(nodes: list[dict], edges: list[tuple], entry: str = "entry", exit: str = "exit") -> GraphIR:
+    return GraphIR.model_validate(
+        {
+            "graph_id": "g",
+            "nodes": nodes,
+            "edges": [
+                {"src": e[0], "dst": e[1], **({"guard": e[2]} if len(e) > 2 else {})} for e in edges
+            ],
+            "entry_id": entry,
+            "exit_id": exit,
+        }
+    )
+
+
+def _task(node_id: str, task_id: str | None = None) -> dict:
+    return {"node_id": node_id, "kind": "TASK", "task_id": task_id or node_id}
+
+
+def _fan_out(n: int, join: dict | None = None) -> GraphIR:
+    tasks = [f"t{i}" for i in range(n)]
+    return _graph(
+        [
+            {"node_id": "entry", "kind": "ENTRY"},
+            {"node_id": "fork", "kind": "FORK"},
+            *[_task(t) for t in tasks],
+            join or {"node_id": "join", "kind": "JOIN"},
+            {"node_id": "exit", "kind": "EXIT"},
+        ],
+        [("entry", "fork"), *[("fork", t) for t in tasks], *[(t, "join") for t in tasks], ("join", "exit")],
+    )
+
+
+def _loop() -> GraphIR:
+    """
+    entry -> m(MERGE) -> body -> d(DECISION) -> m (again) | exit
+    """
+    return _graph(
+        [
+            {"node_id": "entry", "kind": "ENTRY"},
+            {"node_id": "m", "kind": "MERGE"},
+            _task("body"),
+            {"node_id": "d", "kind": "DECISION"},
+            {"node_id": "exit", "kind": "EXIT"},
+        ],
+        [("entry", "m"), ("m", "body"), ("body", "d"), ("d", "m", "again"), ("d", "exit")],
+    )
+
+
+def test_Simulator_chain_makespan_is_sum_of_durations():
+    g = _graph(
+        [{"node_id": "entry", "kind": "ENTRY"}, _task("a"), _task("b"), _task("c"), {"node_id": "exit", "kind": "EXIT"}],
+        [("entry", "a"), ("a", "b"), ("b", "c"), ("c", "exit")],
+    )
+    r = Simulator(g, durations={"b": fixed(5.0)}).run()
+    assert r.completed
+    assert r.makespan == 7.0
+    assert r.tasks_run == 3
+    assert r.peak_concurrency == 1
+    assert r.critical_path == ["entry", "a", "b", "c", "exit"]
+    assert r.critical_path_compute == 7.0
+
+
+def test_Simulator_fan_out_is_bounded_by_workers():
+    g = _fan_out(10)
+    r = Simulator(g, workers=4).run()
+    assert r.makespan == 3.0  # ceil(10 / 4) waves
+    assert r.peak_concurrency == 4
+    assert r.utilization == pytest.approx(10 / 12)
+    # The last task to finish waited two waves for a worker.
+    assert r.critical_path[:2] == ["entry", "fork"] and r.critical_path[-2:] == ["join", "exit"]
+    assert r.critical_path_wait == 2.0
+
+    unlimited = Simulator(g).run()
+    assert unlimited.makespan == 1.0
+    assert unlimited.peak_concurrency == 10
+    assert unlimited.utilization is None
+
+
+def test_Simulator_lease_latency_delays_every_task():
+    r = Simulator(_fan_out(3), lease_latency=fixed(0.5)).run()
+    assert r.makespan == 1.5
+    assert r.critical_path_wait == 0.5
+
+
+def test_Simulator_or_join_fires_on_first_branch():
+    g = _fan_out(2, join={"node_id": "join", "kind": "JOIN", "meta": {"join": "OR"}})
+    r = Simulator(g, durations={"t0": fixed(1.0), "t1": fixed(9.0)}).run()
+    assert r.makespan == 1.0
+    assert r.critical_path == ["entry", "fork", "t0", "join", "exit"]
+
+
+def test_Simulator_decision_skips_unchosen_branch():
+    g = _graph(
+        [
+            {"node_id": "entry", "kind": "ENTRY"},
+            {"node_id": "d", "kind": "DECISION"},
+            _task("yes"),
+            _task("no"),
+            {"node_id": "m", "kind": "MERGE"},
+            {"node_id": "exit", "kind": "EXIT"},
+        ],
+        [("entry", "d"), ("d", "yes", "ok"), ("d", "no"), ("yes", "m"), ("no", "m"), ("m", "exit")],
+    )
+    r = Simulator(g, guards={"ok": 1.0}).run()
+    assert r.task_counts == {"yes": 1}
+    assert r.skipped == 1
+
+    r = Simulator(g, guards={"ok": 0.0}).run()
+    assert r.task_counts == {"no": 1}
+
+
+def test_Simulator_loop_iterates_and_is_capped():
+    r = Simulator(_loop(), guards={"again": 1.0}, max_loop_iterations=5).run()
+    assert r.completed
+    assert r.loop_iterations == 5
+    assert r.task_counts == {"body": 6}
+    assert r.makespan == 6.0
+    assert r.critical_path.count("body") == 6
+
+    never = Simulator(_loop(), guards={"again": 0.0}).run()
+    assert never.task_counts == {"body": 1}
+
+
+def test_Simulator_caps_an_unguarded_back_edge():
+    # d loops back by default and leaves only when "done" holds, which it never does.
+    g = _graph(
+        [
+            {"node_id": "entry", "kind": "ENTRY"},
+            {"node_id": "m", "kind": "MERGE"},
+            _task("body"),
+            {"node_id": "d", "kind": "DECISION"},
+            {"node_id": "exit", "kind": "EXIT"},
+        ],
+        [("entry", "m"), ("m", "body"), ("body", "d"), ("d", "exit", "done"), ("d", "m")],
+    )
+    r = Simulator(g, guards={"done": 0.0}, max_loop_iterations=5).run()
+    assert r.completed
+    assert r.loop_iterations == 5
+    assert r.task_counts == {"body": 6}
+
+
+def test_Simulator_is_deterministic_per_seed():
+    sim = Simulator(_loop(), guards={"again": 0.7})
+    assert sim.run(seed=3) == sim.run(seed=3)
+    counts = {sim.run(seed=s).loop_iterations for s in range(10)}
+    assert len(counts) > 1
+
+
+def test_Simulator_decision_without_default_edge_raises_when_no_guard_holds():
+    g = _graph(
+        [
+            {"node_id": "entry", "kind": "ENTRY"},
+            {"node_id": "d", "kind": "DECISION"},
+            _task("a"),
+            {"node_id": "exit", "kind": "EXIT"},
+        ],
+        [("entry", "d"), ("d", "a", "ok"), ("a", "exit")],
+    )
+    with pytest.raises(ValueError, match="no guard held"):
+        Simulator(g, guards={"ok": 0.0}).run()
+
+
+def test_Simulator_rejects_non_positive_workers():
+    with pytest.raises(ValueError):
+        Simulator(_loop(), workers=0)
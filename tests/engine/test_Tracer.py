@@ -0,0 +1,52 @@
+# tests/engine/test_Tracer.py
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from balikrun.engine.tracing import NULL_TRACER, Phase, Tracer
+
+
+def test_Tracer_ring_buffer_keeps_newest_spans():
+    t = Tracer(capacity=4)
+    for i in range(6):
+        t.record(Phase.COMPUTE, i, i + 1, f"n{i}", "train", "w0")
+    assert [s[3] for s in t.spans()] == ["n2", "n3", "n4", "n5"]
+    assert t.written == 6
+    assert t.dropped == 2
+
+
+def test_Tracer_rejects_non_power_of_two_capacity():
+    with pytest.raises(ValueError):
+        Tracer(capacity=3)
+
+
+def test_Tracer_chrome_trace_export(tmp_path):
+    t = Tracer(clock=iter(range(0, 10_000, 1000)).__next__)
+    with t.span(Phase.COMMIT, node_id="n1", task_id="train", tid="coordinator"):
+        pass
+    t.record(Phase.COMPUTE, 5000, 9000, "n1", "train", "w0")
+
+    payload = json.loads(t.export(tmp_path / "trace.json").read_text())
+    complete = [e for e in payload["traceEvents"] if e["ph"] == "X"]
+    assert [(e["name"], e["ts"], e["dur"]) for e in complete] == [("commit", 0, 1), ("compute", 5, 4)]
+    assert complete[1]["args"] == {"node_id": "n1", "task_id": "train"}
+    lanes = {e["args"]["name"] for e in payload["traceEvents"] if e["ph"] == "M"}
+    assert lanes == {"coordinator", "w0"}
+
+
+def test_Tracer_otlp_export():
+    t = Tracer()
+    t.record(Phase.QUEUE_WAIT, 10, 20, "n1", "train", "w0")
+    spans = t.to_otlp(trace_id="ab" * 16)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert spans[0]["startTimeUnixNano"] == "10"
+    assert {a["key"] for a in spans[0]["attributes"]} == {"node_id", "task_id", "worker_id"}
+
+
+def test_NullTracer_records_nothing():
+    with NULL_TRACER.span("x"):
+        pass
+    NULL_TRACER.record("x", 0, 1)
+    assert not NULL_TRACER.enabled
+    assert NULL_TRACER.spans() == []
@@ -0,0 +1,107 @@
+# tests/interning/test_SpecInterner.py
+from __future__ import annotations
+
+import pytest
+
+from balikrun.interning import SpecInterner
+from balikrun.specification import (
+    CompositeBlock,
+    ParallelBlock,
+    ParallelBranch,
+    SequenceBlock,
+    TaskReference,
+    TaskResources,
+)
+
+
+def _packaging() -> CompositeBlock:
+    return CompositeBlock(
+        name="packaging",
+        body=SequenceBlock(items=[TaskReference(task_id="bundle"), TaskReference(task_id="upload")]),
+    )
+
+
+def test_SpecInterner_shares_equal_subtrees():
+    """
+    Equal subtrees built independently collapse onto one canonical instance.
+    """
+    spec = SequenceBlock(items=[_packaging(), TaskReference(task_id="bundle"), _packaging()])
+    interner = SpecInterner()
+    s = interner.intern(spec)
+
+    assert s == spec
+    assert s.items[0] is s.items[2]
+    assert s.items[0].body.items[0] is s.items[1]
+    assert interner.same(s.items[0], s.items[2])
+
+
+def test_SpecInterner_preserves_dump_and_fields_set():
+    """
+    Interning must not change the persisted JSON form (including unset defaults).
+    """
+    spec = ParallelBlock(
+        branches=[
+            ParallelBranch(label="a", body=TaskReference(task_id="t")),
+            ParallelBranch(label="b", body=TaskReference(task_id="t")),
+        ]
+    )
+    s = SpecInterner().intern(spec)
+    assert s.model_dump(exclude_unset=True) == spec.model_dump(exclude_unset=True)
+    assert s.branches[0].body is s.branches[1].body
+
+
+def test_SpecInterner_keeps_explicit_defaults_apart_from_unset_ones():
+    """
+    An explicitly set default is not shared with an unset one: their exclude_unset dumps differ.
+    """
+    branches = [ParallelBranch(label="a", body=TaskReference(task_id="t"))]
+    explicit = ParallelBlock(branches=branches, join="AND")
+    implicit = ParallelBlock(branches=branches)
+    interner = SpecInterner()
+    spec = SequenceBlock(items=[explicit, implicit])
+    s = interner.intern(spec)
+
+    assert s.items[0] is not s.items[1]
+    assert s.model_dump(exclude_unset=True) == spec.model_dump(exclude_unset=True)
+    assert s.items[0].model_dump(exclude_unset=True)["join"] == "AND"
+    assert "join" not in s.items[1].model_dump(exclude_unset=True)
+    assert interner.digest(s.items[0]) == interner.digest(s.items[1])
+
+
+def test_SpecInterner_keys_value_objects_on_set_fields():
+    explicit = TaskReference(task_id="t", resources=TaskResources(cpu=1.0))
+    implicit = TaskReference(task_id="t", resources=TaskResources())
+    interner = SpecInterner()
+    a, b = interner.intern(explicit), interner.intern(implicit)
+    assert a is not b
+    assert a.model_dump(exclude_unset=True) == explicit.model_dump(exclude_unset=True)
+    assert b.model_dump(exclude_unset=True) == implicit.model_dump(exclude_unset=True)
+    assert interner.intern(TaskReference(task_id="t", resources=TaskResources())) is b
+
+
+def test_SpecInterner_distinguishes_node_ids():
+    """
+    node_id is part of the structure: equal task_id with different node_id is not shared.
+    """
+    interner = SpecInterner()
+    a = interner.intern(TaskReference(task_id="t", node_id="a"))
+    b = interner.intern(TaskReference(task_id="t", node_id="b"))
+    assert a is not b
+    assert interner.digest(a) != interner.digest(b)
+
+
+def test_SpecInterner_digest_is_stable_across_interners():
+    """
+    digest() is content-addressed and independent of the interner instance.
+    """
+    i1 = SpecInterner()
+    a = i1.validate(CompositeBlock, _packaging().model_dump())
+    i2 = SpecInterner()
+    b = i2.intern(_packaging())
+    assert i1.digest(a) == i2.digest(b)
+
+
+def test_SpecInterner_rejects_foreign_nodes():
+    interner = SpecInterner()
+    with pytest.raises(ValueError):
+        interner.structural_hash(TaskReference(task_id="t"))
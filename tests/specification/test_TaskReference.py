@@ -24,3 +24,39 @@ def test_TaskReference_forbids_extra_fields():
     """
     with pytest.raises(ValueError):
         TaskReference.model_validate({"kind": "task_ref", "task_id": "x", "extra": 123})
+
+
+def test_TaskReference_resources_default_to_none_and_validate():
+    """
+    Resource requirements are optional; when given, values must be non-negative.
+    """
+    t = TaskReference.model_validate(
+        {"kind": "task_ref", "task_id": "train", "resources": {"cpu": 4, "memory_mb": 32768, "gpu": 1}}
+    )
+    assert t.resources is not None
+    assert (t.resources.cpu, t.resources.memory_mb, t.resources.gpu) == (4.0, 32768.0, 1)
+    assert TaskReference.model_validate({"kind": "task_ref", "task_id": "x"}).resources is None
+
+    with pytest.raises(ValueError):
+        TaskReference.model_validate({"kind": "task_ref", "task_id": "x", "resources": {"cpu": -1}})
+    # Resources are a value, not a node: they carry no node_id.
+    with pytest.raises(ValueError):
+        TaskReference.model_validate(
+            {"kind": "task_ref", "task_id": "x", "resources": {"cpu": 1, "node_id": "r"}}
+        )
+
+
+def test_TaskReference_retry_defaults_to_none_and_validates():
+    """
+    Retry policies are optional and omitted from dumps when unset.
+    """
+    t = TaskReference.model_validate(
+        {"kind": "task_ref", "task_id": "train", "retry": {"max_attempts": 5, "backoff": 0.5}}
+    )
+    assert t.retry is not None
+    assert (t.retry.max_attempts, t.retry.backoff, t.retry.multiplier) == (5, 0.5, 2.0)
+    assert "retry" not in TaskReference(task_id="x").model_dump()
+
+    for bad in ({"max_attempts": 0}, {"backoff": -1}, {"multiplier": 0.5}, {"jitter": 2}):
+        with pytest.raises(ValueError):
+            TaskReference.model_validate({"kind": "task_ref", "task_id": "x", "retry": bad})